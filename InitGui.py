@@ -48,6 +48,10 @@ class OsePipingWorkbench (Workbench):
         # creates a new toolbar with your commands
         self.appendToolbar("Ose Piping", self.list)
         self.appendMenu("Command Menu", self.list)  # creates a new menu
+        self.appendMenu("Command Menu", ["Separator", "OsePiping_RecomputeProfiler", "OsePiping_ExportGltf"])
+        self.appendMenu("Command Menu", ["Separator", "OsePiping_DetailFull", "OsePiping_DetailEnvelope",
+                                         "OsePiping_DetailCenterline", "OsePiping_FullDetailNear",
+                                         "OsePiping_FullDetailOnSelection"])
         #OSE_PipingWorkbench.Icon = os.path.join(OSEBase.ICON_PATH,"Workbench.svg")
 
         # FreeCADGui.addIconPath(":/Resources/icons")
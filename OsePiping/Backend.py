@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Registry of the Dodo/Flamingo backend. Modules of the backend are probed and
+# imported once per session. Dodo is preferred, if both workbenches are installed.
+
+import importlib
+import importlib.util
+
+DODO = "Dodo"
+FLAMINGO = "Flamingo"
+
+# Modules with pipe features and with placement commands of each backend.
+BACKEND_MODULES = {
+    DODO: ("pFeatures", "pCmd"),
+    FLAMINGO: ("pipeFeatures", "pipeCmd"),
+}
+
+_cache = {}
+
+
+class PypeTypeStub(object):
+    """Replacement of pypeType from Dodo/Flamingo.
+
+    It defines only the common properties, which OSE fittings use. The stub is used when
+    neither Dodo nor Flamingo are installed, for example, to build features without GUI.
+    """
+
+    def __init__(self, obj):
+        obj.Proxy = self
+        # Builders return the proxy and callers look the object up by this name.
+        self.Name = obj.Name
+        obj.addProperty("App::PropertyString", "PType", "PBase", "Type of tubeFeature")
+        obj.addProperty("App::PropertyString", "PRating", "PBase", "Rating of pipeFeature")
+        obj.addProperty("App::PropertyString", "PSize", "PBase", "Nominal diameter")
+
+    def __getstate__(self):
+        return self.Name
+
+    def __setstate__(self, state):
+        # Documents saved before the name was stored have no state.
+        self.Name = state
+        return None
+
+
+def _cached(key, function):
+    if key not in _cache:
+        _cache[key] = function()
+    return _cache[key]
+
+
+def _isInstalled(backend):
+    module_name = BACKEND_MODULES[backend][0]
+    return _cached(("installed", backend), lambda: importlib.util.find_spec(module_name) is not None)
+
+
+def hasDodo():
+    return _isInstalled(DODO)
+
+
+def hasFlamingo():
+    return _isInstalled(FLAMINGO)
+
+
+def getBackendName():
+    """Return DODO, FLAMINGO or None if no backend is installed."""
+    if hasDodo():
+        return DODO
+    elif hasFlamingo():
+        return FLAMINGO
+    return None
+
+
+def getFeaturesModule():
+    """Return pFeatures (Dodo), pipeFeatures (Flamingo) or None."""
+    def load():
+        backend = getBackendName()
+        if backend is None:
+            return None
+        return importlib.import_module(BACKEND_MODULES[backend][0])
+    return _cached("features", load)
+
+
+def getCommandsModule():
+    """Return pCmd (Dodo), pipeCmd (Flamingo) or None. They are used to place parts to ports."""
+    def load():
+        backend = getBackendName()
+        if backend is None:
+            return None
+        return importlib.import_module(BACKEND_MODULES[backend][1])
+    return _cached("commands", load)
+
+
+def getPypeType():
+    """Return the parent class of Dodo/Flamingo features, or PypeTypeStub if there is no backend."""
+    module = getFeaturesModule()
+    if module is None:
+        return PypeTypeStub
+    return module.pypeType
+
+
+class PypeType(object):
+    """Parent class of the Fl* features.
+
+    The pypeType of the backend is looked up when a feature is created or restored, not
+    when the Fl* module is imported. Thus reset() and useStub() take effect for the next
+    feature, and the class hierarchy of the features does not depend on the installed backend.
+    """
+
+    def __init__(self, obj):
+        getPypeType().__init__(self, obj)
+
+    def __getstate__(self):
+        return getPypeType().__getstate__(self)
+
+    def __setstate__(self, state):
+        return getPypeType().__setstate__(self, state)
+
+
+def getPipeClass():
+    """Return the Pipe feature class of the backend or None."""
+    module = getFeaturesModule()
+    if module is None:
+        return None
+    return module.Pipe
+
+
+def useStub():
+    """Use PypeTypeStub, even if Dodo or Flamingo is installed.
+
+    It makes benchmarks independent of the installed workbenches. Call it before
+    creating features.
+    """
+    _cache["features"] = None
+    _cache["commands"] = None
+
+
+def reset():
+    """Forget the probed backend, for example after installing Dodo in a running session."""
+    _cache.clear()
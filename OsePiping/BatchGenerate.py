@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Generate catalog parts without GUI. Run it with FreeCADCmd:
+#
+#   FreeCADCmd -c "import OsePiping.BatchGenerate as B; B.main(['job.json'])"
+#
+# or run it as a script with the job file after --pass, or with the environment variable
+# OSE_PIPING_JOB set to the path of the job file:
+#
+#   FreeCADCmd OsePiping/BatchGenerate.py --pass job.json
+#   OSE_PIPING_JOB=job.json FreeCADCmd OsePiping/BatchGenerate.py
+#
+# The exit status is 0 if all parts were written, 1 if some parts failed and 2 for wrong
+# usage or an invalid job file.
+#
+# A job file is a JSON dictionary, for example
+#
+#   {"fitting": "tee", "parts": "all", "outputType": "solid", "format": "step",
+#    "directory": "tee-step"}
+#
+# "parts" is "all" or a list of part numbers. "outputType" is "solid", "parts" or "dodo".
+# "format" is "step" or "brep". Pipes use the additional "length", for example "1 m".
+# Every part is written to its own file, as soon as it is created. The results are
+# appended line by line to "manifest.jsonl" in the output directory.
+
+import json
+import os
+import re
+import sys
+import time
+
+if __name__ == "__main__":
+    # Running as a script. Make the workbench modules importable.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FreeCAD
+import OsePiping.Piping as Piping
+import OsePiping.Catalog as Catalog
+
+OUTPUT_TYPES = {
+    "solid": Piping.OUTPUT_TYPE_SOLID,
+    "parts": Piping.OUTPUT_TYPE_PARTS,
+    "dodo": Piping.OUTPUT_TYPE_DODO_OR_FLAMINGO,
+}
+
+FORMATS = ["step", "brep"]
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# The scratch document is closed and opened again after this number of parts,
+# such that the memory does not grow with the size of the catalog.
+PARTS_PER_DOCUMENT = 50
+
+
+class JobError(Piping.Error):
+    """Exception raised when the job specification is invalid."""
+
+    def __init__(self, message):
+        super(JobError, self).__init__(message)
+
+
+class Job:
+    def __init__(self, spec):
+        try:
+            self.fittingType = Catalog.getFittingType(spec["fitting"])
+        except KeyError as e:
+            raise JobError(e.args[0])
+        self.parts = spec.get("parts", "all")
+        output_type = spec.get("outputType", "solid")
+        if output_type not in OUTPUT_TYPES:
+            raise JobError("Unknown output type {}. Use one of {}.".format(output_type, ", ".join(OUTPUT_TYPES)))
+        self.outputType = OUTPUT_TYPES[output_type]
+        self.format = spec.get("format", "step")
+        if self.format not in FORMATS:
+            raise JobError("Unknown format {}. Use one of {}.".format(self.format, ", ".join(FORMATS)))
+        self.directory = spec.get("directory", ".")
+        self.length = FreeCAD.Units.parseQuantity(spec.get("length", "1 m"))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r") as f:
+                spec = json.load(f)
+        except (IOError, ValueError) as e:
+            raise JobError("Cannot read job file {}: {}".format(path, e))
+        if not isinstance(spec, dict) or "fitting" not in spec:
+            raise JobError("Job file {} must be a dictionary with the key \"fitting\".".format(path))
+        return cls(spec)
+
+    def getPartNumbers(self, table):
+        if self.parts == "all":
+            return [table.getPartKey(i) for i in range(0, len(table.data))]
+        return list(self.parts)
+
+
+def getFileName(partNumber, fileFormat):
+    """Return a file name for the part number. Characters unsafe in file names are replaced by "_"."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", partNumber) + "." + fileFormat
+
+
+def exportShape(shape, path, fileFormat):
+    if fileFormat == "step":
+        shape.exportStep(path)
+    elif fileFormat == "brep":
+        shape.exportBrep(path)
+
+
+class PartGenerator:
+    """Create parts of one fitting type one by one.
+
+    Solids are created with the Part API. Other output types need document objects.
+    They are created in a scratch document, which is recycled regularly.
+    """
+
+    def __init__(self, fittingType, outputType, length):
+        self.fittingType = fittingType
+        self.outputType = outputType
+        self.length = length
+        self.table = fittingType.loadTable()
+        self.document = None
+        self._partsInDocument = 0
+
+    def _getDocument(self):
+        if self.document is not None and self._partsInDocument >= PARTS_PER_DOCUMENT:
+            self.close()
+        if self.document is None:
+            self.document = FreeCAD.newDocument("OsePipingBatch")
+            self.document.UndoMode = 0
+            self._partsInDocument = 0
+        self._partsInDocument += 1
+        return self.document
+
+    def createShape(self, partNumber):
+        """Return shape of the part with the part number."""
+        row = self.table.findPart(partNumber)
+        if row is None:
+            raise KeyError("Part {} not found in {}.".format(partNumber, self.fittingType.getTablePath()))
+        if self.outputType == Piping.OUTPUT_TYPE_SOLID:
+            shape = self.fittingType.createShapeFromRow(row, self.length)
+            return Piping.makeSolid(shape)
+
+        document = self._getDocument()
+        part = self.fittingType.createPart(document, self.table, partNumber, self.outputType, self.length)
+        document.recompute()
+        # Dodo/Flamingo builders return the proxy instead of the document object.
+        obj = document.getObject(part.Name)
+        shape = Piping.getResultShape(obj).copy()
+        Piping.removePartWithChildren(document, obj)
+        return shape
+
+    def close(self):
+        if self.document is not None:
+            FreeCAD.closeDocument(self.document.Name)
+            self.document = None
+
+
+def run(job, log=print):
+    """Run the job. Return number of failed parts."""
+    if not os.path.isdir(job.directory):
+        os.makedirs(job.directory)
+    generator = PartGenerator(job.fittingType, job.outputType, job.length)
+    part_numbers = job.getPartNumbers(generator.table)
+    failed = 0
+    try:
+        with open(os.path.join(job.directory, MANIFEST_NAME), "a") as manifest:
+            for i, part_number in enumerate(part_numbers):
+                start = time.time()
+                record = {"fitting": job.fittingType.name, "partNumber": part_number}
+                try:
+                    shape = generator.createShape(part_number)
+                    file_name = getFileName(part_number, job.format)
+                    exportShape(shape, os.path.join(job.directory, file_name), job.format)
+                    record["file"] = file_name
+                    record["status"] = "ok"
+                except Exception as e:
+                    failed += 1
+                    record["status"] = "failed"
+                    record["error"] = str(e)
+                record["seconds"] = time.time() - start
+                manifest.write(json.dumps(record) + "\n")
+                manifest.flush()
+                log("[{}/{}] {} {}".format(i + 1, len(part_numbers), part_number, record["status"]))
+    finally:
+        generator.close()
+    return failed
+
+
+def getScriptArguments(argv, script):
+    """Return the arguments of the script from sys.argv.
+
+    Python puts the script to argv[0]. FreeCADCmd passes its own arguments before the
+    script and the option --pass before the arguments of the script.
+    """
+    script = os.path.abspath(script)
+    args = argv[1:]
+    for i in range(0, len(argv)):
+        if os.path.abspath(argv[i]) == script:
+            args = argv[i + 1:]
+            break
+    if len(args) > 0 and args[0] == "--pass":
+        args = args[1:]
+    return args
+
+
+def main(argv):
+    usage = "Usage: BatchGenerate.main([job-file]) or set OSE_PIPING_JOB."
+    if len(argv) > 1:
+        print(usage)
+        return 2
+    if len(argv) == 1:
+        path = argv[0]
+    else:
+        path = os.environ.get("OSE_PIPING_JOB")
+    if path is None:
+        print(usage)
+        return 2
+    try:
+        job = Job.load(path)
+    except JobError as e:
+        print(e)
+        print(usage)
+        return 2
+    failed = run(job)
+    return 1 if failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(getScriptArguments(sys.argv, __file__)))
@@ -7,6 +7,9 @@ import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -32,14 +35,15 @@ RELATIVE_EPSILON = 0.1
 # The unknown dimensions are of the inner cone and of the hexadecimal/octoganal thing.
 
 
-class Dimensions:
-    def __init__(self):
-        """Inititialize with test dimensions."""
-        self.POD = parseQuantity("4 cm")
-        self.POD1 = parseQuantity("2 cm")
-        self.PThk1 = parseQuantity("0.5 cm")
-        self.N = parseQuantity("2 cm")
-        self.L = parseQuantity("3 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("POD", "POD1", "PThk1", "N", "L")
+    DEFAULTS = {
+        "POD": "4 cm",
+        "POD1": "2 cm",
+        "PThk1": "0.5 cm",
+        "N": "2 cm",
+        "L": "3 cm",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -67,13 +71,13 @@ class Dimensions:
         """Return thickness of a hexagonal or octoganal thing."""
         # This dimension is missing in specification.
         # I just take a half of (L-N)
-        return (self.L - self.N) / 2.0
+        return DimensionKernel.thingThicknessA1(self.L, self.N)
 
     def ThingLengthA2(self):
         """Return distance between paralal sides of a x-gonal thing."""
         # This dimension is missing in specification.
         # I just take 1.2 of the outer diameter of the larger pipe
-        return self.POD * 1.1
+        return DimensionKernel.thingLengthA2(self.POD)
 
     def ThicknessA3(self):
         # I do not know this dimension. I just return pipe thickness of the other end.
@@ -81,20 +85,14 @@ class Dimensions:
 
     def ConeLengthA4(self):
         # I do know this dimensions. I just use half of N
-        return self.N / 2.0
+        return DimensionKernel.coneLengthA4(self.N)
 
     def auxiliararyPoints(self):
         """Calculate auxiliarary points which are used to build a cross from cylinders.
 
         See documentation picture bushing-cacluations.png
         """
-        result = {}
-        result["p1"] = FreeCAD.Vector(0, 0, 0)
-        result["p2"] = FreeCAD.Vector(0, 0, self.ConeLengthA4())
-        result["p3"] = FreeCAD.Vector(0, 0, self.N)
-        result["p4"] = FreeCAD.Vector(0, 0, self.L - self.ThingThicknessA1())
-
-        return result
+        return Piping.toVectors(DimensionKernel.bushingAuxiliaryPoints(self.L, self.N))
 
 
 class Bushing:
@@ -168,6 +166,7 @@ class Bushing:
         common.Placement.Base = aux["p4"]
         return common
 
+    @Trace.traced("outer part")
     def createOuterPart(self):
         aux = self.dims.auxiliararyPoints()
         outer_cylinder = self.document.addObject(
@@ -181,6 +180,7 @@ class Bushing:
         fusion.Shapes = [outer_cylinder, thing, ]
         return fusion
 
+    @Trace.traced("inner part")
     def createInnerPart(self):
         aux = self.dims.auxiliararyPoints()
         # Create central cilinder.
@@ -217,12 +217,14 @@ class Bushing:
         bushing.Base = outer
         bushing.Tool = inner
 
+        Metrics.countDocumentObjects(Piping.nestedObjects(bushing))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, bushing, "bushing (solid)")
             Piping.removePartWithChildren(self.document, bushing)
@@ -245,19 +247,27 @@ class BushingFromTable:
         else:
             return parseQuantity(row["PThk1"])
 
-    def create(self, partNumber, outputType):
-
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
-
         dims.N = parseQuantity(row["N"])
         dims.L = parseQuantity(row["L"])
         dims.POD = parseQuantity(row["POD"])
         dims.POD1 = parseQuantity(row["POD1"])
-        dims.PThk1 = self.getPThk1(row)
+        dims.PThk1 = cls.getPThk1(row)
+        return dims
+
+    @Trace.traced("BushingFromTable.create")
+    def create(self, partNumber, outputType):
+
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             bushing = Bushing(self.document)
@@ -276,7 +286,8 @@ class BushingFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = row["PSize"]  # What to do for multiple sizes?
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             # feature.Label = partName # Part name must be unique, that is qhy use partNumber instead.
             feature.PartNumber = partNumber
             return part
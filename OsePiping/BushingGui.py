@@ -23,6 +23,7 @@ All other dimensions are used for inromation.
 </p></body></html>"""
         params.settingsName = "bushing user input"
         params.keyColumnName = "PartNumber"
+        params.catalogName = "bushing"
         super(MainDialog, self).__init__(params)
 
     def createNewPart(self, document, table, partName, outputType):
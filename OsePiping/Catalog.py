@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Registry of the fitting types and their tables. Create shapes of catalog parts
+# with the Part API, without a document.
+
+import importlib
+import OsePiping.Piping as Piping
+
+
+class ShapeParameters:
+    """Object with dimensions as attributes.
+
+    Shape functions of the Fl* classes read dimensions from a document object.
+    This class replaces the document object, when the shape is created without a document.
+    """
+
+    def __init__(self, dims):
+        for name in dims.getNames():
+            setattr(self, name, getattr(dims, name))
+
+
+class FittingType:
+    """Modules and classes of one fitting type."""
+
+    def __init__(self, name, moduleName, fromTableClassName, flModuleName, flClassName):
+        """Initialize class.
+
+        :param name: name of the fitting type. It is also the name of the table, without ".csv".
+        """
+        self.name = name
+        self.moduleName = moduleName
+        self.fromTableClassName = fromTableClassName
+        self.flModuleName = flModuleName
+        self.flClassName = flClassName
+
+    def getModule(self):
+        return importlib.import_module(self.moduleName)
+
+    def getFromTableClass(self):
+        return getattr(self.getModule(), self.fromTableClassName)
+
+    def getFlClass(self):
+        return getattr(importlib.import_module(self.flModuleName), self.flClassName)
+
+    def getTablePath(self):
+        return self.getModule().CSV_TABLE_PATH
+
+    def loadTable(self):
+        module = self.getModule()
+        table = Piping.CsvTable(module.DIMENSIONS_USED)
+        table.load(module.CSV_TABLE_PATH)
+        return table
+
+    def getDimensions(self, row, length=None):
+        """Return dimensions of the part in the table row. Only pipes use the length."""
+        return self.getFromTableClass().getDimensions(row)
+
+    def createShape(self, dims):
+        """Create the shape of a fitting with the dimensions dims."""
+        return self.getFlClass().createShape(ShapeParameters(dims))
+
+    def createShapeFromRow(self, row, length=None):
+        return self.createShape(self.getDimensions(row, length))
+
+    def createPart(self, document, table, partNumber, outputType, length=None):
+        """Create a part in the document with the *FromTable builder. Return what the builder returns."""
+        builder = self.getFromTableClass()(document, table)
+        return builder.create(partNumber, outputType)
+
+
+class PipeType(FittingType):
+    """Pipes have no Fl* class. Their length is not in the table."""
+
+    def __init__(self):
+        super(PipeType, self).__init__("pipe", "OsePiping.Pipe", "PipeFromTable", None, None)
+
+    def getDimensions(self, row, length=None):
+        return self.getFromTableClass().getDimensions(row, length)
+
+    def createShape(self, dims):
+        return self.getModule().createShape(dims)
+
+    def createPart(self, document, table, partNumber, outputType, length=None):
+        if length is None:
+            length = self.getModule().Dimensions().H
+        builder = self.getFromTableClass()(document, table)
+        return builder.create(partNumber, length, outputType)
+
+
+FITTING_TYPES = [
+    PipeType(),
+    FittingType("coupling", "OsePiping.Coupling", "CouplingFromTable", "OsePiping.FlCoupling", "Coupling"),
+    FittingType("bushing", "OsePiping.Bushing", "BushingFromTable", "OsePiping.FlBushing", "Bushing"),
+    FittingType("elbow", "OsePiping.Elbow", "ElbowFromTable", "OsePiping.FlElbow", "Elbow"),
+    FittingType("sweep-elbow", "OsePiping.SweepElbow", "SweepElbowFromTable",
+                "OsePiping.FlSweepElbow", "SweepElbow"),
+    FittingType("tee", "OsePiping.Tee", "TeeFromTable", "OsePiping.FlTee", "Tee"),
+    FittingType("corner", "OsePiping.Corner", "CornerFromTable", "OsePiping.FlCorner", "Corner"),
+    FittingType("cross", "OsePiping.Cross", "CrossFromTable", "OsePiping.FlCross", "Cross"),
+]
+
+
+def getFittingTypeNames():
+    return [t.name for t in FITTING_TYPES]
+
+
+def getFittingType(name):
+    for fitting_type in FITTING_TYPES:
+        if fitting_type.name == name:
+            return fitting_type
+    raise KeyError("Unknown fitting type {}. Known types are: {}.".format(
+        name, ", ".join(getFittingTypeNames())))
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Export whole catalogs as STEP or BREP. Parts are built directly with the Part API,
+# without document objects. Run it with FreeCADCmd from the workbench directory:
+#
+#   FreeCADCmd -c "import sys, OsePiping.CatalogExport as E; sys.exit(E.main(['files', 'catalog-step']))"
+#   FreeCADCmd -c "import sys, OsePiping.CatalogExport as E; sys.exit(E.main(['assembly', 'catalog.step']))"
+#
+# or run it as a script with the arguments after --pass:
+#
+#   FreeCADCmd OsePiping/CatalogExport.py --pass files catalog-step
+#
+# Add "--fitting name" (repeatable), "--format brep" or "--length 2 m" to the arguments.
+# The exit status is 0 if all parts were written, 1 if some parts failed and 2 for wrong
+# usage.
+#
+# "files" writes one file per row. Only one shape is kept in memory at a time, thus
+# the memory does not depend on the size of the catalog. Rows with the same dimensions
+# have identical shapes. Such shapes are built once, the other files are copies.
+#
+# "assembly" writes a single STEP file. Every unique shape is a prototype object and
+# every row is an App::Link to it, placed on a grid. The STEP writer exports linked
+# objects as one shared product definition with several instances. The assembly keeps
+# the unique shapes in memory, but not a copy per row.
+
+import json
+import os
+import shutil
+import sys
+import time
+
+if __name__ == "__main__":
+    # Running as a script. Make the workbench modules importable.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FreeCAD
+import OsePiping.Piping as Piping
+import OsePiping.Catalog as Catalog
+import OsePiping.BatchGenerate as BatchGenerate
+
+MANIFEST_NAME = "manifest.jsonl"
+# Distance between neighbouring parts in the assembly in mm.
+GRID_GAP = 20.0
+
+
+def getShapeKey(fittingType, dims):
+    """Return a key, which is equal for all rows with the same shape."""
+    values = tuple("{:.6g}".format(getattr(dims, name)) for name in dims.getNames())
+    return (fittingType.name,) + values
+
+
+def iterateRows(fittingType, length):
+    """Yield tuples (part number, dimensions) of all rows of the fitting type."""
+    table = fittingType.loadTable()
+    for i in range(0, len(table.data)):
+        row = dict(zip(table.headers, table.data[i]))
+        yield (table.getPartKey(i), fittingType.getDimensions(row, length))
+
+
+def createSolid(fittingType, dims):
+    return Piping.makeSolid(fittingType.createShape(dims))
+
+
+def getFittingTypes(fittingNames):
+    if fittingNames is None:
+        fittingNames = Catalog.getFittingTypeNames()
+    res = []
+    for name in fittingNames:
+        try:
+            res.append(Catalog.getFittingType(name))
+        except KeyError as e:
+            raise BatchGenerate.JobError(e.args[0])
+    return res
+
+
+def exportFiles(directory, fittingNames=None, fileFormat="step", length=None, log=print):
+    """Write one file per row to the directory. Return number of failed rows."""
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    failed = 0
+    with open(os.path.join(directory, MANIFEST_NAME), "a") as manifest:
+        for fitting_type in getFittingTypes(fittingNames):
+            # Files already written for a shape key.
+            written = {}
+            for part_number, dims in iterateRows(fitting_type, length):
+                start = time.time()
+                record = {"fitting": fitting_type.name, "partNumber": part_number}
+                file_name = BatchGenerate.getFileName(part_number, fileFormat)
+                path = os.path.join(directory, file_name)
+                try:
+                    key = getShapeKey(fitting_type, dims)
+                    if key in written:
+                        shutil.copyfile(os.path.join(directory, written[key]), path)
+                        record["sameAs"] = written[key]
+                    else:
+                        BatchGenerate.exportShape(createSolid(fitting_type, dims), path, fileFormat)
+                        written[key] = file_name
+                    record["file"] = file_name
+                    record["status"] = "ok"
+                except Exception as e:
+                    failed += 1
+                    record["status"] = "failed"
+                    record["error"] = str(e)
+                record["seconds"] = time.time() - start
+                manifest.write(json.dumps(record) + "\n")
+                manifest.flush()
+                log("{} {} {}".format(fitting_type.name, part_number, record["status"]))
+    return failed
+
+
+class GridLayout:
+    """Place parts in rows. Every fitting type starts a new row."""
+
+    def __init__(self, gap=GRID_GAP):
+        self.gap = gap
+        self.x = 0.0
+        self.y = 0.0
+        self.rowDepth = 0.0
+
+    def newRow(self):
+        self.y += self.rowDepth + self.gap
+        self.x = 0.0
+        self.rowDepth = 0.0
+
+    def place(self, boundBox):
+        """Return placement of the next part with the bounding box."""
+        base = FreeCAD.Vector(self.x - boundBox.XMin, self.y - boundBox.YMin, -boundBox.ZMin)
+        self.x += boundBox.XLength + self.gap
+        self.rowDepth = max(self.rowDepth, boundBox.YLength)
+        return FreeCAD.Placement(base, FreeCAD.Rotation())
+
+
+def exportAssembly(path, fittingNames=None, length=None, log=print):
+    """Write all rows to a single STEP file with shared shapes. Return pair (rows, unique shapes)."""
+    import Import
+    document = FreeCAD.newDocument("OsePipingCatalogExport")
+    document.UndoMode = 0
+    rows = 0
+    try:
+        assembly = document.addObject("App::Part", "Catalog")
+        layout = GridLayout()
+        for fitting_type in getFittingTypes(fittingNames):
+            prototypes = {}
+            fitting_rows = 0
+            for part_number, dims in iterateRows(fitting_type, length):
+                key = getShapeKey(fitting_type, dims)
+                prototype = prototypes.get(key)
+                if prototype is None:
+                    try:
+                        shape = createSolid(fitting_type, dims)
+                    except Exception as e:
+                        log("{} {} failed: {}".format(fitting_type.name, part_number, e))
+                        continue
+                    prototype = document.addObject("Part::Feature", "Prototype")
+                    prototype.Shape = shape
+                    prototype.Label = "{} {}".format(fitting_type.name, part_number)
+                    prototypes[key] = prototype
+                link = document.addObject("App::Link", "Link")
+                link.LinkedObject = prototype
+                link.Label = part_number
+                link.Placement = layout.place(prototype.Shape.BoundBox)
+                assembly.addObject(link)
+                fitting_rows += 1
+            rows += fitting_rows
+            log("{}: {} rows, {} unique shapes".format(fitting_type.name, fitting_rows, len(prototypes)))
+            layout.newRow()
+        document.recompute()
+        Import.export([assembly], path)
+        unique = len([o for o in document.Objects if o.TypeId == "Part::Feature"])
+    finally:
+        FreeCAD.closeDocument(document.Name)
+    return (rows, unique)
+
+
+def main(argv):
+    usage = ("Usage: main(['files', directory, [--fitting name]... [--format step|brep] [--length value]])\n"
+             "       main(['assembly', file.step, [--fitting name]... [--length value]])")
+    if len(argv) < 2 or argv[0] not in ["files", "assembly"]:
+        print(usage)
+        return 2
+    options = argv[2:]
+    fittings = [options[i + 1] for i in range(0, len(options) - 1) if options[i] == "--fitting"]
+    formats = [options[i + 1] for i in range(0, len(options) - 1) if options[i] == "--format"]
+    lengths = [options[i + 1] for i in range(0, len(options) - 1) if options[i] == "--length"]
+    length = FreeCAD.Units.parseQuantity(lengths[-1] if lengths else "1 m")
+    try:
+        # Check the fitting names before any file is written.
+        getFittingTypes(fittings if fittings else None)
+    except BatchGenerate.JobError as e:
+        print(e)
+        print(usage)
+        return 2
+    if argv[0] == "files":
+        file_format = formats[-1] if formats else "step"
+        if file_format not in BatchGenerate.FORMATS:
+            print(usage)
+            return 2
+        failed = exportFiles(argv[1], fittings if fittings else None, file_format, length)
+        return 1 if failed > 0 else 0
+    rows, unique = exportAssembly(argv[1], fittings if fittings else None, length)
+    print("Exported {} rows with {} unique shapes to {}.".format(rows, unique, argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(BatchGenerate.getScriptArguments(sys.argv, __file__)))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Optional cProfile profiles of the workbench commands and of the creation of parts
+# in the dialogs. Profiling is off by default. Switch it on by the environment variable
+#
+#   OSE_PIPING_PROFILE=1              write profiles to the temporary directory
+#   OSE_PIPING_PROFILE=/path/to/dir   write profiles to this directory
+#
+# or by the boolean parameter "ProfileCommands" (and the optional string parameter
+# "ProfileDirectory") in Tools->Edit parameters->BaseApp/Preferences/Mod/OsePiping.
+#
+# Every call writes a file <command>-<timestamp>.prof. Open it with
+#   python -m pstats file.prof
+# or with snakeviz.
+
+import cProfile
+import functools
+import os
+import tempfile
+import time
+import FreeCAD
+
+ENVIRONMENT_VARIABLE = "OSE_PIPING_PROFILE"
+PARAMETER_GROUP = "User parameter:BaseApp/Preferences/Mod/OsePiping"
+
+# Profilers of the calls in progress. A dialog runs inside the Activated() call of its
+# command. The outer profiler is paused, while the inner one runs.
+_profilers = []
+
+
+def _getParameters():
+    return FreeCAD.ParamGet(PARAMETER_GROUP)
+
+
+def isEnabled():
+    if os.environ.get(ENVIRONMENT_VARIABLE, "") not in ["", "0"]:
+        return True
+    return _getParameters().GetBool("ProfileCommands", False)
+
+
+def getDirectory():
+    """Return directory for the profiles."""
+    value = os.environ.get(ENVIRONMENT_VARIABLE, "")
+    if value not in ["", "0", "1"]:
+        return value
+    directory = _getParameters().GetString("ProfileDirectory", "")
+    if directory != "":
+        return directory
+    return tempfile.gettempdir()
+
+
+def getProfilePath(name):
+    now = time.time()
+    timestamp = "{}-{:03d}".format(time.strftime("%Y%m%d-%H%M%S", time.localtime(now)),
+                                   int(now * 1000) % 1000)
+    return os.path.join(getDirectory(), "{}-{}.prof".format(name, timestamp))
+
+
+def profiledMethod(function):
+    """Decorator of a method. If profiling is on, write a profile of every call.
+
+    The profile is named by the module, class and method, for example
+    OsePiping.TeeGui.MainDialog.acceptCreationMode-20261019-101500-042.prof.
+    """
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if not isEnabled():
+            return function(self, *args, **kwargs)
+        name = "{}.{}.{}".format(type(self).__module__, type(self).__name__, function.__name__)
+        profiler = cProfile.Profile()
+        if len(_profilers) > 0:
+            _profilers[-1].disable()
+        _profilers.append(profiler)
+        profiler.enable()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            profiler.disable()
+            _profilers.pop()
+            if len(_profilers) > 0:
+                _profilers[-1].enable()
+            path = getProfilePath(name)
+            try:
+                profiler.dump_stats(path)
+                FreeCAD.Console.PrintMessage("Profile written to {}.\n".format(path))
+            except (IOError, OSError) as e:
+                FreeCAD.Console.PrintError("Can not write profile {}: {}\n".format(path, e))
+    return wrapper
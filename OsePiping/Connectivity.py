@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Find connections between pipes and fittings. Two ports are connected if their
+# world positions coincide within a tolerance and their normals point against each other.
+
+import OsePiping.PortIndex as PortIndex
+
+# Two ports are connected if the angle between one normal and the opposite of the other
+# normal is not larger than this (cos of the angle is compared).
+DEFAULT_NORMAL_TOLERANCE = 1e-3
+
+
+class Connection:
+    """A connection of a port of one object to a port of another object."""
+
+    def __init__(self, portIndex, otherName, otherPortIndex):
+        self.portIndex = portIndex
+        self.otherName = otherName
+        self.otherPortIndex = otherPortIndex
+
+    def __eq__(self, other):
+        return (self.portIndex, self.otherName, self.otherPortIndex) == \
+            (other.portIndex, other.otherName, other.otherPortIndex)
+
+    def __hash__(self):
+        return hash((self.portIndex, self.otherName, self.otherPortIndex))
+
+    def __repr__(self):
+        return "Connection(%d -> %s:%d)" % (self.portIndex, self.otherName, self.otherPortIndex)
+
+
+def normalsAreOpposed(n1, n2, tolerance=DEFAULT_NORMAL_TOLERANCE):
+    """Check if the normals n1 and n2 (tuples of floats) point against each other.
+
+    Ports without normals (Dodo/Flamingo parts without rotation angles) are always accepted.
+    """
+    if n1 is None or n2 is None:
+        return True
+    dot = n1[0] * n2[0] + n1[1] * n2[1] + n1[2] * n2[2]
+    return dot <= -1.0 + tolerance
+
+
+class ConnectivityGraph:
+    """Adjacency structure of the parts of a document.
+
+    The ports are hashed into grid cells with the size of the tolerance. Thus, matching
+    ports are found by looking only into the neighbour cells of each port.
+    """
+
+    def __init__(self, tolerance=PortIndex.DEFAULT_TOLERANCE, normalTolerance=DEFAULT_NORMAL_TOLERANCE):
+        self.tolerance = tolerance
+        self.normalTolerance = normalTolerance
+        self._index = PortIndex.PortIndex(cellSize=tolerance * 2, tolerance=tolerance)
+        # Map object name to the set of its connections.
+        self.adjacency = {}
+
+    def build(self, document):
+        self._index.build(document)
+        self.adjacency = {}
+        for name in self._index.getObjectNames():
+            self.adjacency[name] = set()
+        for name in list(self.adjacency.keys()):
+            self._connect(name)
+
+    def _connect(self, name):
+        """Find connections of the object with the name and add them in both directions."""
+        for entry in self._index.getEntries(name):
+            matches = self._index.portsWithinRadius(entry.getPosition(), self.tolerance, exclude=name)
+            for _, other in matches:
+                if not normalsAreOpposed(entry.normal, other.normal, self.normalTolerance):
+                    continue
+                self.adjacency.setdefault(name, set()).add(
+                    Connection(entry.portIndex, other.objName, other.portIndex))
+                self.adjacency.setdefault(other.objName, set()).add(
+                    Connection(other.portIndex, name, entry.portIndex))
+
+    def removeObject(self, name):
+        for connection in self.adjacency.pop(name, set()):
+            others = self.adjacency.get(connection.otherName)
+            if others is not None:
+                others.discard(Connection(connection.otherPortIndex, name, connection.portIndex))
+        self._index.removeObject(name)
+
+    def updateObject(self, obj):
+        """Recalculate connections of a single object, for example, after it was moved."""
+        self.removeObject(obj.Name)
+        self._index.addObject(obj)
+        if self._index.hasObject(obj.Name):
+            self.adjacency[obj.Name] = set()
+            self._connect(obj.Name)
+
+    def getConnections(self, name):
+        return sorted(self.adjacency.get(name, set()), key=lambda c: c.portIndex)
+
+    def getNeighbours(self, name):
+        return sorted(set(c.otherName for c in self.adjacency.get(name, set())))
+
+    def openEnds(self):
+        """Return a list of pairs (object name, port index) of ports without connections."""
+        res = []
+        for name in sorted(self.adjacency.keys()):
+            connected = set(c.portIndex for c in self.adjacency[name])
+            for entry in self._index.getEntries(name):
+                if entry.portIndex not in connected:
+                    res.append((name, entry.portIndex))
+        return res
+
+    def walkRun(self, startName):
+        """Return names of all the objects connected to the start object (including it).
+
+        The objects are returned in the breadth-first order.
+        """
+        if startName not in self.adjacency:
+            return []
+        visited = set([startName])
+        order = [startName]
+        i = 0
+        while i < len(order):
+            for neighbour in self.getNeighbours(order[i]):
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    order.append(neighbour)
+            i += 1
+        return order
+
+    def runs(self):
+        """Return a list of runs. Each run is a list of names of connected objects."""
+        visited = set()
+        res = []
+        for name in sorted(self.adjacency.keys()):
+            if name not in visited:
+                run = self.walkRun(name)
+                visited.update(run)
+                res.append(run)
+        return res
+
+
+def buildGraph(document, tolerance=PortIndex.DEFAULT_TOLERANCE):
+    graph = ConnectivityGraph(tolerance)
+    graph.build(document)
+    return graph
@@ -7,6 +7,9 @@ import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 parseQuantity = FreeCAD.Units.parseQuantity
 
@@ -16,13 +19,15 @@ CSV_TABLE_PATH = os.path.join(OsePipingBase.TABLE_PATH, "corner.csv")
 DIMENSIONS_USED = ["G", "H", "M", "POD", "PThk"]
 
 
-class Dimensions:
-    def __init__(self):
-        self.G = parseQuantity("2 cm")
-        self.H = parseQuantity("3 cm")
-        self.M = parseQuantity("3 cm")
-        self.POD = parseQuantity("2 cm")
-        self.PThk = parseQuantity("0.5 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("G", "H", "M", "POD", "PThk")
+    DEFAULTS = {
+        "G": "2 cm",
+        "H": "3 cm",
+        "M": "3 cm",
+        "POD": "2 cm",
+        "PThk": "0.5 cm",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -54,11 +59,7 @@ class Dimensions:
 
         See documentation picture corner-cacluations.png.
         """
-        result = {}
-        result["p1"] = FreeCAD.Vector(self.G, 0, 0)
-        result["p2"] = FreeCAD.Vector(0, self.G, 0)
-        result["p3"] = FreeCAD.Vector(0, 0, self.G)
-        return result
+        return Piping.toVectors(DimensionKernel.cornerAuxiliaryPoints(self.G))
 
 
 class Corner:
@@ -113,9 +114,11 @@ class Corner:
         fusion.Shapes = fusion.Shapes + [x_socket, y_socket, z_socket]
         return fusion
 
+    @Trace.traced("outer part")
     def createOuterPart(self):
         return self.createPrimitiveCorner(self.dims.H, self.dims.M)
 
+    @Trace.traced("inner part")
     def createInnerPart(self):
         inner = self.createPrimitiveCorner(self.dims.H, self.dims.PID())
         inner = self.addSockets(inner)
@@ -130,12 +133,14 @@ class Corner:
         corner.Base = outer
         corner.Tool = inner
 
+        Metrics.countDocumentObjects(Piping.nestedObjects(corner))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, corner, "corner (solid)")
             Piping.removePartWithChildren(self.document, corner)
@@ -165,18 +170,27 @@ class CornerFromTable:
         else:
             return ""
 
-    def create(self, partNumber, outputType):
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
-
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.G = parseQuantity(row["G"])
         dims.H = parseQuantity(row["H"])
         dims.M = parseQuantity(row["M"])
         dims.POD = parseQuantity(row["POD"])
-        dims.PThk = self.getPThk(row)
+        dims.PThk = cls.getPThk(row)
+        return dims
+
+    @Trace.traced("CornerFromTable.create")
+    def create(self, partNumber, outputType):
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             corner = Corner(self.document)
@@ -194,7 +208,8 @@ class CornerFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = self.getPSize(row)
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             feature.PartNumber = partNumber
             return part
 
@@ -24,6 +24,7 @@ All other dimensions are used for inromation.
 </p></body></html>"""
         params.settingsName = "corner user input"
         params.keyColumnName = "PartNumber"
+        params.catalogName = "corner"
         super(MainDialog, self).__init__(params)
 
     def createNewPart(self, document, table, partName, outputType):
@@ -3,11 +3,13 @@
 # Date: 20 Januar December 2018
 # Create a coupling fitting.
 
-import math
 import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -19,16 +21,18 @@ CSV_TABLE_PATH = os.path.join(OsePipingBase.TABLE_PATH, "coupling.csv")
 DIMENSIONS_USED = ["L", "M", "M1", "N", "POD1", "POD", "PThk", "PThk1"]
 
 
-class Dimensions:
-    def __init__(self):
-        self.M = parseQuantity("5 cm")  # Outer diameter of socket 1.
-        self.M1 = parseQuantity("3 cm")  # Outer diameter of socket 2.
-        self.N = parseQuantity("1 cm")  # Length of the intemidate section of the coupling.
-        self.POD = parseQuantity("4 cm")  # Pipe outer diameter at the socket 1.
-        self.POD1 = parseQuantity("2 cm")  # Pipe outer diameter at the socket 2.
-        self.PThk = parseQuantity("0.5 cm")  # Pipe inner diameter at the socket 1.
-        self.PThk1 = parseQuantity("0.5 cm")  # Pipe inner diameter at the socket 2.
-        self.L = parseQuantity("9 cm")  # Length of the socket1.
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("M", "M1", "N", "POD", "POD1", "PThk", "PThk1", "L")
+    DEFAULTS = {
+        "M": "5 cm",  # Outer diameter of socket 1.
+        "M1": "3 cm",  # Outer diameter of socket 2.
+        "N": "1 cm",  # Length of the intemidate section of the coupling.
+        "POD": "4 cm",  # Pipe outer diameter at the socket 1.
+        "POD1": "2 cm",  # Pipe outer diameter at the socket 2.
+        "PThk": "0.5 cm",  # Pipe inner diameter at the socket 1.
+        "PThk1": "0.5 cm",  # Pipe inner diameter at the socket 2.
+        "L": "9 cm",  # Length of the socket1.
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -60,20 +64,14 @@ class Dimensions:
 
         a1 is positive if POD > POD1, it is negative if POD < POD1.
         """
-        a2 = max(self.M - self.POD, self.M1 - self.POD1) / 2
-        x = (self.POD - self.POD1)
-        # The math.sqrt will return Float. That is why
-        # we need to convert x in float too.
-        factor = x.Value / math.sqrt(4 * self.N**2 + x**2)
-        a1 = factor * a2
-        return a1
+        return DimensionKernel.shiftA1(self.M, self.M1, self.POD, self.POD1, self.N)
 
     def socketDepthA5(self):
         """Determine the length of the bottom (or left) socket.
 
         We assume that the socket lengthes are the same on both ends.
         """
-        return (self.L - self.N) / 2.0
+        return DimensionKernel.socketDepthA5(self.L, self.N)
 
     def bottomSocketOuterLength(self):
         """Return outer length of the socket on the bottom in FreeCAD (on the left size in the picture)."""
@@ -88,13 +86,8 @@ class Dimensions:
 
         See documentation picture coupling-cacluations.png
         """
-        result = {}
-        result["p1"] = FreeCAD.Vector(0, 0, 0)
-        result["p2"] = FreeCAD.Vector(0, 0, self.socketDepthA5())
-        result["p3"] = FreeCAD.Vector(0, 0, self.L - self.socketDepthA5())
-        result["p4"] = FreeCAD.Vector(0, 0, self.socketDepthA5() + self.shiftA1())
-        result["p5"] = FreeCAD.Vector(0, 0, self.L - self.socketDepthA5() + self.shiftA1())
-        return result
+        return Piping.toVectors(DimensionKernel.couplingAuxiliaryPoints(
+            self.L, self.N, self.M, self.M1, self.POD, self.POD1))
 
     def PID(self):
         return self.POD - 2 * self.PThk
@@ -114,6 +107,7 @@ class Coupling:
         if not valid:
             raise Piping.UnplausibleDimensions(msg)
 
+    @Trace.traced("outer part")
     def createOuterPart(self):
         if self.dims.M == self.dims.M1:
             return self.createOuterPartEqual()
@@ -151,6 +145,7 @@ class Coupling:
         outer.Shapes = [cylinder1, cone, cylinder2]
         return outer
 
+    @Trace.traced("inner part")
     def createInnerPart(self):
         # Create parts which must be removed from the coupling.
         if self.dims.PID() == self.dims.PID1():
@@ -205,9 +200,11 @@ class Coupling:
         coupling.Base = outer
         coupling.Tool = inner
 
+        Metrics.countDocumentObjects(Piping.nestedObjects(coupling))
         if convertToSolid:
             # Before making a solid, recompute documents.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, coupling, "coupling (solid)")
             Piping.removePartWithChildren(self.document, coupling)
@@ -245,13 +242,10 @@ class CouplingFromTable:
         else:
             return ""
 
-    def create(self, partNumber, outputType):
-        coupling = Coupling(self.document)
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
-
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.L = parseQuantity(row["L"])
         dims.M = parseQuantity(row["M"])
@@ -259,8 +253,20 @@ class CouplingFromTable:
         dims.N = parseQuantity(row["N"])
         dims.POD = parseQuantity(row["POD"])
         dims.POD1 = parseQuantity(row["POD1"])
-        dims.PThk = self.getPThk(row)
-        dims.PThk1 = self.getPThk1(row)
+        dims.PThk = cls.getPThk(row)
+        dims.PThk1 = cls.getPThk1(row)
+        return dims
+
+    @Trace.traced("CouplingFromTable.create")
+    def create(self, partNumber, outputType):
+        coupling = Coupling(self.document)
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             coupling = Coupling(self.document)
@@ -278,7 +284,8 @@ class CouplingFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = self.getPSize(row)  # What to do for multiple sizes?
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             feature.PartNumber = partNumber
             return part
 
@@ -5,14 +5,21 @@
 # Use the BaseDialog to derive other
 
 import os.path
+import math
 from PySide import QtCore, QtGui
 import FreeCAD
 import FreeCADGui
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.Backend as Backend
+import OsePiping.Catalog as Catalog
+import OsePiping.ShapeJobs as ShapeJobs
+import OsePiping.PreviewGui as PreviewGui
 import OsePiping.PipingGui as PipingGui
+import OsePiping.CommandProfiler as CommandProfiler
 # import rpdb2
 import OsePiping.Port as Port
+import OsePiping.Metrics as Metrics
 
 
 class DialogParams:
@@ -28,6 +35,9 @@ class DialogParams:
         self.selectionMode = False
         # Old style column name for the unique ID of the part.
         self.keyColumnName = "Name"
+        # Name of the fitting type in OsePiping.Catalog. If it is set, solids
+        # are built on worker threads.
+        self.catalogName = None
 
 
 def UnicodeUTF8():
@@ -44,10 +54,14 @@ def UnicodeUTF8():
 
 class BaseDialog(QtGui.QDialog):
     QSETTINGS_APPLICATION = "OSE piping workbench"
+    # Dialogs kept alive between invocations. One dialog per dialog class.
+    _instances = {}
 
     def __init__(self, params):
         super(BaseDialog, self).__init__()
         self.params = params
+        # True while several parts are created at once.
+        self.batchMode = False
         self.initUi()
         if Piping.HasFlamingoSupport() and not Piping.HasDodoSupport():
             self.labelFlamingoIsDepricated.show()
@@ -59,9 +73,35 @@ class BaseDialog(QtGui.QDialog):
         else:
             self.radioButtonDodoFlamingo.setEnabled(False)
 
+    @classmethod
+    def getInstance(cls, document, table):
+        """Return the dialog of this class. Create it on the first call only.
+
+        Creating a dialog runs setupUi, loads the dimensions picture and the table model.
+        Later calls only update the document and, if the table has changed, the table model.
+        """
+        dialog = BaseDialog._instances.get(cls)
+        if dialog is None:
+            dialog = cls(document, table)
+            BaseDialog._instances[cls] = dialog
+        else:
+            dialog.updateParams(document, table)
+        return dialog
+
+    def updateParams(self, document, table):
+        self.params.document = document
+        if table is not self.params.table:
+            self.params.table = table
+            partName = self.getSelectedPartName()
+            if self.preview is not None:
+                self.preview.clearCache()
+            self.initTable()
+            self.selectPartByName(partName)
+
     def initUi(self):
         self.result = -1
         self.setupUi(self)
+        self.initPreview()
         # Fill table with dimensions.
         self.initTable()
 
@@ -128,7 +168,7 @@ class BaseDialog(QtGui.QDialog):
         self.verticalLayout.addWidget(self.outputTypeWidget)
         self.tableViewParts = QtGui.QTableView(Dialog)
         self.tableViewParts.setSelectionMode(
-            QtGui.QAbstractItemView.SingleSelection)
+            QtGui.QAbstractItemView.ExtendedSelection)
         self.tableViewParts.setSelectionBehavior(
             QtGui.QAbstractItemView.SelectRows)
         self.tableViewParts.setObjectName("tableViewParts")
@@ -183,6 +223,29 @@ class BaseDialog(QtGui.QDialog):
             self.params.table.headers, self.params.table.data)
         self.model.keyColumnName = self.params.keyColumnName
         self.tableViewParts.setModel(self.model)
+        self.tableViewParts.selectionModel().selectionChanged.connect(self.updatePreview)
+
+    def initPreview(self):
+        """Show a preview of the selected part next to the table, if the fitting type is in the catalog."""
+        self.preview = None
+        if self.params.catalogName is None:
+            return
+        self.preview = PreviewGui.PartPreviewWidget(self.params.catalogName, self)
+        index = self.verticalLayout.indexOf(self.tableViewParts)
+        self.verticalLayout.removeWidget(self.tableViewParts)
+        layout = QtGui.QHBoxLayout()
+        layout.addWidget(self.tableViewParts, 3)
+        layout.addWidget(self.preview, 1)
+        self.verticalLayout.insertLayout(index, layout)
+
+    def updatePreview(self, *args):
+        if self.preview is None:
+            return
+        partNames = self.getSelectedPartNames()
+        if len(partNames) == 0:
+            self.preview.showPart(None, None)
+        else:
+            self.preview.showPart(partNames[0], self.params.table.findPart(partNames[0]))
 
     def getSelectedPartName(self):
         sel = self.tableViewParts.selectionModel()
@@ -192,6 +255,12 @@ class BaseDialog(QtGui.QDialog):
                 return self.model.getPartKey(rowIndex)
         return None
 
+    def getSelectedPartNames(self):
+        """Return names of all selected parts in the order of the table rows."""
+        sel = self.tableViewParts.selectionModel()
+        rows = sorted(index.row() for index in sel.selectedRows())
+        return [self.model.getPartKey(row) for row in rows]
+
     def selectPartByName(self, partName):
         """Select first row with a part with a name partName."""
         if partName is not None:
@@ -206,6 +275,80 @@ class BaseDialog(QtGui.QDialog):
         """
         pass
 
+    def createNewParts(self, document, table, partNames, outputType):
+        """Create several parts in one undo transaction and lay them out on a grid.
+
+        Return list of created document objects.
+        """
+        document.openTransaction("Create {} parts ({})".format(len(partNames), self.params.fittingType))
+        self.batchMode = True
+        objects = []
+        try:
+            for partName in partNames:
+                part = self.createNewPart(document, table, partName, outputType)
+                if part is not None:
+                    # Dodo/Flamingo builders return the proxy instead of the document object.
+                    objects.append(document.getObject(part.Name))
+            document.recompute()
+            layoutOnGrid(objects)
+            document.recompute()
+        except Exception:
+            # Do not leave a half-built batch as an undo step.
+            document.abortTransaction()
+            raise
+        else:
+            document.commitTransaction()
+        finally:
+            self.batchMode = False
+        return objects
+
+    def createNewSolidsInBackground(self, document, table, partNames):
+        """Build solids in worker processes and add them to the document as they are finished.
+
+        The dialog shows the progress and allows to cancel the construction.
+        Return list of created document objects.
+        """
+        fitting_type = Catalog.getFittingType(self.params.catalogName)
+        runner = ShapeJobs.JobRunner()
+        # Read the rows in the GUI thread. Workers get only the rows.
+        runner.submit([ShapeJobs.ShapeJob(name, fitting_type.createShapeFromRow, table.findPart(name))
+                       for name in partNames])
+        progress = QtGui.QProgressDialog("Building {} parts ({})...".format(len(partNames), self.params.fittingType),
+                                         "Cancel", 0, len(partNames), self)
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(500)
+        document.openTransaction("Create {} parts ({})".format(len(partNames), self.params.fittingType))
+        objects = []
+        try:
+            while runner.hasPendingResults():
+                QtGui.QApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+                if progress.wasCanceled():
+                    runner.cancel()
+                    FreeCAD.Console.PrintMessage("Building of the parts was cancelled.\n")
+                    break
+                for result in runner.takeFinished():
+                    if result.error is not None:
+                        FreeCAD.Console.PrintError("Cannot build part {}: {}\n".format(result.key, result.error))
+                        continue
+                    name = "{} (solid)".format(self.params.fittingType.lower())
+                    obj = Piping.addSolid(document, result.shape, name)
+                    obj.Label = "{} {}".format(self.params.fittingType, result.key)
+                    objects.append(obj)
+                progress.setValue(runner.finishedCount())
+            document.recompute()
+            layoutOnGrid(objects)
+        except Exception:
+            # Do not leave a half-built batch as an undo step.
+            document.abortTransaction()
+            raise
+        else:
+            document.commitTransaction()
+        finally:
+            runner.shutdown()
+            progress.close()
+        return objects
+
+    @CommandProfiler.profiledMethod
     def acceptCreationMode(self):
         """User clicked OK."""
         # If there is no active document, show a warning message and do nothing.
@@ -220,10 +363,23 @@ class BaseDialog(QtGui.QDialog):
             super(BaseDialog, self).accept()
             return
 
-        # Get suitable row from the the table.
-        partName = self.getSelectedPartName()
+        # Get suitable rows from the the table.
+        partNames = self.getSelectedPartNames()
 
-        if partName is not None:
+        if len(partNames) > 1:
+            outputType = self.getOutputType()
+            if outputType == Piping.OUTPUT_TYPE_SOLID and self.params.catalogName is not None:
+                objects = self.createNewSolidsInBackground(
+                    self.params.document, self.params.table, partNames)
+            else:
+                objects = self.createNewParts(
+                    self.params.document, self.params.table, partNames, outputType)
+            if len(objects) > 0:
+                self.saveInput()
+                self.saveWindowGeometry()
+                super(BaseDialog, self).accept()
+        elif len(partNames) == 1:
+            partName = partNames[0]
             outputType = self.getOutputType()
             part = self.createNewPart(
                 self.params.document, self.params.table, partName, outputType)
@@ -251,6 +407,12 @@ class BaseDialog(QtGui.QDialog):
         else:
             super(BaseDialog, self).accept()
 
+    def done(self, result):
+        # The dialog is kept for the next invocation, but the preview worker is not needed until then.
+        if self.preview is not None:
+            self.preview.shutdown()
+        super(BaseDialog, self).done(result)
+
     def accept(self):
         if self.params.selectionMode:
             return self.acceptSelectionMode()
@@ -326,6 +488,7 @@ class BaseDialog(QtGui.QDialog):
         """
         # If required select
         self.params.selectionMode = True
+        self.tableViewParts.setSelectionMode(QtGui.QAbstractItemView.SingleSelection)
         self.setWindowTitle(QtGui.QApplication.translate("Dialog", self.params.selectionDialogTitle,
                                                          None, UnicodeUTF8()))
         self.selectedPart = None
@@ -336,17 +499,17 @@ class BaseDialog(QtGui.QDialog):
 
     def showForCreation(self):
         self.params.selectionMode = False
+        self.tableViewParts.setSelectionMode(QtGui.QAbstractItemView.ExtendedSelection)
         self.setWindowTitle(QtGui.QApplication.translate("Dialog", self.params.dialogTitle,
                                                          None, UnicodeUTF8()))
         self.exec_()
 
-    @staticmethod
-    def moveFlamingoPartToSelection(document, part):
+    def moveFlamingoPartToSelection(self, document, part):
+        if self.batchMode:
+            # Parts created at once are placed on a grid instead.
+            return
         # Place the part with Dodo. If Dodo not found, use Flamingo instead.
-        try:
-            import pCmd as dfCmd
-        except ModuleNotFoundError:
-            import pipeCmd as dfCmd
+        dfCmd = Backend.getCommandsModule()
 
         # Check if something is selected:
         if (len(FreeCADGui.Selection.getSelectionEx()) > 0
@@ -404,8 +567,53 @@ class BaseDialog(QtGui.QDialog):
                 "No flamngo parts selected. Insert to the standard position,\n")
 
 
+# Gap between parts placed on a grid in mm.
+GRID_GAP = 50.0
+
+
+def getLayoutMembers(obj):
+    """Return pair (reference object, objects to move together) of a created part.
+
+    Elbows created as parts are groups. The reference is the resulting cut, which is the last
+    object of the group. All objects of the group are moved, otherwise the cut loses its tools.
+    """
+    if not hasattr(obj, "Shape") and hasattr(obj, "Group") and len(obj.Group) > 0:
+        return (obj.Group[-1], [o for o in obj.Group if hasattr(o, "Placement")])
+    return (obj, [obj])
+
+
+def layoutOnGrid(objects, gap=GRID_GAP):
+    """Place objects on a square grid in the x-y plane.
+
+    The grid cell size is determined by the largest object. Call document.recompute()
+    before, such that the shapes of the objects are valid, and after, such that groups
+    get the shapes at their new places.
+    """
+    parts = [getLayoutMembers(o) for o in objects]
+    parts = [(ref, members) for ref, members in parts if hasattr(ref, "Shape") and hasattr(ref, "Placement")]
+    if len(parts) == 0:
+        return
+    columns = int(math.ceil(math.sqrt(len(parts))))
+    size = max(max(ref.Shape.BoundBox.XLength, ref.Shape.BoundBox.YLength) for ref, _ in parts)
+    step = size + gap
+    for i, (ref, members) in enumerate(parts):
+        row, column = divmod(i, columns)
+        placement = FreeCAD.Placement(FreeCAD.Vector(column * step, row * step, 0), ref.Placement.Rotation)
+        transformation = placement.multiply(ref.Placement.inverse())
+        for member in members:
+            member.Placement = transformation.multiply(member.Placement)
+
+
+# Tables loaded by GuiCheckTable. Map table path to pairs (modification time, table).
+_loadedTables = {}
+
+
 # Before working with macros, try to load the dimension table.
 def GuiCheckTable(tablePath, dimensionsUsed):
+    """Load the table, show an error message if it is invalid.
+
+    The table is loaded again only if the file has been modified since the last call.
+    """
     # Check if the CSV file exists.
     if os.path.isfile(tablePath) is False:
         text = "This tablePath requires %s  but this file does not exist." % (
@@ -415,6 +623,13 @@ def GuiCheckTable(tablePath, dimensionsUsed):
         msgBox.exec_()
         exit(1)  # Error
 
+    mtime = os.path.getmtime(tablePath)
+    loaded = _loadedTables.get(tablePath)
+    hit = loaded is not None and loaded[0] == mtime and loaded[1].mandatoryDims == dimensionsUsed
+    Metrics.countLookup(Metrics.TABLE_CACHE, hit)
+    if hit:
+        return loaded[1]
+
     # FreeCAD.Console.PrintMessage("Trying to load CSV file with dimensions: %s\n"%tablePath)
     table = Piping.CsvTable(dimensionsUsed)
     table.load(tablePath)
@@ -428,6 +643,7 @@ def GuiCheckTable(tablePath, dimensionsUsed):
         msgBox.exec_()
         exit(1)  # Error
 
+    _loadedTables[tablePath] = (mtime, table)
     return table
 
 
@@ -7,6 +7,9 @@ import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -17,21 +20,22 @@ CSV_TABLE_PATH = os.path.join(OsePipingBase.TABLE_PATH, "cross.csv")
 DIMENSIONS_USED = ["POD", "POD1", "PThk", "PThk1", "G", "G1", "H", "H1", "M", "M1"]
 
 
-class Dimensions:
-    def __init__(self):
-        # Fill data with test values
-        self.G = parseQuantity("3 cm")
-        self.G1 = parseQuantity("3 cm")
-        self.H = parseQuantity("4 cm")  # It is L/2 for symmetrical cross. Why extra dimension in documentation?
-        self.H1 = parseQuantity("5 cm")
-        self.L = self.H * 2
-        self.L1 = self.H1 * 2
-        self.M = parseQuantity("5 cm")
-        self.M1 = parseQuantity("4 cm")
-        self.POD = parseQuantity("3 cm")
-        self.POD1 = parseQuantity("2 cm")
-        self.PThk = parseQuantity("0.5 cm")
-        self.PThk1 = parseQuantity("0.5 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("G", "G1", "H", "H1", "L", "L1", "M", "M1", "POD", "POD1", "PThk", "PThk1")
+    DEFAULTS = {
+        "G": "3 cm",
+        "G1": "3 cm",
+        "H": "4 cm",  # It is L/2 for symmetrical cross. Why extra dimension in documentation?
+        "H1": "5 cm",
+        "L": "8 cm",  # H * 2
+        "L1": "10 cm",  # H1 * 2
+        "M": "5 cm",
+        "M1": "4 cm",
+        "POD": "3 cm",
+        "POD1": "2 cm",
+        "PThk": "0.5 cm",
+        "PThk1": "0.5 cm",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -59,34 +63,28 @@ class Dimensions:
     def PID1(self):
         return self.POD1 - self.PThk1 * 2
 
+    def socketDepths(self):
+        return DimensionKernel.crossSocketDepths(self.G, self.G1, self.H, self.H1, self.L, self.L1)
+
     def socketDepthRight(self):
-        return (self.H - self.G)
+        return self.socketDepths()["right"]
 
     def socketDepthLeft(self):
-        return (self.L - self.H - self.G)
+        return self.socketDepths()["left"]
 
     def socketDepthBottom(self):
-        return (self.H1 - self.G1)
+        return self.socketDepths()["bottom"]
 
     def socketDepthTop(self):
-        return (self.L1 - self.H1 - self.G1)
+        return self.socketDepths()["top"]
 
     def calculateAuxiliararyPoints(self):
         """Calculate auxiliarary points which are used to build a cross from cylinders.
 
         See documentation picture cross-cacluations.png
         """
-        result = {}
-        result["p1"] = FreeCAD.Vector(-self.H, 0, 0)
-        result["p2"] = FreeCAD.Vector(-self.G, 0, 0)
-        result["p3"] = FreeCAD.Vector(self.G, 0, 0)  # This is an assumption, because the drawing of
-        # of Aetnoplastics does not contain this value
-        result["p4"] = FreeCAD.Vector(0, 0, -self.H1)
-        result["p5"] = FreeCAD.Vector(0, 0, -self.G1)
-        result["p6"] = FreeCAD.Vector(0, 0, self.G1)  # This is an assumption, because not
-        # of Aetnoplastics does not contain this value
-
-        return result
+        # p3 and p6 are assumptions, because the drawing of Aetnoplastics does not contain them.
+        return Piping.toVectors(DimensionKernel.crossAuxiliaryPoints(self.G, self.G1, self.H, self.H1))
 
 
 class Cross:
@@ -99,6 +97,7 @@ class Cross:
         if not valid:
             raise Piping.UnplausibleDimensions(msg)
 
+    @Trace.traced("outer part")
     def createOuterPart(self):
         aux = self.dims.calculateAuxiliararyPoints()
 
@@ -120,6 +119,7 @@ class Cross:
         outer_fusion.Shapes = [horizontal_outer_cylinder, vertical_outer_cylinder]
         return outer_fusion
 
+    @Trace.traced("inner part")
     def createInnerPart(self):
         aux = self.dims.calculateAuxiliararyPoints()
         PID = self.dims.PID()
@@ -173,12 +173,14 @@ class Cross:
         cross.Base = outer
         cross.Tool = inner
 
+        Metrics.countDocumentObjects(Piping.nestedObjects(cross))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, cross, "cross (solid)")
             Piping.removePartWithChildren(self.document, cross)
@@ -210,11 +212,10 @@ class CrossFromTable:
         else:
             return parseQuantity(row["PThk1"])
 
-    def create(self, partNumber, outputType):
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.G = parseQuantity(row["G"])
         dims.G1 = parseQuantity(row["G1"])
@@ -226,8 +227,18 @@ class CrossFromTable:
         dims.M1 = parseQuantity(row["M1"])
         dims.POD = parseQuantity(row["POD"])
         dims.POD1 = parseQuantity(row["POD1"])
-        dims.PThk = CrossFromTable.getPThk(row)
-        dims.PThk1 = CrossFromTable.getPThk1(row)
+        dims.PThk = cls.getPThk(row)
+        dims.PThk1 = cls.getPThk1(row)
+        return dims
+
+    @Trace.traced("CrossFromTable.create")
+    def create(self, partNumber, outputType):
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             cross = Cross(self.document)
@@ -244,7 +255,8 @@ class CrossFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = row["PSize"]  # What to do for multiple sizes?
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             # feature.Label = partName # Part name must be unique, that is qhy use partNumber instead.
             feature.PartNumber = partNumber
             return part
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Dimension calculations of the fittings with plain floats. Lengths are in mm and
+# angles are in degrees. The module does not need FreeCAD.
+#
+# If NumPy is installed, every function accepts also NumPy arrays and then computes
+# the values for all rows of a catalog at once, for example
+#
+#   cols = DimensionKernel.loadColumns("tables/coupling.csv", ["L", "N", "M", "M1", "POD", "POD1"])
+#   points = DimensionKernel.couplingAuxiliaryPoints(**cols)
+#
+# Points are returned as (x, y, z) tuples. The Dimensions classes of the fitting
+# modules use these functions and convert the results to FreeCAD quantities and vectors.
+
+import csv
+import math
+import re
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    _sqrt = numpy.sqrt
+    _sin = numpy.sin
+    _cos = numpy.cos
+    _tan = numpy.tan
+    _maximum = numpy.maximum
+else:
+    _sqrt = math.sqrt
+    _sin = math.sin
+    _cos = math.cos
+    _tan = math.tan
+    _maximum = max
+
+# Factors to convert table units to mm and degrees.
+UNIT_FACTORS = {
+    "mm": 1.0,
+    "cm": 10.0,
+    "m": 1000.0,
+    "in": 25.4,
+    "\"": 25.4,
+    "ft": 304.8,
+    "deg": 1.0,
+    "°": 1.0,
+    "rad": 180.0 / math.pi,
+}
+
+_VALUE_RE = re.compile(r"^\s*([0-9.+/\s]+?)\s*(mm|cm|m|in|\"|ft|deg|°|rad)?\s*$")
+
+
+def parseValue(text):
+    """Convert a table value like "1+1/8 in", "31/32 in" or "90 deg" to mm or degrees.
+
+    Values without a unit are returned unchanged as numbers. Raise ValueError if the
+    text is not a value.
+    """
+    match = _VALUE_RE.match(text)
+    if match is None:
+        raise ValueError("Can not parse value {}.".format(text))
+    number = 0.0
+    for term in match.group(1).split("+"):
+        if "/" in term:
+            numerator, denominator = term.split("/")
+            number += float(numerator) / float(denominator)
+        else:
+            number += float(term)
+    unit = match.group(2)
+    if unit is None:
+        return number
+    return number * UNIT_FACTORS[unit]
+
+
+def loadColumns(filename, names, keyColumnName="PartNumber"):
+    """Read columns of a dimension table. Return dictionary from column name to NumPy array.
+
+    The key column is returned as a list of strings.
+    """
+    if numpy is None:
+        raise ImportError("Loading of whole columns needs NumPy.")
+    with open(filename, "r") as csvfile:
+        csv_reader = csv.reader(csvfile, delimiter=',', quotechar='"')
+        headers = next(csv_reader)
+        rows = list(csv_reader)
+    res = {keyColumnName: [row[headers.index(keyColumnName)] for row in rows]}
+    for name in names:
+        index = headers.index(name)
+        res[name] = numpy.array([parseValue(row[index]) for row in rows], dtype=float)
+    return res
+
+
+def _zero(value):
+    """Return 0 with the shape of the value."""
+    return value * 0.0
+
+
+def _rotateBisectrix(length, angle):
+    """Rotate vector with the length along the bisectrix of x and y axes by angle (deg) around z."""
+    s = length / math.sqrt(2)
+    a = angle * math.pi / 180
+    return (s * (_cos(a) - _sin(a)), s * (_sin(a) + _cos(a)), _zero(length))
+
+
+def pipeInnerDiameter(POD, PThk):
+    return POD - 2 * PThk
+
+
+def shiftA1(M, M1, POD, POD1, N):
+    """Determine an additional length a1 of the socket 1 of a coupling or tee.
+
+    See Coupling.Dimensions.shiftA1 for the explanation. For tees N is G + G1.
+    """
+    a2 = _maximum(M - POD, M1 - POD1) / 2
+    x = POD - POD1
+    factor = x / _sqrt(4 * N**2 + x**2)
+    return factor * a2
+
+
+def socketDepthA5(L, N):
+    """Return the socket depth of a coupling."""
+    return (L - N) / 2.0
+
+
+def couplingAuxiliaryPoints(L, N, M, M1, POD, POD1):
+    """Calculate auxiliarary points of a coupling. See documentation picture coupling-cacluations.png."""
+    a5 = socketDepthA5(L, N)
+    a1 = shiftA1(M, M1, POD, POD1, N)
+    zero = _zero(L)
+    return {"p1": (zero, zero, zero),
+            "p2": (zero, zero, a5),
+            "p3": (zero, zero, L - a5),
+            "p4": (zero, zero, a5 + a1),
+            "p5": (zero, zero, L - a5 + a1)}
+
+
+def teeAuxiliaryPoints(G, G1, G2, H, M, M1, POD, POD1):
+    """Calculate auxiliarary points of a tee. See documentation picture coupling-cacluations.png."""
+    a1 = shiftA1(M, M1, POD, POD1, G + G1)
+    zero = _zero(G)
+    return {"p1": (-H, zero, zero),
+            "p2": (-G, zero, zero),
+            "p3": (G1, zero, zero),
+            "p4": (zero, zero, G2),
+            "p5": (-G + a1, zero, zero),
+            "p6": (G1 + a1, zero, zero)}
+
+
+def thingThicknessA1(L, N):
+    """Return thickness of the hexagonal or octoganal thing of a bushing."""
+    return (L - N) / 2.0
+
+
+def thingLengthA2(POD):
+    """Return distance between paralal sides of the thing of a bushing."""
+    return POD * 1.1
+
+
+def coneLengthA4(N):
+    """Return length of the cone of a bushing."""
+    return N / 2.0
+
+
+def bushingAuxiliaryPoints(L, N):
+    """Calculate auxiliarary points of a bushing. See documentation picture bushing-cacluations.png."""
+    zero = _zero(L)
+    return {"p1": (zero, zero, zero),
+            "p2": (zero, zero, coneLengthA4(N)),
+            "p3": (zero, zero, N),
+            "p4": (zero, zero, L - thingThicknessA1(L, N))}
+
+
+def elbowAuxiliaryPoints(BendAngle, H, J, M):
+    """Calculate auxiliarary points of an elbow. See documentation picture elbow-cacluations.png."""
+    beta = 180 - BendAngle
+    beta_rad = beta * math.pi / 180
+    # p3 lies on the bissectrix. And has the length M/2/sin(beta/2).
+    d = M / 2.0 / _sin(beta_rad / 2.0) / math.sqrt(2)
+    length = M / 2.0 / _tan(beta_rad / 2.0)
+    return {"p1": _rotateBisectrix(H, -beta / 2),
+            "p2": _rotateBisectrix(length, -beta / 2),
+            "p3": (d, d, _zero(d)),
+            "p4": _rotateBisectrix(length, beta / 2),
+            "p5": _rotateBisectrix(J, -beta / 2),
+            "p6": _rotateBisectrix(J, beta / 2)}
+
+
+def sweepElbowAuxiliaryLengths(H, J, M, POD):
+    a1 = H - J
+    a2 = H - J + (M - POD) / 2.0
+    return {"a1": a1, "a2": a2}
+
+
+def sweepElbowAuxiliaryPoints(BendAngle, H, J, M, POD):
+    """Calculate auxiliarary points of a sweep elbow. See documentation picture sweep-elbow-cacluations.png."""
+    beta = 180 - BendAngle
+    beta_rad = beta * math.pi / 180
+    # p3 lies on the bissectrix.
+    d = J / _cos(beta_rad / 2.0) / math.sqrt(2)
+    length = H - sweepElbowAuxiliaryLengths(H, J, M, POD)["a2"]
+    return {"p1": _rotateBisectrix(H, -beta / 2),
+            "p2": _rotateBisectrix(length, -beta / 2),
+            "p3": (d, d, _zero(d)),
+            "p4": _rotateBisectrix(length, beta / 2),
+            "p5": _rotateBisectrix(J, -beta / 2),
+            "p6": _rotateBisectrix(J, beta / 2)}
+
+
+def cornerAuxiliaryPoints(G):
+    """Calculate auxiliarary points of a corner. See documentation picture corner-cacluations.png."""
+    zero = _zero(G)
+    return {"p1": (G, zero, zero),
+            "p2": (zero, G, zero),
+            "p3": (zero, zero, G)}
+
+
+def crossSocketDepths(G, G1, H, H1, L, L1):
+    """Return dictionary with depths of the right, left, bottom and top sockets of a cross."""
+    return {"right": H - G,
+            "left": L - H - G,
+            "bottom": H1 - G1,
+            "top": L1 - H1 - G1}
+
+
+def crossAuxiliaryPoints(G, G1, H, H1):
+    """Calculate auxiliarary points of a cross. See documentation picture cross-cacluations.png."""
+    zero = _zero(G)
+    return {"p1": (-H, zero, zero),
+            "p2": (-G, zero, zero),
+            "p3": (G, zero, zero),
+            "p4": (zero, zero, -H1),
+            "p5": (zero, zero, -G1),
+            "p6": (zero, zero, G1)}
@@ -3,11 +3,13 @@
 # Date: 16 December 2017
 # Create a elbow-fitting.
 
-import math
 import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -25,15 +27,16 @@ DIMENSIONS_USED = ["BendAngle", "POD", "PThk", "H", "J", "M"]
 RELATIVE_EPSILON = 0.000001
 
 
-class Dimensions:
-    def __init__(self):
-        # Init class with test values
-        self.BendAngle = parseQuantity("60 deg")
-        self.H = parseQuantity("3 cm")
-        self.J = parseQuantity("2 cm")
-        self.M = parseQuantity("3 cm")
-        self.POD = parseQuantity("2 cm")
-        self.PThk = parseQuantity("0.5 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("BendAngle", "H", "J", "M", "POD", "PThk")
+    DEFAULTS = {
+        "BendAngle": "60 deg",
+        "H": "3 cm",
+        "J": "2 cm",
+        "M": "3 cm",
+        "POD": "2 cm",
+        "PThk": "0.5 cm",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -60,33 +63,7 @@ class Dimensions:
 
         See documentation picture elbow-cacluations.png.
         """
-        beta = 180 - float(self.BendAngle.getValueAs("deg"))
-        beta_rad = math.pi - float(self.BendAngle.getValueAs("rad"))
-        J = self.J
-        H = self.H
-        M = self.M
-
-        # Start with a normalized vector along th bisectrix of the x and y-axis.
-        # Then stretch and rotate this vector by -beta/2 and +beta/2 along the z axis.
-        bs = FreeCAD.Vector(1, 1, 0).normalize()
-        neg_rot = FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), -beta / 2)
-
-        p1 = neg_rot.multVec(bs * float(H))
-        p5 = neg_rot.multVec(bs * float(J))
-
-        pos_rot = FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), +beta / 2)
-        p6 = pos_rot.multVec(bs * float(J))
-
-        # p3 lies on the bissectrix. And has the length M/2/sin(alpha/2)
-        p3 = bs * float(M / 2.0 / math.sin(beta_rad / 2.0))
-        # Calculate coordinates of the base cirle at the end of sweep.
-        # It will be necessary to create a solid body base+walls+cap
-        # Convert angle to radias, in order to use it with trigonometric python functions.
-        l = float(M / 2.0 / math.tan(beta_rad / 2.0))
-        p2 = neg_rot.multVec(bs * l)
-        p4 = pos_rot.multVec(bs * l)
-
-        return {"p1": p1, "p2": p2, "p3": p3, "p4": p4, "p5": p5, "p6": p6}
+        return Piping.toVectors(DimensionKernel.elbowAuxiliaryPoints(self.BendAngle, self.H, self.J, self.M))
 
 
 class Elbow:
@@ -112,7 +89,7 @@ class Elbow:
         p2 = aux["p2"]
         p3 = aux["p3"]
 
-        alpha = float(self.dims.BendAngle.getValueAs("deg"))
+        alpha = self.dims.BendAngle
         rBend = self.dims.M / 2.0
 
         # Calculate coordinates of the base circle.
@@ -137,6 +114,7 @@ class Elbow:
         group.addObjects([trajectory, base, sweep])
         return sweep
 
+    @Trace.traced("outer part")
     def createOuterPart(self, group):
         aux = self.dims.calculateAuxiliararyPoints()
         p2 = aux["p2"]
@@ -165,6 +143,7 @@ class Elbow:
         group.addObject(outer)
         return outer
 
+    @Trace.traced("inner part")
     def createInnerPart(self, group):
         aux = self.dims.calculateAuxiliararyPoints()
         pid = self.dims.POD - self.dims.PThk * 2
@@ -216,12 +195,14 @@ class Elbow:
         elbow.Base = outer
         elbow.Tool = inner
         group.addObject(elbow)
+        Metrics.countDocumentObjects(Piping.nestedObjects(group))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, elbow, "elbow (solid)")
             Piping.removePartWithChildren(self.document, group)
@@ -251,19 +232,28 @@ class ElbowFromTable:
         else:
             return ""
 
-    def create(self, partNumber, outputType):
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
-
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.BendAngle = parseQuantity(row["BendAngle"])
         dims.H = parseQuantity(row["H"])
         dims.J = parseQuantity(row["J"])
         dims.M = parseQuantity(row["M"])
         dims.POD = parseQuantity(row["POD"])
-        dims.PThk = self.getPThk(row)
+        dims.PThk = cls.getPThk(row)
+        return dims
+
+    @Trace.traced("ElbowFromTable.create")
+    def create(self, partNumber, outputType):
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             elbow = Elbow(self.document)
@@ -281,7 +271,8 @@ class ElbowFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = self.getPSize(row)
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             feature.PartNumber = partNumber
             return part
 
@@ -24,6 +24,7 @@ All other dimensions are used for inromation only.
 </p></body></html>"""
         params.settingsName = "elbow user input"
         params.keyColumnName = "PartNumber"
+        params.catalogName = "elbow"
         super(MainDialog, self).__init__(params)
 
     def createNewPart(self, document, table, partName, outputType):
@@ -4,18 +4,18 @@
 # Create a bushing using Flamingo workbench.
 
 import FreeCAD
-import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Bushing as BushingMod
 
 
-class Bushing(pypeType):
-    def __init__(self, obj, PSize="", dims=BushingMod.Dimensions()):
+class Bushing(Backend.PypeType):
+    def __init__(self, obj, PSize="", dims=None):
         """Create a bushing."""
+        if dims is None:
+            dims = BushingMod.Dimensions()
         # Run parent __init__ and define common attributes
         super(Bushing, self).__init__(obj)
         obj.PType = "OSE_Bushing"
@@ -40,6 +40,7 @@ class Bushing(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # Attributes changed, adjust the rest.
@@ -74,28 +75,30 @@ class Bushing(pypeType):
         X2 = dims.ThingLengthA2()
         # Move the box into the center of the X,Y plane.
         center_pos = FreeCAD.Vector(-X2 / 2, -X2 / 2, 0) + aux["p4"]
-        box1 = Part.makeBox(X2, X2, X1, center_pos)
+        box1 = Metrics.makeBox(X2, X2, X1, center_pos)
         # rotate a box by 45° around the z.axis.
-        box2 = Part.makeBox(X2, X2, X1, center_pos)
+        box2 = Metrics.makeBox(X2, X2, X1, center_pos)
         box2.rotate(FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1), 45)
-        return box1.common(box2)
+        return Metrics.common(box1, box2)
 
     @classmethod
+    @Trace.traced("outer part")
     def createOuterPart(cls, obj):
         dims = cls.extractDimensions(obj)
         aux = dims.auxiliararyPoints()
-        outer_cylinder = Part.makeCylinder(dims.POD / 2, dims.L, aux["p1"])
+        outer_cylinder = Metrics.makeCylinder(dims.POD / 2, dims.L, aux["p1"])
         thing = Bushing.createOctaThing(obj)
-        return outer_cylinder.fuse(thing)
+        return Metrics.fuse(outer_cylinder, thing)
 
     @classmethod
+    @Trace.traced("inner part")
     def createInnerPart(cls, obj):
         dims = cls.extractDimensions(obj)
         aux = dims.auxiliararyPoints()
 
         # Remove inner part of the sockets.
-        inner_cylinder = Part.makeCylinder(dims.PID1() / 2, dims.L, aux["p1"])
-        inner_socket = Part.makeCylinder(
+        inner_cylinder = Metrics.makeCylinder(dims.PID1() / 2, dims.L, aux["p1"])
+        inner_socket = Metrics.makeCylinder(
             dims.POD1 / 2, dims.L - dims.N, aux["p3"])
 
         # Make a cone for a larger socket. There are no dimensions for this con. Therefore
@@ -104,26 +107,29 @@ class Bushing(pypeType):
         r1 = dims.POD / 2 - dims.ThicknessA3()
         r2 = dims.PID1() / 2
         hcone = dims.ConeLengthA4()
-        socket_cone = Part.makeCone(r1, r2, hcone, aux["p1"])
+        socket_cone = Metrics.makeCone(r1, r2, hcone, aux["p1"])
 
-        return inner_cylinder.fuse([inner_socket, socket_cone])
+        return Metrics.fuse(inner_cylinder, [inner_socket, socket_cone])
 
     @classmethod
     def createShape(cls, obj):
         outer = cls.createOuterPart(obj)
         inner = cls.createInnerPart(obj)
-        return outer.cut(inner)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
 
+    @Trace.traced("Bushing.execute")
     def execute(self, obj):
         # Create the shape of the bushing.
-        shape = self.createShape(obj)
+        shape = LevelOfDetail.createShape(Bushing, obj)
         obj.Shape = shape
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
+    @classmethod
+    def getPorts(cls, obj):
         """Calculate coordinates of the ports."""
-        dims = self.extractDimensions(obj)
+        dims = cls.extractDimensions(obj)
         aux = dims.auxiliararyPoints()
         # For the bottom port use p3 too. Because there is no a1 dimension in my specification.
         return[aux["p3"], aux["p3"]]
@@ -157,7 +163,8 @@ class BushingBuilder:
         feature = self.document.addObject("Part::FeaturePython","OSE-Bushing")
         """
         bushing = Bushing(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
 
         return bushing
@@ -4,18 +4,18 @@
 # Create an outer corner using Flamingo workbench.
 
 import FreeCAD
-import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Corner as CornerMod
 
 
-class Corner(pypeType):
-    def __init__(self, obj, PSize="", dims=CornerMod.Dimensions()):
+class Corner(Backend.PypeType):
+    def __init__(self, obj, PSize="", dims=None):
         """Create an outer corner with the center at (0,0,0) and elbows along x, y and z axis.		"""
+        if dims is None:
+            dims = CornerMod.Dimensions()
         # Run parent __init__ and define common attributes
         super(Corner, self).__init__(obj)
         obj.PType = "OSE_Corner"
@@ -41,6 +41,7 @@ class Corner(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -70,21 +71,23 @@ class Corner(pypeType):
     @classmethod
     def createPrimitiveCorner(cls, L, D):
         """Create corner consisting of two cylinder along x-,y- and y axis and a ball in the center."""
-        x_cylinder = Part.makeCylinder(
+        x_cylinder = Metrics.makeCylinder(
             D / 2, L, FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(1, 0, 0))
-        y_cylinder = Part.makeCylinder(
+        y_cylinder = Metrics.makeCylinder(
             D / 2, L, FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 1, 0))
-        z_cylinder = Part.makeCylinder(
+        z_cylinder = Metrics.makeCylinder(
             D / 2, L, FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1))
-        sphere = Part.makeSphere(D / 2)
-        return sphere.fuse([x_cylinder, y_cylinder, z_cylinder])
+        sphere = Metrics.makeSphere(D / 2)
+        return Metrics.fuse(sphere, [x_cylinder, y_cylinder, z_cylinder])
 
     @classmethod
+    @Trace.traced("outer part")
     def createOuterPart(cls, obj):
         dims = cls.extractDimensions(obj)
         return cls.createPrimitiveCorner(dims.H, dims.M)
 
     @classmethod
+    @Trace.traced("inner part")
     def createInnerPart(cls, obj):
         dims = cls.extractDimensions(obj)
         inner = cls.createPrimitiveCorner(dims.H, dims.PID())
@@ -94,30 +97,33 @@ class Corner(pypeType):
     @classmethod
     def addSockets(cls, D, H, G, shape):
         """Add socket cylinders with diamater D to the ends of the corner shape."""
-        x_socket = Part.makeCylinder(
+        x_socket = Metrics.makeCylinder(
             D / 2, H - G, FreeCAD.Vector(G, 0, 0), FreeCAD.Vector(1, 0, 0))
-        y_socket = Part.makeCylinder(
+        y_socket = Metrics.makeCylinder(
             D / 2, H - G, FreeCAD.Vector(0, G, 0), FreeCAD.Vector(0, 1, 0))
-        z_socket = Part.makeCylinder(
+        z_socket = Metrics.makeCylinder(
             D / 2, H - G, FreeCAD.Vector(0, 0, G), FreeCAD.Vector(0, 0, 1))
-        return shape.fuse([x_socket, y_socket, z_socket])
+        return Metrics.fuse(shape, [x_socket, y_socket, z_socket])
 
     @classmethod
     def createShape(cls, obj):
         outer = cls.createOuterPart(obj)
         inner = cls.createInnerPart(obj)
-        return outer.cut(inner)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
 
+    @Trace.traced("Corner.execute")
     def execute(self, obj):
         # Create the shape of the tee.
-        shape = Corner.createShape(obj)
+        shape = LevelOfDetail.createShape(Corner, obj)
         obj.Shape = shape
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
+    @classmethod
+    def getPorts(cls, obj):
         """Calculate coordinates of the ports."""
-        dims = self.extractDimensions(obj)
+        dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         return [aux["p1"], aux["p2"], aux["p3"]]  # x, y, z.
 
@@ -150,7 +156,8 @@ class CornerBuilder:
         feature = self.document.addObject("Part::FeaturePython","OSE-Corner")
         """
         corner = Corner(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
 
         return corner
@@ -4,18 +4,18 @@
 # Create a coupling using Flamingo workbench.
 
 import FreeCAD
-import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Coupling as CouplingMod
 
 
-class Coupling(pypeType):
-    def __init__(self, obj, PSize="", dims=CouplingMod.Dimensions()):
+class Coupling(Backend.PypeType):
+    def __init__(self, obj, PSize="", dims=None):
         """Create a coupling."""
+        if dims is None:
+            dims = CouplingMod.Dimensions()
         # Run parent __init__ and define common attributes
         super(Coupling, self).__init__(obj)
         obj.PType = "OSE_Coupling"
@@ -48,6 +48,7 @@ class Coupling(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -79,6 +80,7 @@ class Coupling(pypeType):
         return dims
 
     @classmethod
+    @Trace.traced("outer part")
     def createOuterPart(cls, obj):
         dims = cls.extractDimensions(obj)
 
@@ -95,7 +97,7 @@ class Coupling(pypeType):
         # Create complete outer cylinder.
         radius = dims.M / 2.0
         height = dims.L
-        outer = Part.makeCylinder(radius, height, aux["p1"])
+        outer = Metrics.makeCylinder(radius, height, aux["p1"])
         return outer
 
     @classmethod
@@ -106,18 +108,19 @@ class Coupling(pypeType):
         # Create socket 1.
         r1 = dims.M / 2.0
         h1 = dims.bottomSocketOuterLength()
-        cylinder1 = Part.makeCylinder(r1, h1, aux["p1"])
+        cylinder1 = Metrics.makeCylinder(r1, h1, aux["p1"])
         # Create a cone and put it on the cylinder 1.
         r2 = dims.M1 / 2.0
         hc = dims.N
-        cone = Part.makeCone(r1, r2, hc, aux["p4"])
+        cone = Metrics.makeCone(r1, r2, hc, aux["p4"])
         # Create a socket 2 and put it on the cone.
         h2 = dims.topSocketOuterLength()
-        cylinder2 = Part.makeCylinder(r2, h2, aux["p5"])
-        outer = cylinder1.fuse([cone, cylinder2])
+        cylinder2 = Metrics.makeCylinder(r2, h2, aux["p5"])
+        outer = Metrics.fuse(cylinder1, [cone, cylinder2])
         return outer
 
     @classmethod
+    @Trace.traced("inner part")
     def createInnerPart(cls, obj):
         dims = cls.extractDimensions(obj)
         # Create parts which must be removed from the coupling.
@@ -133,13 +136,13 @@ class Coupling(pypeType):
         aux = dims.calculateAuxiliararyPoints()
         # Create lower inner cylinder.
         height1 = dims.socketDepthA5()
-        cylinder1i = Part.makeCylinder(dims.POD / 2.0, height1)
+        cylinder1i = Metrics.makeCylinder(dims.POD / 2.0, height1)
         # Create intermediatiate inner cylinder (from beginning to the end of the complete socket).
         height2 = dims.L
-        cylinder2i = Part.makeCylinder(dims.PID() / 2.0, height2, aux["p1"])
+        cylinder2i = Metrics.makeCylinder(dims.PID() / 2.0, height2, aux["p1"])
         # Create an upper inner cylinder.
-        cylinder3i = Part.makeCylinder(dims.POD / 2.0, height1, aux["p3"])
-        inner = cylinder1i.fuse([cylinder2i, cylinder3i])
+        cylinder3i = Metrics.makeCylinder(dims.POD / 2.0, height1, aux["p3"])
+        inner = Metrics.fuse(cylinder1i, [cylinder2i, cylinder3i])
         return inner
 
     @classmethod
@@ -150,31 +153,38 @@ class Coupling(pypeType):
         # Create a lower cylinder.
         r = dims.POD / 2.0
         h = dims.socketDepthA5()
-        cylinder1i = Part.makeCylinder(r, h, aux["p1"])
+        cylinder1i = Metrics.makeCylinder(r, h, aux["p1"])
         # Create a cone and put it on the cylinder 1.
         r1 = dims.PID() / 2.0
         r2 = dims.PID1() / 2.0
         hc = dims.N
-        cone = Part.makeCone(r1, r2, hc, aux["p2"])
+        cone = Metrics.makeCone(r1, r2, hc, aux["p2"])
         # Create an upper cylinder.
         r = dims.POD1 / 2
         h = dims.socketDepthA5()
-        cylinder2i = Part.makeCylinder(r, h, aux["p3"])
-        inner = cylinder1i.fuse([cone, cylinder2i])
+        cylinder2i = Metrics.makeCylinder(r, h, aux["p3"])
+        inner = Metrics.fuse(cylinder1i, [cone, cylinder2i])
         return inner
 
+    @classmethod
+    def createShape(cls, obj):
+        inner = cls.createInnerPart(obj)
+        outer = cls.createOuterPart(obj)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
+
+    @Trace.traced("Coupling.execute")
     def execute(self, obj):
         # Create the shape of the coupling.
-        inner = Coupling.createInnerPart(obj)
-        outer = Coupling.createOuterPart(obj)
-        shape = outer.cut(inner)
+        shape = LevelOfDetail.createShape(Coupling, obj)
         obj.Shape = shape
         # define Ports, i.e. where the tube have to be placed
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
+    @classmethod
+    def getPorts(cls, obj):
         """Calculate coordinates of the ports."""
-        dims = self.extractDimensions(obj)
+        dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         return [aux["p2"], aux["p3"]]
 
@@ -207,7 +217,8 @@ class CouplingBuilder:
         feature = self.document.addObject("Part::FeaturePython","OSE-Coupling")
         """
         coupling = Coupling(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
 
         return coupling
@@ -5,17 +5,17 @@
 # Create a cross-fitting using Flamingo workbench.
 
 import FreeCAD
-import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Cross as CrossMod
 
 
-class Cross(pypeType):
-    def __init__(self, obj, PSize="90degBend20x10", dims=CrossMod.Dimensions()):
+class Cross(Backend.PypeType):
+    def __init__(self, obj, PSize="90degBend20x10", dims=None):
+        if dims is None:
+            dims = CrossMod.Dimensions()
         # run parent __init__ and define common attributes
         super(Cross, self).__init__(obj)
         obj.PType = "OSE_Cross"
@@ -56,6 +56,7 @@ class Cross(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -92,18 +93,20 @@ class Cross(pypeType):
         return dims
 
     @classmethod
+    @Trace.traced("outer part")
     def createOuterPart(cls, obj):
         dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         hr = dims.M / 2
-        hor_cylinder = Part.makeCylinder(
+        hor_cylinder = Metrics.makeCylinder(
             hr, dims.L, aux["p1"], FreeCAD.Vector(1, 0, 0))
         vr = dims.M1 / 2
-        vert_cylinder = Part.makeCylinder(vr, dims.L1, aux["p4"])
-        outer = hor_cylinder.fuse(vert_cylinder)
+        vert_cylinder = Metrics.makeCylinder(vr, dims.L1, aux["p4"])
+        outer = Metrics.fuse(hor_cylinder, vert_cylinder)
         return outer
 
     @classmethod
+    @Trace.traced("inner part")
     def createInnerPart(cls, obj):
         dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
@@ -116,41 +119,44 @@ class Cross(pypeType):
         pod = dims.POD
         pod1 = dims.POD1
         hr = pid / 2
-        hor_cylinder = Part.makeCylinder(
+        hor_cylinder = Metrics.makeCylinder(
             hr, dims.L, p1, FreeCAD.Vector(1, 0, 0))
         vr = pid1 / 2
-        vert_cylinder = Part.makeCylinder(vr, dims.L1, p4)
+        vert_cylinder = Metrics.makeCylinder(vr, dims.L1, p4)
 
         # Create sockets.
-        socket_left = Part.makeCylinder(
+        socket_left = Metrics.makeCylinder(
             pod / 2, dims.socketDepthLeft(), p1, FreeCAD.Vector(1, 0, 0))
-        socket_right = Part.makeCylinder(
+        socket_right = Metrics.makeCylinder(
             pod / 2, dims.socketDepthRight(), p3, FreeCAD.Vector(1, 0, 0))
-        socket_bottom = Part.makeCylinder(
+        socket_bottom = Metrics.makeCylinder(
             pod1 / 2, dims.socketDepthBottom(), p4)
-        socket_top = Part.makeCylinder(pod1 / 2, dims.socketDepthTop(), p6)
+        socket_top = Metrics.makeCylinder(pod1 / 2, dims.socketDepthTop(), p6)
 
         # Combine all cylinders.
-        inner = hor_cylinder.fuse([vert_cylinder, socket_left,
-                                   socket_right, socket_bottom, socket_top])
+        inner = Metrics.fuse(hor_cylinder, [vert_cylinder, socket_left,
+                                            socket_right, socket_bottom, socket_top])
         return inner
 
     @classmethod
     def createShape(cls, obj):
         outer = cls.createOuterPart(obj)
         inner = cls.createInnerPart(obj)
-        return outer.cut(inner)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
         # return outer
 
+    @Trace.traced("Cross.execute")
     def execute(self, obj):
         # Create the shape of the tee.
-        shape = self.createShape(obj)
+        shape = LevelOfDetail.createShape(Cross, obj)
         obj.Shape = shape
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
-        dims = Cross.extractDimensions(obj)
+    @classmethod
+    def getPorts(cls, obj):
+        dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         return [aux["p2"], aux["p3"], aux["p5"], aux["p6"]]
 
@@ -180,7 +186,8 @@ class CrossBuilder:
     def create(self, obj):
         """Create a cross."""
         cross = Cross(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
         # rot=FreeCAD.Rotation(FreeCAD.Vector(0,0,1), self.Z)
         # obj.Placement.Rotation=rot.multiply(obj.Placement.Rotation)
@@ -5,14 +5,12 @@
 
 import FreeCAD
 import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Elbow as ElbowMod
 
-
 # The value RELATIVE_EPSILON is used to slightly change the size of parts
 # to prevent problems with boolean operations.
 # Keep this value very small.
@@ -21,7 +19,7 @@ import OsePiping.Elbow as ElbowMod
 RELATIVE_EPSILON = 0.000001
 
 
-class Elbow(pypeType):
+class Elbow(Backend.PypeType):
     def __init__(self, obj, PSize="90degBend20x10", BendAngle=90, M=30, POD=20, PThk=10, H=30, J=20):
         # run parent __init__ and define common attributes
         super(Elbow, self).__init__(obj)
@@ -50,6 +48,7 @@ class Elbow(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -96,7 +95,7 @@ class Elbow(pypeType):
 
         aux = dims.calculateAuxiliararyPoints()
 
-        alpha = float(dims.BendAngle.getValueAs("deg"))
+        alpha = dims.BendAngle
         rBend = dims.M / 2.0
 
         # Put a base on the streight part.
@@ -139,7 +138,7 @@ class Elbow(pypeType):
 
         aux = dims.calculateAuxiliararyPoints()
 
-        alpha = float(dims.BendAngle.getValueAs("deg"))
+        alpha = dims.BendAngle
         rBend = dims.M / 2.0
 
         # Put a base on the streight part.
@@ -164,6 +163,7 @@ class Elbow(pypeType):
         return solid
 
     @staticmethod
+    @Trace.traced("outer part")
     def createOuterPart(obj):
         dims = Elbow.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
@@ -172,14 +172,15 @@ class Elbow(pypeType):
         bentPart = Elbow.createBentCylinder(obj, r * (1 + RELATIVE_EPSILON))
         # Create socket along the z axis.
         h = float(dims.H) - aux["p2"].Length
-        socket1 = Part.makeCylinder(r, h, aux["p2"], aux["p2"])
+        socket1 = Metrics.makeCylinder(r, h, aux["p2"], aux["p2"])
         # Create socket along the bent part.
-        socket2 = Part.makeCylinder(r, h, aux["p4"], aux["p4"])
+        socket2 = Metrics.makeCylinder(r, h, aux["p4"], aux["p4"])
 
-        outer = bentPart.fuse([socket1, socket2])
+        outer = Metrics.fuse(bentPart, [socket1, socket2])
         return outer
 
     @staticmethod
+    @Trace.traced("inner part")
     def createInnerPart(obj):
         dims = Elbow.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
@@ -190,52 +191,56 @@ class Elbow(pypeType):
         # Create a channel along the z axis. It is longer then necessaryself.
         # But it possible can prevent problems with boolean operations.
         h = float(dims.H)
-        chan1 = Part.makeCylinder(r, h, aux["p2"], aux["p2"])
+        chan1 = Metrics.makeCylinder(r, h, aux["p2"], aux["p2"])
         # Create a channel along the bent part.
-        chan2 = Part.makeCylinder(r, h, aux["p4"], aux["p4"])
+        chan2 = Metrics.makeCylinder(r, h, aux["p4"], aux["p4"])
         # Create corresponding socktes.
 
         rSocket = dims.POD / 2
         # The socket length is actually dims.H - dims.J. But we do it longer
         # to prevent problems with bulean operations
         hSocket = dims.H
-        socket1 = Part.makeCylinder(rSocket, hSocket, aux["p5"], aux["p5"])
-        socket2 = Part.makeCylinder(rSocket, hSocket, aux["p6"], aux["p6"])
+        socket1 = Metrics.makeCylinder(rSocket, hSocket, aux["p5"], aux["p5"])
+        socket2 = Metrics.makeCylinder(rSocket, hSocket, aux["p6"], aux["p6"])
 
-        inner = bentPart.fuse([chan1, chan2, socket1, socket2])
+        inner = Metrics.fuse(bentPart, [chan1, chan2, socket1, socket2])
         return inner
 
     @staticmethod
     def createShape(obj):
         outer = Elbow.createOuterPart(obj)
         inner = Elbow.createInnerPart(obj)
-        return outer.cut(inner)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
 
+    @Trace.traced("Elbow.execute")
     def execute(self, obj):
         # Create the shape of the elbow.
-        shape = Elbow.createShape(obj)
+        shape = LevelOfDetail.createShape(Elbow, obj)
         obj.Shape = shape
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
-        dims = Elbow.extractDimensions(obj)
+    @classmethod
+    def getPorts(cls, obj):
+        dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         # FreeCAD.Console.PrintMessage("Ports are %s and %s"%(aux["p5"], aux["p6"]))
         return [aux["p5"], aux["p6"]]
 
-    def getPortRotationAngles(self, obj):
+    @classmethod
+    def getPortRotationAngles(cls, obj):
         """Calculate coordinates of the ports rotation and return them as vectorsself.
 
         x = Yaw
         y = Pitch
         z = Roll
         """
-        dims = Elbow.extractDimensions(obj)
+        dims = cls.extractDimensions(obj)
         half = dims.BendAngle / 2
         # -45° and 135° are rotation of 0° elbow. They acts as a refence for a bent elbow.
-        end0 = FreeCAD.Vector(-45 + half.Value, 0, 0)
-        end1 = FreeCAD.Vector(135 - half.Value, 0, 0)
+        end0 = FreeCAD.Vector(-45 + half, 0, 0)
+        end1 = FreeCAD.Vector(135 - half, 0, 0)
         return [end0, end1]
 
 
@@ -251,7 +256,8 @@ class ElbowBuilder:
         """Create an elbow."""
         elbow = Elbow(obj, PSize="", BendAngle=self.dims.BendAngle, M=self.dims.M, POD=self.dims.POD,
                       PThk=self.dims.PThk, H=self.dims.H, J=self.dims.J)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
 
         return elbow
@@ -5,14 +5,12 @@
 
 import FreeCAD
 import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.SweepElbow as SweepElbowMod
 
-
 # The value RELATIVE_EPSILON is used to slightly change the size of parts
 # to prevent problems with boolean operations.
 # Keep this value very small.
@@ -21,9 +19,11 @@ import OsePiping.SweepElbow as SweepElbowMod
 RELATIVE_EPSILON = 0.000001
 
 
-class SweepElbow(pypeType):
-    def __init__(self, obj, PSize="", dims=SweepElbowMod.Dimensions()):
+class SweepElbow(Backend.PypeType):
+    def __init__(self, obj, PSize="", dims=None):
         """Create a sweep elbow with the center at (0,0,0) sockets along the z and y axis."""
+        if dims is None:
+            dims = SweepElbowMod.Dimensions()
         # Run parent __init__ and define common attributes.
         super(SweepElbow, self).__init__(obj)
         obj.PType = "OSE_SweepElbow"
@@ -52,6 +52,7 @@ class SweepElbow(pypeType):
         # Make Ports read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -94,7 +95,7 @@ class SweepElbow(pypeType):
 
         aux = dims.calculateAuxiliararyPoints()
 
-        alpha = float(dims.BendAngle.getValueAs("deg"))
+        alpha = dims.BendAngle
         rBend = (aux["p3"] - aux["p5"]).Length
 
         # Put a base on the streight part.
@@ -119,6 +120,7 @@ class SweepElbow(pypeType):
         return solid
 
     @staticmethod
+    @Trace.traced("outer part")
     def createOuterPart(obj):
         dims = SweepElbow.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
@@ -129,14 +131,15 @@ class SweepElbow(pypeType):
         # Create socket along the z axis.
         h = float(dims.H) - aux["p2"].Length
         r = dims.M / 2
-        socket1 = Part.makeCylinder(r, h, aux["p2"], aux["p2"])
+        socket1 = Metrics.makeCylinder(r, h, aux["p2"], aux["p2"])
         # Create socket along the bent part.
-        socket2 = Part.makeCylinder(r, h, aux["p4"], aux["p4"])
+        socket2 = Metrics.makeCylinder(r, h, aux["p4"], aux["p4"])
 
-        outer = bentPart.fuse([socket1, socket2])
+        outer = Metrics.fuse(bentPart, [socket1, socket2])
         return outer
 
     @staticmethod
+    @Trace.traced("inner part")
     def createInnerPart(obj):
         dims = SweepElbow.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
@@ -150,43 +153,47 @@ class SweepElbow(pypeType):
         # The socket length is actually dims.H - dims.J. But we do it longer
         # to prevent problems with bulean operations
         hSocket = dims.H
-        socket1 = Part.makeCylinder(rSocket, hSocket, aux["p5"], aux["p5"])
-        socket2 = Part.makeCylinder(rSocket, hSocket, aux["p6"], aux["p6"])
+        socket1 = Metrics.makeCylinder(rSocket, hSocket, aux["p5"], aux["p5"])
+        socket2 = Metrics.makeCylinder(rSocket, hSocket, aux["p6"], aux["p6"])
 
-        inner = bentPart.fuse([socket1, socket2])
+        inner = Metrics.fuse(bentPart, [socket1, socket2])
         return inner
 
     @staticmethod
     def createShape(obj):
         outer = SweepElbow.createOuterPart(obj)
         inner = SweepElbow.createInnerPart(obj)
-        return outer.cut(inner)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
 
+    @Trace.traced("SweepElbow.execute")
     def execute(self, obj):
         # Create the shape of the tee.
-        shape = SweepElbow.createShape(obj)
+        shape = LevelOfDetail.createShape(SweepElbow, obj)
         obj.Shape = shape
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
-    def getPorts(self, obj):
-        dims = SweepElbow.extractDimensions(obj)
+    @classmethod
+    def getPorts(cls, obj):
+        dims = cls.extractDimensions(obj)
         aux = dims.calculateAuxiliararyPoints()
         # FreeCAD.Console.PrintMessage("Ports are %s and %s"%(aux["p5"], aux["p6"]))
         return [aux["p5"], aux["p6"]]
 
-    def getPortRotationAngles(self, obj):
+    @classmethod
+    def getPortRotationAngles(cls, obj):
         """Calculate coordinates of the ports rotation and return them as vectorsself.
 
         x = Yaw
         y = Pitch
         z = Roll
         """
-        dims = SweepElbow.extractDimensions(obj)
+        dims = cls.extractDimensions(obj)
         half = dims.BendAngle / 2
         # -45° and 135° are rotation of 0° elbow. They acts as a refence for a bent elbow.
-        end0 = FreeCAD.Vector(-45 + half.Value, 0, 0)
-        end1 = FreeCAD.Vector(135 - half.Value, 0, 0)
+        end0 = FreeCAD.Vector(-45 + half, 0, 0)
+        end1 = FreeCAD.Vector(135 - half, 0, 0)
         return [end0, end1]
 
 
@@ -205,7 +212,8 @@ class SweepElbowBuilder:
         feature = self.document.addObject("Part::FeaturePython","OSE-SweepElbow")
         """
         elbow = SweepElbow(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
         return elbow
 
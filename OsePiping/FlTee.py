@@ -4,21 +4,21 @@
 # Create a tee using Flamingo workbench.
 
 import FreeCAD
-import Part
-# Parent class from Dodo or Flamingo.
-try:
-    from pFeatures import pypeType
-except ModuleNotFoundError:
-    from pipeFeatures import pypeType
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.LevelOfDetail as LevelOfDetail
 import OsePiping.Tee as TeeMod
 
 
-class Tee(pypeType):
-    def __init__(self, obj, PSize="", dims=TeeMod.Dimensions()):
+class Tee(Backend.PypeType):
+    def __init__(self, obj, PSize="", dims=None):
         """Create a Tee.
 
         Create a tee fitting __|__ with a signle vertical socket and two horizonal sockets.
         """
+        if dims is None:
+            dims = TeeMod.Dimensions()
         # Run parent __init__ and define common attributes
         super(Tee, self).__init__(obj)
         obj.PType = "OSE_Tee"
@@ -65,6 +65,7 @@ class Tee(pypeType):
         # Make Port information read only.
         obj.setEditorMode("Ports", 1)
         obj.setEditorMode("PortRotationAngles", 1)
+        LevelOfDetail.addProperty(obj)
 
     def onChanged(self, obj, prop):
         # if you aim to do something when an attribute is changed
@@ -104,6 +105,7 @@ class Tee(pypeType):
         return dims
 
     @classmethod
+    @Trace.traced("outer part")
     def createOuterPart(cls, obj):
         dims = cls.extractDimensions(obj)
 
@@ -125,7 +127,7 @@ class Tee(pypeType):
             p = FreeCAD.Vector(-dims.M2 / 2.0, 0, 0)
             # Direction where to rotate the cylinder
             dr = FreeCAD.Vector(1, 0, 0)
-            return Part.makeCylinder(r, h, p, dr)
+            return Metrics.makeCylinder(r, h, p, dr)
         else:
             return None
 
@@ -137,19 +139,17 @@ class Tee(pypeType):
         L = dims.H + dims.H1
         r = dims.M2 / 2.0
         h = dims.H2
-        vertical_outer_cylinder = Part.makeCylinder(r, h)
+        vertical_outer_cylinder = Metrics.makeCylinder(r, h)
         r = dims.M / 2.0
         h = L
         dr = FreeCAD.Vector(1, 0, 0)  # Put cylinder along the x-axis.
-        horizontal_outer_cylinder = Part.makeCylinder(r, h, aux["p1"], dr)
+        horizontal_outer_cylinder = Metrics.makeCylinder(r, h, aux["p1"], dr)
         outer_fusion = None
         enh = cls.horizontalWallEnhancement(obj)
         if enh is None:
-            outer_fusion = horizontal_outer_cylinder.fuse(
-                [vertical_outer_cylinder])
+            outer_fusion = Metrics.fuse(horizontal_outer_cylinder, [vertical_outer_cylinder])
         else:
-            outer_fusion = horizontal_outer_cylinder.fuse(
-                [vertical_outer_cylinder, enh])
+            outer_fusion = Metrics.fuse(horizontal_outer_cylinder, [vertical_outer_cylinder, enh])
 
         return outer_fusion
 
@@ -165,35 +165,34 @@ class Tee(pypeType):
         r = dims.M / 2.0
         h = dims.leftSocketOuterLength()
         dr = FreeCAD.Vector(1, 0, 0)  # Put the cylinder along the x-ayis.
-        cylinder1 = Part.makeCylinder(r, h, aux["p1"], dr)
+        cylinder1 = Metrics.makeCylinder(r, h, aux["p1"], dr)
         # Create a cone and put it at the right side of the cylinder 1.
         r1 = dims.M / 2.0
         r2 = dims.M1 / 2.0
         h = dims.G + dims.G1
         dr = FreeCAD.Vector(1, 0, 0)
-        cone = Part.makeCone(r1, r2, h, aux["p5"], dr)
+        cone = Metrics.makeCone(r1, r2, h, aux["p5"], dr)
         # Create a socket 2 and put it at the right side of the cone.
         r = dims.M1 / 2.0
         h = dims.rightSocketOuterLength()
         dr = FreeCAD.Vector(1, 0, 0)  # Put the cylinder along the x-ayis.
-        cylinder2 = Part.makeCylinder(r, h, aux["p6"], dr)
+        cylinder2 = Metrics.makeCylinder(r, h, aux["p6"], dr)
         # Create vertical part.
         r = dims.M2 / 2.0
         h = dims.H2
-        vertical_outer_cylinder = Part.makeCylinder(r, h)
+        vertical_outer_cylinder = Metrics.makeCylinder(r, h)
         # Combine all four parts and, if necessary, add enhacement.
         enh = cls.horizontalWallEnhancement(obj)
         outer_fusion = None
         if enh is None:
-            outer_fusion = cylinder1.fuse(
-                [cone, cylinder2, vertical_outer_cylinder])
+            outer_fusion = Metrics.fuse(cylinder1, [cone, cylinder2, vertical_outer_cylinder])
         else:
-            outer_fusion = cylinder1.fuse(
-                [cone, cylinder2, vertical_outer_cylinder, enh])
+            outer_fusion = Metrics.fuse(cylinder1, [cone, cylinder2, vertical_outer_cylinder, enh])
 
         return outer_fusion
 
     @classmethod
+    @Trace.traced("inner part")
     def createInnerPart(cls, obj):
         dims = cls.extractDimensions(obj)
         if dims.PID() == dims.PID1():
@@ -209,15 +208,15 @@ class Tee(pypeType):
         r = dims.POD / 2.0
         h = dims.H - dims.G
         dr = FreeCAD.Vector(1, 0, 0)  # Put cylinder along the x-axis.
-        socket_left = Part.makeCylinder(r, h, aux["p1"], dr)
+        socket_left = Metrics.makeCylinder(r, h, aux["p1"], dr)
 
         r = dims.POD1 / 2.0
         h = dims.H1 - dims.G1
-        socket_right = Part.makeCylinder(r, h, aux["p3"], dr)
+        socket_right = Metrics.makeCylinder(r, h, aux["p3"], dr)
 
         r = dims.POD2 / 2.0
         h = dims.H2 - dims.G2
-        socket_top = Part.makeCylinder(r, h, aux["p4"])
+        socket_top = Metrics.makeCylinder(r, h, aux["p4"])
 
         return [socket_left, socket_top, socket_right]
 
@@ -229,12 +228,12 @@ class Tee(pypeType):
         L = dims.H + dims.H1
         r = dims.PID2() / 2.0
         h = dims.H2
-        vertical_inner_cylinder = Part.makeCylinder(r, h)
+        vertical_inner_cylinder = Metrics.makeCylinder(r, h)
         r = dims.PID() / 2.0
         h = L
         dr = FreeCAD.Vector(1, 0, 0)  # Put cylinder along the x-axis.
-        horizontal_inner_cylinder = Part.makeCylinder(r, h, aux["p1"], dr)
-        return horizontal_inner_cylinder.fuse([vertical_inner_cylinder] + cls.createInnerSockets(obj))
+        horizontal_inner_cylinder = Metrics.makeCylinder(r, h, aux["p1"], dr)
+        return Metrics.fuse(horizontal_inner_cylinder, [vertical_inner_cylinder] + cls.createInnerSockets(obj))
 
     @classmethod
     def createInnerPartReducedHorizontal(cls, obj):
@@ -246,28 +245,34 @@ class Tee(pypeType):
         r = dims.PID() / 2.0
         h = dims.H - dims.G
         dr = FreeCAD.Vector(1, 0, 0)  # Put cylinder or cone along the x-axis.
-        cylinder1 = Part.makeCylinder(r, h, aux["p1"], dr)
+        cylinder1 = Metrics.makeCylinder(r, h, aux["p1"], dr)
         # Create a cone and put it to the right of the cylinder 1.
         r1 = dims.PID() / 2.0
         r2 = dims.PID1() / 2.0
         h = dims.G + dims.G1
-        cone = Part.makeCone(r1, r2, h, aux["p2"], dr)
+        cone = Metrics.makeCone(r1, r2, h, aux["p2"], dr)
         # Create a socket 2 and put it at the right side of the cone.
         r = dims.PID1() / 2.0
         h = dims.H1 - dims.G1
-        cylinder2 = Part.makeCylinder(r, h, aux["p3"], dr)
+        cylinder2 = Metrics.makeCylinder(r, h, aux["p3"], dr)
         # Create vertical part.
         r = dims.PID2() / 2.0
         h = dims.H2
-        vertical_cylinder = Part.makeCylinder(r, h)
+        vertical_cylinder = Metrics.makeCylinder(r, h)
         # Combine all parts.
-        return cylinder1.fuse([cone, cylinder2, vertical_cylinder] + cls.createInnerSockets(obj))
+        return Metrics.fuse(cylinder1, [cone, cylinder2, vertical_cylinder] + cls.createInnerSockets(obj))
 
+    @classmethod
+    def createShape(cls, obj):
+        inner = cls.createInnerPart(obj)
+        outer = cls.createOuterPart(obj)
+        with Trace.span("boolean"):
+            return Metrics.cut(outer, inner)
+
+    @Trace.traced("Tee.execute")
     def execute(self, obj):
         # Create the shape of the tee.
-        inner = self.createInnerPart(obj)
-        outer = self.createOuterPart(obj)
-        obj.Shape = outer.cut(inner)
+        obj.Shape = LevelOfDetail.createShape(Tee, obj)
         # Recalculate ports.
         obj.Ports = self.getPorts(obj)
 
@@ -311,7 +316,8 @@ class TeeBuilder:
         feature = self.document.addObject("Part::FeaturePython","OSE-Tee")
         """
         tee = Tee(obj, PSize="", dims=self.dims)
-        obj.ViewObject.Proxy = 0
+        if FreeCAD.GuiUp:
+            obj.ViewObject.Proxy = 0
         obj.Placement.Base = self.pos
         return tee
 
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Export piping assemblies as binary glTF (.glb) for web viewers.
+#
+# Fittings with the same part number and the same dimensions are tessellated only once.
+# Every fitting in the document is a node, which refers to the shared mesh and has the
+# transformation of its placement. Thus the size of the file and the time of the export
+# grow with the number of unique parts and not with the number of all parts.
+#
+#   import OsePiping.GltfExport as GltfExport
+#   GltfExport.exportDocument(FreeCAD.ActiveDocument, "/tmp/plant.glb", deflection=0.5)
+
+import array
+import json
+import math
+import struct
+import sys
+import FreeCAD
+import OsePiping.Piping as Piping
+
+# Maximal deviation of the tessellation from the real shape in mm.
+DEFAULT_DEFLECTION = 0.5
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_INT = 5125
+
+# FreeCAD uses mm and z up, glTF uses m and y up.
+ROOT_SCALE = [0.001, 0.001, 0.001]
+ROOT_ROTATION = [-math.sqrt(0.5), 0.0, 0.0, math.sqrt(0.5)]
+
+
+def getInstanceKey(obj):
+    """Return a key, which is equal for all objects with the same shape in local coordinates.
+
+    OSE features are identified by the part number, the detail level and the dimensions.
+    Other objects get a mesh of their own.
+    """
+    if Piping.isOseFeature(obj):
+        dims = type(obj.Proxy).extractDimensions(obj)
+        values = tuple("{:.6g}".format(getattr(dims, name)) for name in dims.getNames())
+        # Features from older documents have no detail level and show the full shape.
+        return (obj.PType, obj.PartNumber, getattr(obj, "DetailLevel", "Full")) + values
+    return ("object", obj.Document.Name, obj.Name)
+
+
+def getExportedObjects(document):
+    """Return objects with shapes, which are not used by other shapes, for example by a cut."""
+    res = []
+    for obj in document.Objects:
+        if not obj.isDerivedFrom("Part::Feature") or obj.Shape.isNull():
+            continue
+        if any(o.isDerivedFrom("Part::Feature") for o in obj.InList):
+            continue
+        res.append(obj)
+    return res
+
+
+def tessellate(obj, deflection):
+    """Return pair (points, triangles) of the object shape without its placement."""
+    shape = obj.Shape.copy()
+    shape.Placement = FreeCAD.Placement()
+    points, triangles = shape.tessellate(deflection)
+    return ([(p.x, p.y, p.z) for p in points], triangles)
+
+
+def _toBytes(values, typeCode):
+    data = array.array(typeCode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+class GltfBuilder:
+    """Collect meshes and nodes and write them as a glb file."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.bufferViews = []
+        self.accessors = []
+        self.meshes = []
+        self.nodes = []
+
+    def _addBufferView(self, data, target):
+        self.bufferViews.append({"buffer": 0, "byteOffset": len(self.buffer),
+                                 "byteLength": len(data), "target": target})
+        self.buffer += data
+        return len(self.bufferViews) - 1
+
+    def addMesh(self, name, points, triangles):
+        """Add a mesh. Return its index."""
+        positions = [c for p in points for c in p]
+        indices = [i for t in triangles for i in t]
+        view = self._addBufferView(_toBytes(positions, "f"), ARRAY_BUFFER)
+        self.accessors.append({"bufferView": view, "componentType": FLOAT, "count": len(points), "type": "VEC3",
+                               "min": [min(p[i] for p in points) for i in range(0, 3)],
+                               "max": [max(p[i] for p in points) for i in range(0, 3)]})
+        position_accessor = len(self.accessors) - 1
+        view = self._addBufferView(_toBytes(indices, "I"), ELEMENT_ARRAY_BUFFER)
+        self.accessors.append({"bufferView": view, "componentType": UNSIGNED_INT,
+                               "count": len(indices), "type": "SCALAR"})
+        self.meshes.append({"name": name, "primitives": [{"attributes": {"POSITION": position_accessor},
+                                                          "indices": len(self.accessors) - 1,
+                                                          "material": 0}]})
+        return len(self.meshes) - 1
+
+    def addInstance(self, name, mesh, placement):
+        q = placement.Rotation.Q
+        self.nodes.append({"name": name, "mesh": mesh,
+                           "translation": [placement.Base.x, placement.Base.y, placement.Base.z],
+                           "rotation": [q[0], q[1], q[2], q[3]]})
+
+    def getJson(self):
+        root = {"name": "root", "scale": ROOT_SCALE, "rotation": ROOT_ROTATION,
+                "children": list(range(1, len(self.nodes) + 1))}
+        return {"asset": {"version": "2.0", "generator": "OSE piping workbench"},
+                "scene": 0,
+                "scenes": [{"nodes": [0]}],
+                "nodes": [root] + self.nodes,
+                "meshes": self.meshes,
+                "materials": [{"pbrMetallicRoughness": {"baseColorFactor": [0.8, 0.8, 0.8, 1.0],
+                                                        "metallicFactor": 0.5, "roughnessFactor": 0.5}}],
+                "accessors": self.accessors,
+                "bufferViews": self.bufferViews,
+                "buffers": [{"byteLength": len(self.buffer)}]}
+
+    def write(self, path):
+        json_chunk = json.dumps(self.getJson(), separators=(",", ":")).encode("utf-8")
+        json_chunk += b" " * (-len(json_chunk) % 4)
+        bin_chunk = bytes(self.buffer) + b"\0" * (-len(self.buffer) % 4)
+        length = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+        with open(path, "wb") as f:
+            f.write(struct.pack("<III", GLB_MAGIC, GLB_VERSION, length))
+            f.write(struct.pack("<II", len(json_chunk), CHUNK_JSON))
+            f.write(json_chunk)
+            f.write(struct.pack("<II", len(bin_chunk), CHUNK_BIN))
+            f.write(bin_chunk)
+
+
+def exportObjects(objects, path, deflection=DEFAULT_DEFLECTION):
+    """Export objects to a glb file. Return pair (number of instances, number of unique meshes)."""
+    builder = GltfBuilder()
+    meshes = {}
+    instances = 0
+    for obj in objects:
+        key = getInstanceKey(obj)
+        if key not in meshes:
+            points, triangles = tessellate(obj, deflection)
+            meshes[key] = builder.addMesh(obj.Label, points, triangles) if len(triangles) > 0 else None
+        if meshes[key] is None:
+            continue
+        builder.addInstance(obj.Label, meshes[key], obj.getGlobalPlacement())
+        instances += 1
+    builder.write(path)
+    return (instances, len(builder.meshes))
+
+
+def exportDocument(document, path, deflection=DEFAULT_DEFLECTION):
+    return exportObjects(getExportedObjects(document), path, deflection)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Level of detail of OSE features. The property "DetailLevel" of a feature selects
+# the shape, which execute() builds:
+#
+#   Full        the fitting with sockets and inner cuts,
+#   Envelope    the outer part only, without booleans with the inner part,
+#   Centerline  thin cylinders from the center of the fitting to its ports.
+#
+# Switching the level recomputes the feature. The parts are not inserted again and keep
+# their placement, part number and dimensions.
+#
+# "Full detail on selection" shows selected features in full detail without changing
+# their property. The override is kept in memory only, it is neither undone nor saved.
+# Before a document is saved, its features get back the shapes of their property.
+
+import FreeCAD
+import Part
+import OsePiping.Metrics as Metrics
+import OsePiping.Port as Port
+import OsePiping.Piping as Piping
+
+PROPERTY_NAME = "DetailLevel"
+FULL = "Full"
+ENVELOPE = "Envelope"
+CENTERLINE = "Centerline"
+LEVELS = [FULL, ENVELOPE, CENTERLINE]
+
+# Radius of the centerline cylinders relative to the longest cylinder of the fitting.
+STUB_RADIUS_RATIO = 0.08
+# Default radius of "Full detail near selection" in mm.
+NEAR_RADIUS = 1000.0
+# Determinants below this value mean that the port axes are parallel.
+PARALLEL_EPSILON = 1e-9
+
+
+def addProperty(obj):
+    if PROPERTY_NAME not in obj.PropertiesList:
+        obj.addProperty("App::PropertyEnumeration", PROPERTY_NAME, "Display",
+                        "Full shape, outer envelope or centerline only.")
+        setattr(obj, PROPERTY_NAME, LEVELS)
+        setattr(obj, PROPERTY_NAME, FULL)
+
+
+# Features shown in full detail independent of their property, by (document name, object name).
+_fullDetailOverrides = set()
+
+
+def getStoredLevel(obj):
+    """Return the detail level in the property of the feature. Features from older documents have the full detail."""
+    return getattr(obj, PROPERTY_NAME, FULL)
+
+
+def getLevel(obj):
+    """Return the detail level, which the feature shows."""
+    if (obj.Document.Name, obj.Name) in _fullDetailOverrides:
+        return FULL
+    return getStoredLevel(obj)
+
+
+def _determinant(m):
+    # Expansion along the first row.
+    a = m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+    b = m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+    c = m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+    return a - b + c
+
+
+def getCenter(ports):
+    """Return the point closest to the axes of all ports.
+
+    If the axes are parallel, for example in a coupling, return the mean of the port positions.
+    """
+    a = [[0.0] * 3 for i in range(0, 3)]
+    b = [0.0] * 3
+    for port in ports:
+        n = port.getNormal()
+        n = (n.x, n.y, n.z)
+        p = port.placement.Base
+        p = (p.x, p.y, p.z)
+        for i in range(0, 3):
+            for j in range(0, 3):
+                projection = (1.0 if i == j else 0.0) - n[i] * n[j]
+                a[i][j] += projection
+                b[i] += projection * p[j]
+    det = _determinant(a)
+    if len(ports) < 2 or abs(det) < PARALLEL_EPSILON:
+        mean = FreeCAD.Vector(0, 0, 0)
+        for port in ports:
+            mean = mean + port.placement.Base
+        return mean * (1.0 / max(len(ports), 1))
+    # Cramer's rule.
+    res = []
+    for k in range(0, 3):
+        m = [[b[i] if j == k else a[i][j] for j in range(0, 3)] for i in range(0, 3)]
+        res.append(_determinant(m) / det)
+    return FreeCAD.Vector(*res)
+
+
+def createCenterline(ports):
+    """Create cylinders from the center of the fitting to every port."""
+    center = getCenter(ports)
+    stubs = [port.placement.Base - center for port in ports]
+    stubs = [s for s in stubs if s.Length > 0]
+    if len(stubs) == 0:
+        return Part.Shape()
+    radius = max(s.Length for s in stubs) * STUB_RADIUS_RATIO
+    cylinders = [Metrics.makeCylinder(radius, s.Length, center, s) for s in stubs]
+    return Part.makeCompound(cylinders)
+
+
+def createShape(cls, obj):
+    """Create shape of the feature obj of the Fl* class cls with its detail level."""
+    level = getLevel(obj)
+    if level == ENVELOPE:
+        return cls.createOuterPart(obj)
+    elif level == CENTERLINE:
+        ports = Port.advancedPortsFromData(obj.Proxy.getPorts(obj), obj.Proxy.getPortRotationAngles(obj))
+        return createCenterline(ports)
+    return cls.createShape(obj)
+
+
+def setLevel(objects, level):
+    """Set the detail level of OSE features among objects. Return the number of changed features."""
+    if level not in LEVELS:
+        raise ValueError("Unknown detail level {}. Use one of {}.".format(level, ", ".join(LEVELS)))
+    changed = 0
+    for obj in objects:
+        if not Piping.isOseFeature(obj) or getStoredLevel(obj) == level:
+            continue
+        addProperty(obj)
+        setattr(obj, PROPERTY_NAME, level)
+        obj.touch()
+        changed += 1
+    return changed
+
+
+def setDocumentLevel(document, level):
+    changed = setLevel(document.Objects, level)
+    document.recompute()
+    return changed
+
+
+def showFullDetailNear(document, point, radius, otherLevel=ENVELOPE):
+    """Show features with the base of the placement within radius of point in full detail.
+
+    All other features get otherLevel.
+    """
+    near = []
+    far = []
+    for obj in document.Objects:
+        if Piping.isOseFeature(obj):
+            distance = (obj.getGlobalPlacement().Base - point).Length
+            (near if distance <= radius else far).append(obj)
+    changed = setLevel(near, FULL) + setLevel(far, otherLevel)
+    document.recompute()
+    return changed
+
+
+def setFullDetailOverride(obj, enabled):
+    """Show the feature in full detail, or again with the level of its property. Recompute it, if needed."""
+    key = (obj.Document.Name, obj.Name)
+    if enabled == (key in _fullDetailOverrides):
+        return
+    before = getLevel(obj)
+    if enabled:
+        _fullDetailOverrides.add(key)
+    else:
+        _fullDetailOverrides.discard(key)
+    if getLevel(obj) != before:
+        obj.touch()
+        obj.recompute()
+
+
+class FullDetailOnSelection:
+    """Selection and document observer. Selected features are shown in full detail.
+
+    When a feature is not selected any more, it is shown again with its own level.
+    """
+
+    def __init__(self):
+        # Features, whose override is suspended while their document is saved.
+        self._saved = []
+
+    def _getObject(self, documentName, objectName):
+        document = FreeCAD.listDocuments().get(documentName)
+        return document.getObject(objectName) if document is not None else None
+
+    def _getOverridden(self, documentName):
+        objects = [self._getObject(key[0], key[1]) for key in _fullDetailOverrides if key[0] == documentName]
+        return [obj for obj in objects if obj is not None]
+
+    def addSelection(self, documentName, objectName, subElementName, position):
+        obj = self._getObject(documentName, objectName)
+        if obj is not None and Piping.isOseFeature(obj):
+            setFullDetailOverride(obj, True)
+
+    def removeSelection(self, documentName, objectName, subElementName):
+        obj = self._getObject(documentName, objectName)
+        if obj is not None:
+            setFullDetailOverride(obj, False)
+
+    def clearSelection(self, documentName):
+        for obj in self._getOverridden(documentName):
+            setFullDetailOverride(obj, False)
+
+    def slotStartSaveDocument(self, document, fileName):
+        # Save the shapes of the stored levels. The selection gets full detail again after saving.
+        self._saved = self._getOverridden(document.Name)
+        for obj in self._saved:
+            setFullDetailOverride(obj, False)
+
+    def slotFinishSaveDocument(self, document, fileName):
+        for obj in self._saved:
+            setFullDetailOverride(obj, True)
+        self._saved = []
+
+    def slotDeletedDocument(self, document):
+        for key in [k for k in _fullDetailOverrides if k[0] == document.Name]:
+            _fullDetailOverrides.discard(key)
+
+    def slotDeletedObject(self, obj):
+        _fullDetailOverrides.discard((obj.Document.Name, obj.Name))
+
+    def restoreAll(self):
+        for document_name in set(key[0] for key in _fullDetailOverrides):
+            self.clearSelection(document_name)
+        _fullDetailOverrides.clear()
+
+
+_selectionObserver = None
+
+
+def isFullDetailOnSelection():
+    return _selectionObserver is not None
+
+
+def setFullDetailOnSelection(enabled):
+    global _selectionObserver
+    import FreeCADGui
+    if enabled and _selectionObserver is None:
+        _selectionObserver = FullDetailOnSelection()
+        FreeCADGui.Selection.addObserver(_selectionObserver)
+        FreeCAD.addDocumentObserver(_selectionObserver)
+    elif not enabled and _selectionObserver is not None:
+        FreeCADGui.Selection.removeObserver(_selectionObserver)
+        FreeCAD.removeDocumentObserver(_selectionObserver)
+        _selectionObserver.restoreAll()
+        _selectionObserver = None
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Counters of the work done by the workbench: booleans, primitives, removed temporary
+# objects, table loads, hits and misses of the caches, and the memory of the shapes of
+# OSE features. Primitives are boxes, cylinders, cones and spheres; the swept bodies of
+# elbows are not counted.
+#
+# Read them in the Python console
+#
+#   import OsePiping.Metrics as Metrics
+#   Metrics.printReport()
+#   Metrics.dumpJson("/tmp/ose-piping-metrics.json")
+#   Metrics.reset()
+
+import json
+import threading
+import time
+import FreeCAD
+import Part
+
+BOOLEANS = "booleans"
+PRIMITIVES = "primitives"
+TEMPORARIES_REMOVED = "temporariesRemoved"
+TABLE_LOADS = "tableLoads"
+SHAPE_MEMORY_BYTES = "shapeMemoryBytes"
+
+# Caches. Every cache has the counters "<cache>Hits" and "<cache>Misses".
+PORT_FRAME_CACHE = "portFrameCache"
+TABLE_CACHE = "tableCache"
+PREVIEW_CACHE = "previewCache"
+CACHES = [PORT_FRAME_CACHE, TABLE_CACHE, PREVIEW_CACHE]
+
+COUNTERS = [BOOLEANS, PRIMITIVES, TEMPORARIES_REMOVED, TABLE_LOADS] + \
+    [cache + suffix for cache in CACHES for suffix in ["Hits", "Misses"]]
+
+# Document objects, which the parts and solid output types create.
+BOOLEAN_TYPES = ["Part::Cut", "Part::Fuse", "Part::MultiFuse", "Part::Common", "Part::MultiCommon"]
+PRIMITIVE_TYPES = ["Part::Box", "Part::Cylinder", "Part::Cone", "Part::Sphere", "Part::Torus",
+                   "Part::Prism", "Part::Wedge", "Part::Ellipsoid"]
+
+_counters = dict((name, 0) for name in COUNTERS)
+_lock = threading.Lock()
+_started = time.time()
+
+
+def increment(name, count=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + count
+
+
+def get(name):
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def countLookup(cache, hit):
+    """Count a hit or a miss of the cache."""
+    increment(cache + ("Hits" if hit else "Misses"))
+
+
+def reset():
+    global _started
+    with _lock:
+        for name in _counters.keys():
+            _counters[name] = 0
+        _started = time.time()
+
+
+def counted(name, function):
+    """Return a function, which calls function and increments the counter name."""
+    def wrapper(*args, **kwargs):
+        increment(name)
+        return function(*args, **kwargs)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+# Primitives of the Part API, which count themselves.
+makeBox = counted(PRIMITIVES, Part.makeBox)
+makeCone = counted(PRIMITIVES, Part.makeCone)
+makeCylinder = counted(PRIMITIVES, Part.makeCylinder)
+makeSphere = counted(PRIMITIVES, Part.makeSphere)
+
+
+# Booleans of the Part API, which count themselves.
+def fuse(shape, others):
+    """Return shape.fuse(others)."""
+    increment(BOOLEANS)
+    return shape.fuse(others)
+
+
+def cut(shape, tool):
+    """Return shape.cut(tool)."""
+    increment(BOOLEANS)
+    return shape.cut(tool)
+
+
+def common(shape, tool):
+    """Return shape.common(tool)."""
+    increment(BOOLEANS)
+    return shape.common(tool)
+
+
+def countDocumentObjects(objects):
+    """Count booleans and primitives among document objects created for a part."""
+    names = set()
+    for obj in objects:
+        if obj.Name in names:
+            continue
+        names.add(obj.Name)
+        if obj.TypeId in BOOLEAN_TYPES:
+            increment(BOOLEANS)
+        elif obj.TypeId in PRIMITIVE_TYPES:
+            increment(PRIMITIVES)
+
+
+def getShapeMemoryBytes(documents=None):
+    """Return the memory of the shapes of OSE features in bytes.
+
+    :param documents: documents to inspect. Use all open documents, if it is None.
+    """
+    # Piping imports this module, import it on use.
+    import OsePiping.Piping as Piping
+    if documents is None:
+        documents = FreeCAD.listDocuments().values()
+    res = 0
+    for document in documents:
+        for obj in document.Objects:
+            if Piping.isOseFeature(obj) and not obj.Shape.isNull():
+                res += obj.Shape.MemSize
+    return res
+
+
+def getMetrics(documents=None):
+    """Return dictionary with all counters and the current shape memory."""
+    with _lock:
+        res = dict(_counters)
+    res[SHAPE_MEMORY_BYTES] = getShapeMemoryBytes(documents)
+    res["secondsSinceReset"] = time.time() - _started
+    return res
+
+
+def printReport(documents=None):
+    for name, value in sorted(getMetrics(documents).items()):
+        FreeCAD.Console.PrintMessage("{:20} {}\n".format(name, value))
+
+
+def dumpJson(path, documents=None):
+    with open(path, "w") as f:
+        json.dump(getMetrics(documents), f, indent=1)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Build catalog parts on all cores. Catalog rows are split into shards, each worker
+# process imports FreeCAD on its own and builds its shards in its own scratch document.
+#
+# Run it with a Python interpreter, which can import FreeCAD, for example
+#
+#   python -m OsePiping.ParallelBuild --freecad-lib /usr/lib/freecad/lib \
+#       --fitting tee --format step --directory tee-step
+#
+# Use --scaling to build the catalog with 1, 2, 4, ... workers and print the speedup.
+#
+# If a worker process dies, for example by a crash in OCC, the shards, which were not
+# finished yet, are built again in a new pool. Shards lost a second time are recorded
+# as failed in the manifest.
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+WORKBENCH_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_NAME = "manifest.json"
+# Number of shards per worker. More shards than workers balance slow and fast rows.
+SHARDS_PER_WORKER = 4
+# How many times shards lost by a crashed worker are built again.
+SHARD_RETRIES = 1
+
+
+def _initWorker(freecadLib):
+    """Make FreeCAD and the workbench importable in a worker process."""
+    for path in [freecadLib, WORKBENCH_PATH]:
+        if path is not None and path not in sys.path:
+            sys.path.append(path)
+    import FreeCAD  # noqa: F401 Start the FreeCAD application once per worker.
+
+
+def _buildShard(args):
+    """Build part numbers of one shard. Return list of manifest records."""
+    spec, partNumbers = args
+    import OsePiping.BatchGenerate as BatchGenerate
+    job = BatchGenerate.Job(spec)
+    generator = BatchGenerate.PartGenerator(job.fittingType, job.outputType, job.length)
+    records = []
+    try:
+        for part_number in partNumbers:
+            start = time.time()
+            record = {"partNumber": part_number, "worker": os.getpid()}
+            try:
+                shape = generator.createShape(part_number)
+                file_name = BatchGenerate.getFileName(part_number, job.format)
+                BatchGenerate.exportShape(shape, os.path.join(job.directory, file_name), job.format)
+                record["file"] = file_name
+                record["status"] = "ok"
+            except Exception as e:
+                record["status"] = "failed"
+                record["error"] = str(e)
+            record["seconds"] = time.time() - start
+            records.append(record)
+    finally:
+        generator.close()
+    return records
+
+
+def makeShards(partNumbers, count):
+    """Split part numbers into count shards. Neighbour rows go to different shards."""
+    count = max(1, min(count, len(partNumbers)))
+    return [partNumbers[i::count] for i in range(0, count)]
+
+
+def getLostShardRecords(partNumbers, error):
+    return [{"partNumber": part_number, "worker": None, "status": "failed",
+             "error": "Worker process died: {}".format(error), "seconds": 0.0}
+            for part_number in partNumbers]
+
+
+def buildShards(spec, shards, workers, freecadLib):
+    """Build the shards in a pool of worker processes. Return list of manifest records."""
+    records = []
+    for attempt in range(0, SHARD_RETRIES + 1):
+        lost = []
+        # Do not fork a process with a running FreeCAD. Start fresh interpreters instead.
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_initWorker,
+                                                    initargs=(freecadLib,)) as executor:
+            futures = {executor.submit(_buildShard, (spec, shard)): shard for shard in shards}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    records += future.result()
+                except concurrent.futures.BrokenExecutor as e:
+                    lost.append((futures[future], e))
+        if len(lost) == 0:
+            break
+        if attempt == SHARD_RETRIES:
+            for shard, error in lost:
+                records += getLostShardRecords(shard, error)
+        shards = [shard for shard, _ in lost]
+    return records
+
+
+def getPartNumbers(spec, freecadLib):
+    """Load the table in this process and return part numbers of the job."""
+    _initWorker(freecadLib)
+    import OsePiping.BatchGenerate as BatchGenerate
+    job = BatchGenerate.Job(spec)
+    return job.getPartNumbers(job.fittingType.loadTable())
+
+
+def build(spec, workers=None, freecadLib=None, partNumbers=None):
+    """Build the job spec (see BatchGenerate) with a pool of worker processes.
+
+    Write a manifest to the output directory and return it as a dictionary.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    directory = spec.get("directory", ".")
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    if partNumbers is None:
+        partNumbers = getPartNumbers(spec, freecadLib)
+    shards = makeShards(partNumbers, workers * SHARDS_PER_WORKER)
+
+    start = time.time()
+    records = buildShards(spec, shards, workers, freecadLib)
+    seconds = time.time() - start
+
+    ok = sum(1 for r in records if r["status"] == "ok")
+    manifest = {
+        "fitting": spec["fitting"],
+        "outputType": spec.get("outputType", "solid"),
+        "format": spec.get("format", "step"),
+        "workers": workers,
+        "parts": len(records),
+        "failed": len(records) - ok,
+        "seconds": seconds,
+        "partsPerSecond": ok / seconds if seconds > 0 else 0.0,
+        "records": sorted(records, key=lambda r: r["partNumber"]),
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def measureScaling(spec, maxWorkers=None, freecadLib=None):
+    """Build the catalog with 1, 2, 4, ... up to maxWorkers workers.
+
+    Every run writes to a temporary directory inside the output directory of the spec,
+    which is removed after the run. Return list of dictionaries with workers, seconds,
+    partsPerSecond and speedup.
+    """
+    if maxWorkers is None:
+        maxWorkers = multiprocessing.cpu_count()
+    worker_counts = []
+    n = 1
+    while n < maxWorkers:
+        worker_counts.append(n)
+        n *= 2
+    worker_counts.append(maxWorkers)
+
+    part_numbers = getPartNumbers(spec, freecadLib)
+    directory = spec.get("directory", ".")
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    res = []
+    base_seconds = None
+    for workers in worker_counts:
+        run_spec = dict(spec)
+        run_spec["directory"] = tempfile.mkdtemp(prefix="scaling-%d-" % workers, dir=directory)
+        try:
+            manifest = build(run_spec, workers, freecadLib, part_numbers)
+        finally:
+            shutil.rmtree(run_spec["directory"], ignore_errors=True)
+        if base_seconds is None:
+            base_seconds = manifest["seconds"]
+        res.append({"workers": workers, "seconds": manifest["seconds"],
+                    "partsPerSecond": manifest["partsPerSecond"],
+                    "speedup": base_seconds / manifest["seconds"] if manifest["seconds"] > 0 else 0.0})
+    return res
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build catalog parts on all cores.")
+    parser.add_argument("--fitting", required=True, help="Fitting type, for example tee.")
+    parser.add_argument("--parts", nargs="*", help="Part numbers. All parts if omitted.")
+    parser.add_argument("--output-type", default="solid", choices=["solid", "parts", "dodo"])
+    parser.add_argument("--format", default="step", choices=["step", "brep"])
+    parser.add_argument("--directory", default=".")
+    parser.add_argument("--length", default="1 m", help="Length of pipes.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--freecad-lib", default=None, help="Directory containing FreeCAD.so.")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Measure the speedup with 1, 2, 4, ... workers.")
+    args = parser.parse_args(argv)
+    spec = {"fitting": args.fitting, "parts": args.parts if args.parts else "all",
+            "outputType": args.output_type, "format": args.format,
+            "directory": os.path.abspath(args.directory), "length": args.length}
+
+    if args.scaling:
+        print("workers  seconds  parts/sec  speedup")
+        for r in measureScaling(spec, args.workers, args.freecad_lib):
+            print("%7d  %7.2f  %9.2f  %7.2f" % (r["workers"], r["seconds"], r["partsPerSecond"], r["speedup"]))
+    else:
+        manifest = build(spec, args.workers, args.freecad_lib)
+        print("Built %d parts (%d failed) in %.2f s with %d workers: %.2f parts/sec." % (
+            manifest["parts"], manifest["failed"], manifest["seconds"], manifest["workers"],
+            manifest["partsPerSecond"]))
+        return 1 if manifest["failed"] > 0 else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
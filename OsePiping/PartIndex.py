@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Document-level index of OSE fittings by part number, type, size and rating.
+
+import FreeCAD
+
+# Properties of pipes and fittings which are indexed.
+INDEXED_PROPERTIES = ["PartNumber", "PType", "PSize", "PRating"]
+
+
+class PartIndex:
+    """Map values of indexed properties to the names of the objects having these values.
+
+    Use find() to search for objects. For example
+    index.find(PType="OSE_Tee", PSize="DN50") returns names of all DN50 tees.
+    """
+
+    def __init__(self):
+        # Map property name to a dictionary, which maps a property value to a set of object names.
+        self._index = dict((prop, {}) for prop in INDEXED_PROPERTIES)
+        # Map object name to the dictionary of its indexed values.
+        self._values = {}
+
+    def build(self, document):
+        self.clear()
+        for obj in document.Objects:
+            self.addObject(obj)
+
+    def clear(self):
+        self._index = dict((prop, {}) for prop in INDEXED_PROPERTIES)
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def _add(self, name, prop, value):
+        self._index[prop].setdefault(value, set()).add(name)
+        self._values.setdefault(name, {})[prop] = value
+
+    def _remove(self, name, prop):
+        values = self._values.get(name)
+        if values is None or prop not in values:
+            return
+        value = values.pop(prop)
+        names = self._index[prop].get(value)
+        if names is not None:
+            names.discard(name)
+            if len(names) == 0:
+                del self._index[prop][value]
+        if len(values) == 0:
+            del self._values[name]
+
+    def addObject(self, obj):
+        for prop in INDEXED_PROPERTIES:
+            self.updateProperty(obj, prop)
+
+    def updateProperty(self, obj, prop):
+        self._remove(obj.Name, prop)
+        if hasattr(obj, prop):
+            self._add(obj.Name, prop, getattr(obj, prop))
+
+    def removeObject(self, name):
+        for prop in INDEXED_PROPERTIES:
+            self._remove(name, prop)
+
+    def getValues(self, prop):
+        """Return all known values of an indexed property, for example all part numbers."""
+        return sorted(self._index[prop].keys())
+
+    def find(self, **criteria):
+        """Return a set of names of objects matching all criteria.
+
+        Criteria are keyword arguments with names from INDEXED_PROPERTIES.
+        """
+        if len(criteria) == 0:
+            return set(self._values.keys())
+        sets = []
+        for prop, value in criteria.items():
+            if prop not in self._index:
+                raise KeyError("Property %s is not indexed." % prop)
+            names = self._index[prop].get(value)
+            if names is None:
+                return set()
+            sets.append(names)
+        # Start the intersection with the smallest set.
+        sets.sort(key=len)
+        res = set(sets[0])
+        for names in sets[1:]:
+            res.intersection_update(names)
+        return res
+
+    def findObjects(self, document, **criteria):
+        """Return document objects matching all criteria."""
+        return [document.getObject(name) for name in sorted(self.find(**criteria))]
+
+
+class PartIndexObserver:
+    """Keep part indices of all documents up to date.
+
+    Register it with FreeCAD.addDocumentObserver.
+    """
+
+    def __init__(self):
+        self.indices = {}
+
+    def getIndex(self, document):
+        index = self.indices.get(document.Name)
+        if index is None:
+            index = PartIndex()
+            index.build(document)
+            self.indices[document.Name] = index
+        return index
+
+    def slotCreatedObject(self, obj):
+        # Objects restored by undo have their properties already.
+        index = self.indices.get(obj.Document.Name)
+        if index is not None:
+            index.addObject(obj)
+
+    def slotChangedObject(self, obj, prop):
+        if prop not in INDEXED_PROPERTIES:
+            return
+        index = self.indices.get(obj.Document.Name)
+        if index is not None:
+            index.updateProperty(obj, prop)
+
+    def slotDeletedObject(self, obj):
+        index = self.indices.get(obj.Document.Name)
+        if index is not None:
+            index.removeObject(obj.Name)
+
+    def slotDeletedDocument(self, document):
+        self.indices.pop(document.Name, None)
+
+
+_observer = None
+
+
+def getIndex(document):
+    """Return the part index of the document. The index is kept up to date automatically."""
+    global _observer
+    if _observer is None:
+        _observer = PartIndexObserver()
+        FreeCAD.addDocumentObserver(_observer)
+    return _observer.getIndex(document)
@@ -7,6 +7,9 @@ import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+import OsePiping.Backend as Backend
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -28,12 +31,13 @@ DIMENSIONS_USED = ["OD", "Thk"]
 RELATIVE_EPSILON = 0.1
 
 
-class Dimensions:
-    def __init__(self):
-        """Inititialize with test dimensions."""
-        self.OD = parseQuantity("3 cm")
-        self.Thk = parseQuantity("0.5 cm")
-        self.H = parseQuantity("1 m")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("OD", "Thk", "H")
+    DEFAULTS = {
+        "OD": "3 cm",
+        "Thk": "0.5 cm",
+        "H": "1 m",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -89,12 +93,14 @@ class Pipe:
         pipe.Base = outer_cylinder
         pipe.Tool = inner_cylinder
 
+        Metrics.countDocumentObjects(Piping.nestedObjects(pipe))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, pipe, "pipe (solid)")
             Piping.removePartWithChildren(self.document, pipe)
@@ -102,16 +108,22 @@ class Pipe:
         return pipe
 
 
+def createShape(dims):
+    """Create the shape of a pipe with the Part API, without adding objects to a document."""
+    outer = Metrics.makeCylinder(dims.OD / 2, dims.H)
+    inner = Metrics.makeCylinder(dims.OD / 2 - dims.Thk, dims.H * (1 + 2 * RELATIVE_EPSILON),
+                                 FreeCAD.Vector(0, 0, -dims.H * RELATIVE_EPSILON))
+    with Trace.span("boolean"):
+        return Metrics.cut(outer, inner)
+
+
 def getDFPipe(obj, DN, OD, thk, H):
     """Get pipe features from Dodo or from Flamingo workbench. """
-    try:
-        import pFeatures
-        FreeCAD.Console.PrintMessage("Creating Dodo pipe.")
-        return pFeatures.Pipe(obj, DN=DN, OD=OD, thk=thk, H=H)
-    except ModuleNotFoundError:
-        FreeCAD.Console.PrintMessage("Dodo workbench is not found. I will use Flamingo instead.")
-        import pipeFeatures
-        return pipeFeatures.Pipe(obj, DN=DN, OD=OD, thk=thk, H=H)
+    pipe_class = Backend.getPipeClass()
+    if pipe_class is None:
+        raise ModuleNotFoundError("Neither Dodo nor Flamingo workbench is found.")
+    FreeCAD.Console.PrintMessage("Creating {} pipe.".format(Backend.getBackendName()))
+    return pipe_class(obj, DN=DN, OD=OD, thk=thk, H=H)
 
 
 class PipeFromTable:
@@ -121,8 +133,24 @@ class PipeFromTable:
         self.document = document
         self.table = table
 
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row, length=None):
+        """Return dimensions of the pipe in the table row.
+
+        :param length: pipe length. If it is None, use the default length.
+        """
+        dims = Dimensions()
+        dims.OD = parseQuantity(row["OD"])
+        dims.Thk = parseQuantity(row["Thk"])
+        if length is not None:
+            dims.H = length
+        return dims
+
+    @Trace.traced("PipeFromTable.create")
     def create(self, partName, length, outputType):
-        row = self.table.findPart(partName)
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partName)
         if row is None:
             print("Part not found")
             return
@@ -148,7 +176,8 @@ class PipeFromTable:
                 feature.PSize = row["PSize"]
             # Workaround. Add ports before return. Otherwise the positioning is not working.
             feature.Ports = [FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, length)]
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             return part
 
 
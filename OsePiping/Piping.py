@@ -4,7 +4,23 @@
 # General classes for pipe and fittng parts.
 
 import csv
+import importlib
+import FreeCAD
 import Part
+import OsePiping.Backend as Backend
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
+
+# Modules and classes of the OSE features.
+FEATURE_CLASSES = [
+    ("OsePiping.FlBushing", "Bushing"),
+    ("OsePiping.FlCorner", "Corner"),
+    ("OsePiping.FlCoupling", "Coupling"),
+    ("OsePiping.FlCross", "Cross"),
+    ("OsePiping.FlElbow", "Elbow"),
+    ("OsePiping.FlSweepElbow", "SweepElbow"),
+    ("OsePiping.FlTee", "Tee"),
+]
 
 
 class Error(Exception):
@@ -43,6 +59,7 @@ def nestedObjects(parent):
     return res
 
 
+@Trace.traced("remove temporaries")
 def removePartWithChildren(document, part):
     parts = nestedObjects(part)
     # Document.removeObjects can remove multple objects, when we use
@@ -55,21 +72,107 @@ def removePartWithChildren(document, part):
     for name in names_to_remove:
         # print("Deleting temporary objects %s." % name)
         document.removeObject(name)
+    Metrics.increment(Metrics.TEMPORARIES_REMOVED, len(names_to_remove))
 
 
+def getFeatureClasses():
+    """Return the proxy classes of the OSE features.
+
+    The Fl* modules import this module, therefore they are imported on use.
+    """
+    return [getattr(importlib.import_module(module), name) for module, name in FEATURE_CLASSES]
+
+
+def isOseFeature(obj):
+    proxy = getattr(obj, "Proxy", None)
+    return any(isinstance(proxy, cls) for cls in getFeatureClasses())
+
+
+def getResultShape(part):
+    """Return the shape of a created part.
+
+    Elbows in the parts output type are groups. The resulting cut is the last object of the group.
+    """
+    if not hasattr(part, "Shape") and hasattr(part, "Group"):
+        part = part.Group[-1]
+    return part.Shape
+
+
+@Trace.traced("to solid")
 def toSolid(document, part, name):
     """Convert object to a solid.
 
     These are commands, which FreeCAD runs when a user converts a part to a solid.
     """
-    s = part.Shape.Faces
-    s = Part.Solid(Part.Shell(s))
+    return addSolid(document, part.Shape, name)
+
+
+def makeSolid(shape):
+    """Return a solid bounded by the faces of the shape."""
+    return Part.Solid(Part.Shell(shape.Faces))
+
+
+def addSolid(document, shape, name):
+    """Add a shape as a solid to the document."""
+    s = makeSolid(shape)
     o = document.addObject("Part::Feature", name)
     o.Label = name
     o.Shape = s
     return o
 
 
+def floatValue(value):
+    """Return value of a quantity in mm or in degrees. Numbers are returned unchanged."""
+    return float(getattr(value, "Value", value))
+
+
+def toVectors(points):
+    """Convert a dictionary of (x, y, z) tuples to a dictionary of FreeCAD vectors."""
+    return {name: FreeCAD.Vector(float(p[0]), float(p[1]), float(p[2])) for name, p in points.items()}
+
+
+class DimensionRecord(object):
+    """Compact record of fitting dimensions.
+
+    Subclasses list their dimensions in __slots__ and their default values in DEFAULTS.
+    Values are stored as floats: lengths in mm and angles in degrees. Quantities are
+    converted, when they are assigned. The defaults are parsed once per class, when the
+    first unset dimension is read.
+    """
+
+    __slots__ = ()
+    DEFAULTS = {}
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, floatValue(value))
+
+    def __getattr__(self, name):
+        # Python calls __getattr__ only for dimensions, which were not set.
+        defaults = self.getDefaults()
+        if name not in defaults:
+            raise AttributeError("{} has no dimension {}.".format(type(self).__name__, name))
+        return defaults[name]
+
+    @classmethod
+    def getDefaults(cls):
+        """Return dictionary with parsed default values."""
+        if "_parsedDefaults" not in cls.__dict__:
+            cls._parsedDefaults = {name: floatValue(FreeCAD.Units.parseQuantity(text))
+                                   for name, text in cls.DEFAULTS.items()}
+        return cls._parsedDefaults
+
+    @classmethod
+    def getNames(cls):
+        """Return names of the dimensions."""
+        return cls.__slots__
+
+    def copy(self):
+        res = type(self).__new__(type(self))
+        for name in self.getNames():
+            object.__setattr__(res, name, getattr(self, name))
+        return res
+
+
 class CsvError(Error):
     """Base class for exceptions in this module."""
 
@@ -106,12 +209,13 @@ class CsvTable:
     def load(self, filename):
         """Load data from a CSV file."""
         self.hasValidData = False
+        Metrics.increment(Metrics.TABLE_LOADS)
         with open(filename, "r") as csvfile:
             csv_reader = csv.reader(csvfile, delimiter=',', quotechar='"')
             self.headers = next(csv_reader)
             # Fill the talble
             self.data = []
-            keys = []
+            keys = set()
             self._keyColumnIndex = self.headers.index(self._keyColumnName)
             for row in csv_reader:
                 # Check if the keys is unique
@@ -121,7 +225,7 @@ class CsvTable:
                         key, self._keyColumnName, filename)
                     raise CsvError(msg)
                 else:
-                    keys.append(key)
+                    keys.add(key)
                 self.data.append(row)
             csvfile.close()  # Should I close this file explicitely?
             self.hasValidData = self.hasNecessaryColumns()
@@ -182,12 +286,8 @@ def GetDnString(row):
 
 
 def HasDodoSupport():
-    import pkgutil
-    mod = pkgutil.find_loader("pFeatures")
-    return mod is not None
+    return Backend.hasDodo()
 
 
 def HasFlamingoSupport():
-    import pkgutil
-    mod = pkgutil.find_loader("pipeFeatures")
-    return mod is not None
+    return Backend.hasFlamingo()
@@ -4,6 +4,7 @@
 # Advanced Ports. Ports with normal vector and rotation references.
 
 import FreeCAD
+import OsePiping.Metrics as Metrics
 
 
 class AdvancedPort:
@@ -99,26 +100,136 @@ def _guessPipeAdvancedPorts(part):
     return [port_bottom, port_top]
 
 
-def _extractAdvancedPorts(part):
-    """Extract advanced ports from a FeaturePython part."""
+def advancedPortsFromData(ports, rotationAngles):
+    """Create advanced ports from port positions and port rotation angles (yaw, pitch, roll)."""
     res = []
-    for i in range(0, len(part.Ports)):
-        rotation_angles = part.PortRotationAngles[i]
+    for i in range(0, len(ports)):
+        rotation_angles = rotationAngles[i]
         rotation = FreeCAD.Rotation(
             rotation_angles.x, rotation_angles.y, rotation_angles.z)
         port = AdvancedPort(base=FreeCAD.Vector(
-            part.Ports[i]), rotation=rotation)
+            ports[i]), rotation=rotation)
         res.append(port)
     return res
 
 
-def extractAdvancedPorts(part):
+def _extractAdvancedPorts(part):
+    """Extract advanced ports from a FeaturePython part."""
+    return advancedPortsFromData(part.Ports, part.PortRotationAngles)
+
+
+def _computeAdvancedPorts(part):
     if part.PType == u"Pipe":
         return _guessPipeAdvancedPorts(part)
     else:
         return _extractAdvancedPorts(part)
 
 
+# Changes of these properties invalidate cached port frames.
+PORT_FRAME_PROPERTIES = ["Placement", "Ports", "PortRotationAngles"]
+
+
+class PortFrameCache:
+    """Cache advanced ports of document objects.
+
+    Local port frames depend on "Ports" and "PortRotationAngles" only. Global port frames
+    depend also on "Placement". The cache is invalidated by PortFrameCacheObserver, when
+    one of these properties changes.
+    The cached AdvancedPort objects are shared, do not modify them.
+    """
+
+    def __init__(self):
+        # Map (document name, object name) to the list of local advanced ports.
+        self._local = {}
+        # Map (document name, object name) to the list of global advanced ports.
+        self._global = {}
+
+    @staticmethod
+    def _key(part):
+        return (part.Document.Name, part.Name)
+
+    def getPorts(self, part):
+        """Return advanced ports of the part in the coordinates of the part."""
+        key = self._key(part)
+        ports = self._local.get(key)
+        Metrics.countLookup(Metrics.PORT_FRAME_CACHE, ports is not None)
+        if ports is None:
+            ports = _computeAdvancedPorts(part)
+            self._local[key] = ports
+        return ports
+
+    def getGlobalPorts(self, part):
+        """Return advanced ports of the part in the global coordinates."""
+        key = self._key(part)
+        ports = self._global.get(key)
+        Metrics.countLookup(Metrics.PORT_FRAME_CACHE, ports is not None)
+        if ports is None:
+            placement = part.Placement
+            ports = []
+            for port in self.getPorts(part):
+                ports.append(AdvancedPort(placement.multVec(port.placement.Base),
+                                          placement.Rotation.multiply(port.placement.Rotation)))
+            self._global[key] = ports
+        return ports
+
+    def invalidate(self, part, prop=None):
+        """Forget cached ports of the part. If prop is "Placement", forget only global ports."""
+        key = self._key(part)
+        self.invalidateKey(key, globalOnly=(prop == "Placement"))
+
+    def invalidateKey(self, key, globalOnly=False):
+        self._global.pop(key, None)
+        if not globalOnly:
+            self._local.pop(key, None)
+
+    def invalidateDocument(self, documentName):
+        for cache in [self._local, self._global]:
+            for key in [k for k in cache.keys() if k[0] == documentName]:
+                del cache[key]
+
+    def clear(self):
+        self._local = {}
+        self._global = {}
+
+
+class PortFrameCacheObserver:
+    """Document observer which invalidates a PortFrameCache."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def slotChangedObject(self, obj, prop):
+        if prop in PORT_FRAME_PROPERTIES:
+            self.cache.invalidate(obj, prop)
+
+    def slotDeletedObject(self, obj):
+        self.cache.invalidate(obj)
+
+    def slotDeletedDocument(self, document):
+        self.cache.invalidateDocument(document.Name)
+
+
+_portFrameCache = None
+
+
+def getPortFrameCache():
+    """Return the port frame cache shared by snapping, connectivity and export code."""
+    global _portFrameCache
+    if _portFrameCache is None:
+        _portFrameCache = PortFrameCache()
+        FreeCAD.addDocumentObserver(PortFrameCacheObserver(_portFrameCache))
+    return _portFrameCache
+
+
+def extractAdvancedPorts(part):
+    return list(getPortFrameCache().getPorts(part))
+
+
+def extractGlobalAdvancedPorts(part):
+    """Return advanced ports of the part with placements in the global coordinates."""
+    return list(getPortFrameCache().getGlobalPorts(part))
+
+
 def getNearestPort(part_placement, ports, point):
     d_so_far = float("inf")
     closest_port = None
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Port positions and port rotation angles of every catalog row. They are compiled
+# from the dimension tables into a sidecar file next to the table, for example
+# tables/tee.ports.json. Placement and routing can use them without building any geometry.
+#
+# Compile the port files of all fitting types ahead of time, for example when packaging
+# the workbench, with FreeCADCmd:
+#
+#   FreeCADCmd -c "import OsePiping.PortCatalog as P; P.main([])"
+#
+# The repository does not contain port files, because compiling them needs FreeCAD.
+# They are generated on the first use instead: if the port file of a fitting type is
+# missing or the table has changed, the first lookup compiles the whole table and writes
+# the port file. Later sessions read it. If the tables directory is not writable, the
+# ports are kept in memory for the session and compiled again in the next one.
+#
+# Pipes have no port files. Their ports depend on the pipe length, which is not in the table.
+
+import hashlib
+import json
+import os
+import FreeCAD
+import OsePiping.Catalog as Catalog
+import OsePiping.Piping as Piping
+import OsePiping.Port as Port
+
+SIDECAR_SUFFIX = ".ports.json"
+PIPE = "pipe"
+
+
+class PortCatalogError(Piping.Error):
+    """Exception raised when ports of a fitting type cannot be cataloged."""
+
+    def __init__(self, message):
+        super(PortCatalogError, self).__init__(message)
+
+
+def getSidecarPath(fittingType):
+    """Return path of the port file of the fitting type."""
+    return os.path.splitext(fittingType.getTablePath())[0] + SIDECAR_SUFFIX
+
+
+def getTableHash(fittingType):
+    """Return hash of the table content. It is used to detect stale port files."""
+    with open(fittingType.getTablePath(), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def computePortData(fittingType, row):
+    """Compute ports of a table row. Return pair (ports, rotationAngles) of lists with float triples."""
+    params = Catalog.ShapeParameters(fittingType.getDimensions(row))
+    fl_class = fittingType.getFlClass()
+    ports = [(v.x, v.y, v.z) for v in fl_class.getPorts(params)]
+    angles = [(v.x, v.y, v.z) for v in fl_class.getPortRotationAngles(params)]
+    return (ports, angles)
+
+
+def computeCatalogData(fittingType):
+    """Compute ports of all rows of the fitting type. Return the content of the port file."""
+    table = fittingType.loadTable()
+    parts = {}
+    for i in range(0, len(table.data)):
+        row = dict(zip(table.headers, table.data[i]))
+        ports, angles = computePortData(fittingType, row)
+        parts[table.getPartKey(i)] = {"ports": ports, "rotationAngles": angles}
+    return {"table": os.path.basename(fittingType.getTablePath()),
+            "tableHash": getTableHash(fittingType),
+            "parts": parts}
+
+
+def writeSidecar(fittingType, data):
+    with open(getSidecarPath(fittingType), "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def compilePorts(fittingType):
+    """Compute ports of all rows of the fitting type and write them to the port file.
+
+    Return number of rows.
+    """
+    data = computeCatalogData(fittingType)
+    writeSidecar(fittingType, data)
+    return len(data["parts"])
+
+
+class PortCatalog:
+    """Ports of all parts of one fitting type.
+
+    Ports are read from the port file. If the port file is missing or stale, the table
+    is compiled and the port file is written. If the compilation fails, the ports are
+    computed on demand and remembered.
+    """
+
+    def __init__(self, fittingType):
+        self.fittingType = fittingType
+        self.table = None
+        # True if the ports of all rows were read from an up to date port file or compiled.
+        self._compiled = False
+        self._parts = self._loadSidecar()
+        if not self._compiled:
+            self._parts = self._compile()
+
+    def _compile(self):
+        try:
+            data = computeCatalogData(self.fittingType)
+        except Exception as e:
+            FreeCAD.Console.PrintWarning("Cannot compile ports of {}: {}. Ports are computed on demand.\n".format(
+                self.fittingType.name, e))
+            return {}
+        self._compiled = True
+        try:
+            writeSidecar(self.fittingType, data)
+        except (IOError, OSError) as e:
+            FreeCAD.Console.PrintLog("Cannot write port file {}: {}\n".format(getSidecarPath(self.fittingType), e))
+        return data["parts"]
+
+    def _loadSidecar(self):
+        path = getSidecarPath(self.fittingType)
+        if not os.path.isfile(path):
+            return {}
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("tableHash") != getTableHash(self.fittingType):
+            FreeCAD.Console.PrintLog("Port file {} is stale. It is compiled again.\n".format(path))
+            return {}
+        self._compiled = True
+        return data["parts"]
+
+    def isCompiled(self):
+        """Return True if the ports of all rows were read from an up to date port file or compiled."""
+        return self._compiled
+
+    def getPortData(self, partNumber):
+        """Return pair (ports, rotationAngles) of lists with float triples."""
+        entry = self._parts.get(partNumber)
+        if entry is None:
+            if self.table is None:
+                self.table = self.fittingType.loadTable()
+            row = self.table.findPart(partNumber)
+            if row is None:
+                raise KeyError("Part {} not found in {}.".format(partNumber, self.fittingType.getTablePath()))
+            ports, angles = computePortData(self.fittingType, row)
+            entry = {"ports": ports, "rotationAngles": angles}
+            self._parts[partNumber] = entry
+        return (entry["ports"], entry["rotationAngles"])
+
+    def getAdvancedPorts(self, partNumber):
+        """Return list of AdvancedPort of the part in the local coordinates of the part."""
+        ports, angles = self.getPortData(partNumber)
+        return Port.advancedPortsFromData([FreeCAD.Vector(p) for p in ports],
+                                          [FreeCAD.Vector(a) for a in angles])
+
+    def getPartPlacement(self, partNumber, portIndex, otherPlacement, otherPort):
+        """Return placement of the part, such that its port portIndex is connected to otherPort.
+
+        :param otherPlacement: placement of the other part.
+        :param otherPort: AdvancedPort of the other part in its local coordinates.
+        """
+        port = self.getAdvancedPorts(partNumber)[portIndex]
+        return port.getPartPlacement(otherPlacement, otherPort)
+
+
+_catalogs = {}
+
+
+def getPortCatalog(name):
+    """Return PortCatalog of the fitting type with the name, for example "tee"."""
+    if name == PIPE:
+        raise PortCatalogError("Pipes have no port catalog. Their ports depend on the pipe length.")
+    if name not in _catalogs:
+        _catalogs[name] = PortCatalog(Catalog.getFittingType(name))
+    return _catalogs[name]
+
+
+def main(argv):
+    """Compile port files of the fitting types in argv, or of all fitting types."""
+    names = argv
+    if len(names) == 0:
+        # Pipe ports depend on the pipe length, which is not in the table.
+        names = [name for name in Catalog.getFittingTypeNames() if name != PIPE]
+    if PIPE in names:
+        print("Pipes have no port files. Their ports depend on the pipe length.")
+        return 2
+    for name in names:
+        fitting_type = Catalog.getFittingType(name)
+        count = compilePorts(fitting_type)
+        print("{}: {} rows -> {}".format(name, count, getSidecarPath(fitting_type)))
+        _catalogs.pop(name, None)
+    return 0
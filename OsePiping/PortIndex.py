@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Document-level spatial index of ports. Ports are stored in world coordinates
+# in a uniform grid, such that nearest-port and radius queries do not need
+# to scan all the objects of the document.
+
+import math
+import FreeCAD
+import OsePiping.Port as Port
+
+# Default edge length of a grid cell in mm. It should be of the same order as
+# the typical distance between ports of a fitting.
+DEFAULT_CELL_SIZE = 50.0
+# Two ports closer than this distance (in mm) are considered as connected.
+DEFAULT_TOLERANCE = 0.01
+
+# Properties which change world positions of the ports.
+PORT_PROPERTIES = ["Placement", "Ports", "PortRotationAngles"]
+
+
+class PortEntry:
+    """A port of a document object in world coordinates."""
+
+    def __init__(self, objName, portIndex, position, normal):
+        self.objName = objName
+        self.portIndex = portIndex
+        # Position and normal are tuples of floats. The normal is None,
+        # if the object does not support advanced ports.
+        self.position = position
+        self.normal = normal
+
+    def getPosition(self):
+        return FreeCAD.Vector(*self.position)
+
+    def getNormal(self):
+        if self.normal is None:
+            return None
+        return FreeCAD.Vector(*self.normal)
+
+    def __repr__(self):
+        return "PortEntry(%s, %d, %s)" % (self.objName, self.portIndex, self.position)
+
+
+def hasPorts(obj):
+    """Check if the object is an OSE, Dodo or Flamingo part with ports."""
+    return hasattr(obj, "PType") and hasattr(obj, "Ports") and hasattr(obj, "Placement")
+
+
+def _toTuple(v):
+    return (float(v.x), float(v.y), float(v.z))
+
+
+def _distance2(a, b):
+    return (a[0] - b[0])**2 + (a[1] - b[1])**2 + (a[2] - b[2])**2
+
+
+def extractPortEntries(obj):
+    """Return a list of PortEntry objects of the object in world coordinates."""
+    entries = []
+    if Port.supportsAdvancedPort(obj):
+        for i, port in enumerate(Port.extractGlobalAdvancedPorts(obj)):
+            entries.append(PortEntry(obj.Name, i, _toTuple(port.placement.Base), _toTuple(port.getNormal())))
+    else:
+        placement = obj.Placement
+        for i, local in enumerate(obj.Ports):
+            position = placement.multVec(FreeCAD.Vector(local))
+            entries.append(PortEntry(obj.Name, i, _toTuple(position), None))
+    return entries
+
+
+class PortIndex:
+    """Uniform grid of all the ports in a document.
+
+    Each grid cell stores the ports whose positions are inside the cell. For evenly distributed
+    ports the nearest-port and radius queries look only in a few cells around the query point.
+    """
+
+    def __init__(self, cellSize=DEFAULT_CELL_SIZE, tolerance=DEFAULT_TOLERANCE):
+        self.cellSize = float(cellSize)
+        self.tolerance = tolerance
+        self._cells = {}
+        # Map object name to the list of its PortEntry.
+        self._entries = {}
+        # Bounds of the occupied cells. After a removal they are recomputed on the next query.
+        self._lowKey = None
+        self._highKey = None
+        self._boundsValid = True
+
+    def cellKey(self, position):
+        s = self.cellSize
+        return (int(math.floor(position[0] / s)), int(math.floor(position[1] / s)),
+                int(math.floor(position[2] / s)))
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def clear(self):
+        self._cells = {}
+        self._entries = {}
+        self._lowKey = None
+        self._highKey = None
+        self._boundsValid = True
+
+    def build(self, document):
+        """Index all parts with ports in the document."""
+        self.clear()
+        for obj in document.Objects:
+            self.addObject(obj)
+
+    def addObject(self, obj):
+        if not hasPorts(obj):
+            return
+        try:
+            entries = extractPortEntries(obj)
+        except Exception as e:
+            # The object may be still under construction.
+            FreeCAD.Console.PrintLog("Cannot index ports of {}: {}\n".format(obj.Name, e))
+            return
+        self._entries[obj.Name] = entries
+        for entry in entries:
+            key = self.cellKey(entry.position)
+            self._cells.setdefault(key, []).append(entry)
+            if not self._boundsValid:
+                continue
+            if self._lowKey is None:
+                self._lowKey = key
+                self._highKey = key
+            else:
+                self._lowKey = tuple(min(a, b) for a, b in zip(self._lowKey, key))
+                self._highKey = tuple(max(a, b) for a, b in zip(self._highKey, key))
+
+    def removeObject(self, objName):
+        entries = self._entries.pop(objName, [])
+        for entry in entries:
+            key = self.cellKey(entry.position)
+            cell = self._cells.get(key)
+            if cell is None:
+                continue
+            cell.remove(entry)
+            if len(cell) == 0:
+                del self._cells[key]
+                self._boundsValid = False
+
+    def updateObject(self, obj):
+        self.removeObject(obj.Name)
+        self.addObject(obj)
+
+    def getEntries(self, objName):
+        return list(self._entries.get(objName, []))
+
+    def getObjectNames(self):
+        return list(self._entries.keys())
+
+    def hasObject(self, objName):
+        return objName in self._entries
+
+    def _getBounds(self):
+        """Return the pair (low, high) of cell keys of the occupied cells."""
+        if not self._boundsValid:
+            keys = list(self._cells.keys())
+            if len(keys) == 0:
+                self._lowKey = None
+                self._highKey = None
+            else:
+                self._lowKey = tuple(min(k[i] for k in keys) for i in range(0, 3))
+                self._highKey = tuple(max(k[i] for k in keys) for i in range(0, 3))
+            self._boundsValid = True
+        return (self._lowKey, self._highKey)
+
+    def _entriesInShell(self, center, shell, low, high):
+        """Yield entries in the cells with the Chebyshev distance shell to the center cell.
+
+        Only the faces of the shell inside the bounds low, high are visited.
+        """
+        cx, cy, cz = center
+        z_low = max(cz - shell, low[2])
+        z_high = min(cz + shell, high[2])
+        # z of the top and bottom faces, which are inside the bounds.
+        z_faces = [z for z in set([cz - shell, cz + shell]) if low[2] <= z <= high[2]]
+        for x in range(max(cx - shell, low[0]), min(cx + shell, high[0]) + 1):
+            for y in range(max(cy - shell, low[1]), min(cy + shell, high[1]) + 1):
+                if abs(x - cx) == shell or abs(y - cy) == shell:
+                    zs = range(z_low, z_high + 1)
+                else:
+                    zs = z_faces
+                for z in zs:
+                    cell = self._cells.get((x, y, z))
+                    if cell is not None:
+                        for entry in cell:
+                            yield entry
+
+    def _entriesOutside(self, center, shell):
+        """Yield entries in all cells with the Chebyshev distance at least shell to the center cell."""
+        for key, cell in self._cells.items():
+            if max(abs(k - c) for k, c in zip(key, center)) >= shell:
+                for entry in cell:
+                    yield entry
+
+    def portsWithinRadius(self, point, radius, exclude=None):
+        """Return all ports with distance to the point not larger than radius.
+
+        :param point: FreeCAD.Vector in world coordinates.
+        :param exclude: name of an object whose ports are ignored.
+        :return: list of pairs (distance, PortEntry) sorted by distance.
+        """
+        p = _toTuple(point)
+        low = self.cellKey((p[0] - radius, p[1] - radius, p[2] - radius))
+        high = self.cellKey((p[0] + radius, p[1] + radius, p[2] + radius))
+        r2 = radius * radius
+        res = []
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    for entry in self._cells.get((x, y, z), []):
+                        if entry.objName == exclude:
+                            continue
+                        d2 = _distance2(entry.position, p)
+                        if d2 <= r2:
+                            res.append((math.sqrt(d2), entry))
+        res.sort(key=lambda item: item[0])
+        return res
+
+    def isFree(self, entry):
+        """Check if no port of another object coincides with this port."""
+        return len(self.portsWithinRadius(FreeCAD.Vector(*entry.position),
+                                          self.tolerance, exclude=entry.objName)) == 0
+
+    def nearestPort(self, point, freeOnly=False, exclude=None, maxDistance=float("inf")):
+        """Return the pair (distance, PortEntry) of the nearest port or None.
+
+        The search visits the grid cells in growing shells around the point and stops
+        as soon as no unvisited cell can contain a closer port. Shells start at the bounds
+        of the occupied cells. If a shell has more cells than the index has occupied cells,
+        the remaining occupied cells are scanned directly.
+        """
+        if len(self._cells) == 0:
+            return None
+        p = _toTuple(point)
+        center = self.cellKey(p)
+        low, high = self._getBounds()
+        # Shells smaller than the first one do not touch the occupied cells,
+        # shells larger than the last one cannot contain any port.
+        first_shell = max(max(a - c, c - b, 0) for a, b, c in zip(low, high, center))
+        max_shell = max(max(abs(a - c), abs(b - c)) for a, b, c in zip(low, high, center))
+        best = None
+        best_d2 = maxDistance * maxDistance
+        for shell in range(first_shell, max_shell + 1):
+            # All points in the shell are at least (shell-1)*cellSize away.
+            if best is not None and ((shell - 1) * self.cellSize)**2 > best_d2:
+                break
+            if (shell - 1) * self.cellSize > maxDistance:
+                break
+            scan_all = 6 * (2 * shell + 1)**2 > len(self._cells)
+            if scan_all:
+                entries = self._entriesOutside(center, shell)
+            else:
+                entries = self._entriesInShell(center, shell, low, high)
+            for entry in entries:
+                if entry.objName == exclude:
+                    continue
+                d2 = _distance2(entry.position, p)
+                if d2 <= best_d2 and (best is None or d2 < best_d2):
+                    if freeOnly and not self.isFree(entry):
+                        continue
+                    best = entry
+                    best_d2 = d2
+            if scan_all:
+                break
+        if best is None:
+            return None
+        return (math.sqrt(best_d2), best)
+
+    def nearestPortToRay(self, origin, direction, maxDistance, radius=None, freeOnly=False, exclude=None):
+        """Return the pair (distance along the ray, PortEntry) of the first port hit by a ray or None.
+
+        A port is hit if its distance to the ray is not larger than radius. The grid cells along
+        the ray are visited until maxDistance.
+        """
+        if radius is None:
+            radius = self.cellSize / 2.0
+        o = _toTuple(origin)
+        d = _toTuple(direction)
+        length = math.sqrt(d[0]**2 + d[1]**2 + d[2]**2)
+        if length == 0:
+            raise ValueError("The direction of the ray must not be a zero vector.")
+        d = (d[0] / length, d[1] / length, d[2] / length)
+        step = self.cellSize / 2.0
+        visited = set()
+        best = None
+        best_t = float("inf")
+        t = 0.0
+        while t <= maxDistance + step and t <= best_t + radius:
+            q = (o[0] + d[0] * t, o[1] + d[1] * t, o[2] + d[2] * t)
+            for _, entry in self.portsWithinRadius(FreeCAD.Vector(*q), radius + step, exclude=exclude):
+                if id(entry) in visited:
+                    continue
+                visited.add(id(entry))
+                v = (entry.position[0] - o[0], entry.position[1] - o[1], entry.position[2] - o[2])
+                along = v[0] * d[0] + v[1] * d[1] + v[2] * d[2]
+                if along < 0 or along > maxDistance:
+                    continue
+                off2 = v[0]**2 + v[1]**2 + v[2]**2 - along**2
+                if off2 > radius * radius or along >= best_t:
+                    continue
+                if freeOnly and not self.isFree(entry):
+                    continue
+                best = entry
+                best_t = along
+            t += step
+        if best is None:
+            return None
+        return (best_t, best)
+
+
+class PortIndexObserver:
+    """Keep port indices of all documents up to date.
+
+    Register it with FreeCAD.addDocumentObserver.
+    """
+
+    def __init__(self):
+        self.indices = {}
+
+    def getIndex(self, document):
+        index = self.indices.get(document.Name)
+        if index is None:
+            index = PortIndex()
+            index.build(document)
+            self.indices[document.Name] = index
+        return index
+
+    def slotChangedObject(self, obj, prop):
+        if prop not in PORT_PROPERTIES:
+            return
+        index = self.indices.get(obj.Document.Name)
+        if index is not None:
+            # The observer of the port frame cache may be called after this one.
+            Port.getPortFrameCache().invalidate(obj, prop)
+            index.updateObject(obj)
+
+    def slotDeletedObject(self, obj):
+        index = self.indices.get(obj.Document.Name)
+        if index is not None:
+            index.removeObject(obj.Name)
+
+    def slotDeletedDocument(self, document):
+        self.indices.pop(document.Name, None)
+
+
+_observer = None
+
+
+def getIndex(document):
+    """Return the port index of the document. The index is kept up to date automatically."""
+    global _observer
+    if _observer is None:
+        _observer = PortIndexObserver()
+        FreeCAD.addDocumentObserver(_observer)
+    return _observer.getIndex(document)
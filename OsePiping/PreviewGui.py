@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Small preview of a catalog part. The shape is built and coarsely tessellated
+# in a worker process, and drawn as flat shaded triangles in an isometric view.
+
+import collections
+import math
+from PySide import QtCore, QtGui
+import OsePiping.Catalog as Catalog
+import OsePiping.ShapeJobs as ShapeJobs
+import OsePiping.Metrics as Metrics
+
+# Maximal deviation of the tessellation from the real shape in mm. The preview is small,
+# so a coarse tessellation is enough.
+PREVIEW_DEFLECTION = 1.0
+# Number of tessellated parts kept in memory.
+PREVIEW_CACHE_SIZE = 64
+# Direction to the light source.
+LIGHT_DIRECTION = (0.3, 0.5, 0.8)
+
+
+def createPreviewMesh(fittingType, row, deflection=PREVIEW_DEFLECTION):
+    """Build and tessellate a part. Return pair (points, triangles) with points as tuples of floats."""
+    shape = fittingType.createShapeFromRow(row)
+    points, triangles = shape.tessellate(deflection)
+    return ([(p.x, p.y, p.z) for p in points], [tuple(t) for t in triangles])
+
+
+def _normalize(v):
+    length = math.sqrt(v[0]**2 + v[1]**2 + v[2]**2)
+    if length == 0:
+        return (0.0, 0.0, 0.0)
+    return (v[0] / length, v[1] / length, v[2] / length)
+
+
+def _isometric(p):
+    """Project a point to the screen. Return (x, y, depth).
+
+    The view is the isometric view of FreeCAD: the camera looks from (1, 1, 1) to the origin,
+    x points to the lower left, y to the lower right and z up. The screen y axis points down.
+    Greater depth is closer to the camera.
+    """
+    # Screen right is (-1, 1, 0) / sqrt(2), screen up is (-1, -1, 2) / sqrt(6).
+    # Their cross product is the direction to the camera, thus the projection is not mirrored.
+    x = (p[1] - p[0]) / math.sqrt(2)
+    y = (p[0] + p[1] - 2 * p[2]) / math.sqrt(6)
+    depth = (p[0] + p[1] + p[2]) / math.sqrt(3)
+    return (x, y, depth)
+
+
+class PartPreviewWidget(QtGui.QLabel):
+    """Show a preview of a catalog part. Meshes are cached by part number."""
+
+    def __init__(self, catalogName, parent=None):
+        super(PartPreviewWidget, self).__init__(parent)
+        self.fittingType = Catalog.getFittingType(catalogName)
+        self.setMinimumSize(QtCore.QSize(200, 200))
+        self.setAlignment(QtCore.Qt.AlignCenter)
+        self.setFrameShape(QtGui.QFrame.StyledPanel)
+        self._cache = collections.OrderedDict()
+        # The runner is created on the first request and stopped, when the dialog is closed.
+        self._runner = None
+        self._requested = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self._collectMeshes)
+
+    def showPart(self, partNumber, row):
+        """Show the part. If it is not in the cache, build it in the background."""
+        self._requested = partNumber
+        if partNumber is None or row is None:
+            self.clear()
+            return
+        mesh = self._cache.get(partNumber)
+        Metrics.countLookup(Metrics.PREVIEW_CACHE, mesh is not None)
+        if mesh is not None:
+            self._cache.move_to_end(partNumber)
+            self._draw(mesh)
+            return
+        self.setText("Building preview...")
+        if self._runner is None:
+            self._runner = ShapeJobs.JobRunner(maxWorkers=1)
+        # Skip parts, which the user has scrolled past while they were waiting in the queue.
+        self._runner.cancelWaiting()
+        self._runner.submit([ShapeJobs.ShapeJob(partNumber, createPreviewMesh, self.fittingType, row)])
+        self._timer.start()
+
+    def clearCache(self):
+        self._cache.clear()
+
+    def shutdown(self):
+        """Stop the worker. The cache is kept, a later request starts a new worker."""
+        self._timer.stop()
+        if self._runner is not None:
+            self._runner.shutdown()
+            self._runner = None
+        self._requested = None
+
+    def _collectMeshes(self):
+        if self._runner is None:
+            self._timer.stop()
+            return
+        for result in self._runner.takeFinished():
+            if result.shape is None and result.error is None:
+                continue
+            if result.error is not None:
+                if result.key == self._requested:
+                    self.setText("No preview: {}".format(result.error))
+                continue
+            self._cache[result.key] = result.shape
+            while len(self._cache) > PREVIEW_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            if result.key == self._requested:
+                self._draw(result.shape)
+        if not self._runner.hasPendingResults():
+            self._timer.stop()
+
+    def _draw(self, mesh):
+        points, triangles = mesh
+        if len(triangles) == 0:
+            self.clear()
+            return
+        projected = [_isometric(p) for p in points]
+        xs = [p[0] for p in projected]
+        ys = [p[1] for p in projected]
+        size = max(max(xs) - min(xs), max(ys) - min(ys))
+        if size == 0:
+            size = 1
+        width = self.width() - 10
+        height = self.height() - 10
+        scale = min(width, height) / size
+        cx = (max(xs) + min(xs)) / 2
+        cy = (max(ys) + min(ys)) / 2
+        light = _normalize(LIGHT_DIRECTION)
+
+        pixmap = QtGui.QPixmap(self.width(), self.height())
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        # Painter's algorithm: draw far triangles first.
+        faces = sorted(triangles, key=lambda t: sum(projected[i][2] for i in t))
+        for t in faces:
+            a, b, c = [points[i] for i in t]
+            u = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+            v = (c[0] - a[0], c[1] - a[1], c[2] - a[2])
+            n = _normalize((u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]))
+            shade = abs(n[0] * light[0] + n[1] * light[1] + n[2] * light[2])
+            gray = int(80 + 150 * shade)
+            painter.setBrush(QtGui.QColor(gray, gray, int(gray * 0.9)))
+            polygon = QtGui.QPolygonF([QtCore.QPointF(self.width() / 2 + (projected[i][0] - cx) * scale,
+                                                      self.height() / 2 + (projected[i][1] - cy) * scale)
+                                       for i in t])
+            painter.drawPolygon(polygon)
+        painter.end()
+        self.setPixmap(pixmap)
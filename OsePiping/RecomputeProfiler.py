@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Measure the time of execute() of every OSE feature during a document recompute.
+# The execute methods of the Fl* classes are wrapped only while the profiler runs.
+
+import csv
+import time
+import OsePiping.Piping as Piping
+
+CSV_HEADERS = ["Name", "Label", "PType", "PartNumber", "Seconds"]
+
+
+class ExecuteRecord:
+    """Time of one execute() call."""
+
+    def __init__(self, name, label, pType, partNumber, seconds):
+        self.name = name
+        self.label = label
+        self.pType = pType
+        self.partNumber = partNumber
+        self.seconds = seconds
+
+
+class RecomputeProfiler:
+    def __init__(self):
+        self.records = []
+        self.totalSeconds = 0.0
+        self._originals = {}
+
+    def _wrap(self, cls):
+        original = cls.__dict__["execute"]
+        records = self.records
+
+        def execute(proxy, obj):
+            start = time.perf_counter()
+            try:
+                return original(proxy, obj)
+            finally:
+                records.append(ExecuteRecord(obj.Name, obj.Label, getattr(obj, "PType", ""),
+                                             getattr(obj, "PartNumber", ""), time.perf_counter() - start))
+        self._originals[cls] = original
+        cls.execute = execute
+
+    def install(self):
+        """Wrap execute() of all OSE feature classes."""
+        for cls in Piping.getFeatureClasses():
+            if cls not in self._originals:
+                self._wrap(cls)
+
+    def uninstall(self):
+        """Restore the original execute() methods."""
+        for cls, original in self._originals.items():
+            cls.execute = original
+        self._originals = {}
+
+    def profile(self, document):
+        """Touch all OSE features of the document, recompute it and record execute() times.
+
+        Return the time of the whole recompute in seconds.
+        """
+        del self.records[:]
+        self.install()
+        try:
+            for obj in document.Objects:
+                if Piping.isOseFeature(obj):
+                    obj.touch()
+            start = time.perf_counter()
+            document.recompute()
+            self.totalSeconds = time.perf_counter() - start
+        finally:
+            self.uninstall()
+        return self.totalSeconds
+
+    def aggregate(self, attribute):
+        """Aggregate records by the record attribute, for example "pType" or "partNumber".
+
+        Return list of tuples (value, count, total seconds, maximal seconds), the slowest first.
+        """
+        groups = {}
+        for record in self.records:
+            key = getattr(record, attribute)
+            count, total, maximum = groups.get(key, (0, 0.0, 0.0))
+            groups[key] = (count + 1, total + record.seconds, max(maximum, record.seconds))
+        res = [(key, v[0], v[1], v[2]) for key, v in groups.items()]
+        res.sort(key=lambda r: r[2], reverse=True)
+        return res
+
+    def getSlowest(self, count):
+        """Return count slowest execute() calls."""
+        return sorted(self.records, key=lambda r: r.seconds, reverse=True)[0:count]
+
+    def writeCsv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            for r in self.records:
+                writer.writerow([r.name, r.label, r.pType, r.partNumber, "{:.6f}".format(r.seconds)])
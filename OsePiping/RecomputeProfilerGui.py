@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Report panel of the recompute profiler. It shows the slowest OSE features of the
+# active document, grouped by PType and by PartNumber, and exports all timings as CSV.
+
+from PySide import QtCore, QtGui
+import FreeCAD
+import OsePiping.RecomputeProfiler as RecomputeProfiler
+
+# Number of rows shown in every table.
+TOP_COUNT = 20
+
+
+class ReportDialog(QtGui.QDialog):
+    def __init__(self, document, parent=None):
+        super(ReportDialog, self).__init__(parent)
+        self.document = document
+        self.profiler = RecomputeProfiler.RecomputeProfiler()
+        self.setWindowTitle("OSE Piping recompute profile")
+        self.resize(640, 600)
+        layout = QtGui.QVBoxLayout(self)
+        self.labelTotal = QtGui.QLabel(self)
+        layout.addWidget(self.labelTotal)
+        self.tabs = QtGui.QTabWidget(self)
+        layout.addWidget(self.tabs)
+        self.tableType = self.addTable("By PType", ["PType", "Count", "Total s", "Max s"])
+        self.tablePartNumber = self.addTable("By PartNumber", ["PartNumber", "Count", "Total s", "Max s"])
+        self.tableFeature = self.addTable("Features", ["Label", "PType", "PartNumber", "Seconds"])
+        buttons = QtGui.QHBoxLayout()
+        self.buttonRun = QtGui.QPushButton("Profile again", self)
+        self.buttonRun.clicked.connect(self.run)
+        self.buttonExport = QtGui.QPushButton("Export CSV...", self)
+        self.buttonExport.clicked.connect(self.exportCsv)
+        self.buttonClose = QtGui.QPushButton("Close", self)
+        self.buttonClose.clicked.connect(self.accept)
+        buttons.addWidget(self.buttonRun)
+        buttons.addWidget(self.buttonExport)
+        buttons.addStretch()
+        buttons.addWidget(self.buttonClose)
+        layout.addLayout(buttons)
+
+    def addTable(self, title, headers):
+        table = QtGui.QTableWidget(0, len(headers), self)
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self.tabs.addTab(table, title)
+        return table
+
+    @staticmethod
+    def fillTable(table, rows):
+        table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                text = "{:.4f}".format(value) if isinstance(value, float) else str(value)
+                table.setItem(i, j, QtGui.QTableWidgetItem(text))
+        table.resizeColumnsToContents()
+
+    def run(self):
+        QtGui.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.WaitCursor))
+        try:
+            total = self.profiler.profile(self.document)
+        finally:
+            QtGui.QApplication.restoreOverrideCursor()
+        features = sum(r.seconds for r in self.profiler.records)
+        self.labelTotal.setText("Recompute {:.3f} s, {} OSE features {:.3f} s.".format(
+            total, len(self.profiler.records), features))
+        self.fillTable(self.tableType, self.profiler.aggregate("pType")[0:TOP_COUNT])
+        self.fillTable(self.tablePartNumber, self.profiler.aggregate("partNumber")[0:TOP_COUNT])
+        self.fillTable(self.tableFeature, [(r.label, r.pType, r.partNumber, r.seconds)
+                                           for r in self.profiler.getSlowest(TOP_COUNT)])
+        self.buttonExport.setEnabled(len(self.profiler.records) > 0)
+
+    def exportCsv(self):
+        filename, _ = QtGui.QFileDialog.getSaveFileName(self, "Export timings", "", "CSV files (*.csv)")
+        if not filename:
+            return
+        self.profiler.writeCsv(filename)
+        FreeCAD.Console.PrintMessage("Recompute timings written to {}.\n".format(filename))
+
+
+def showReport(document):
+    dialog = ReportDialog(document)
+    dialog.run()
+    dialog.exec_()
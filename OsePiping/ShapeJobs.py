@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Compute shapes in worker processes. Shapes are created with the Part API only and
+# sent to the GUI thread as BREP strings. The GUI thread imports them and adds them
+# to the document.
+#
+# The Part API does not release the GIL, thus only separate processes build shapes in
+# parallel with the GUI. The workers are fresh interpreters started with the "spawn"
+# method. Inside the FreeCAD GUI sys.executable is the FreeCAD executable, therefore
+# the workers use the Python interpreter of the FreeCAD installation, or the interpreter
+# in the environment variable OSE_PIPING_PYTHON. If there is no such interpreter, the
+# jobs run on threads and the GUI is responsive only between two shapes.
+#
+# Job functions and their arguments are sent to the workers with pickle. Use module
+# level functions and methods of module level classes, not methods of widgets.
+
+import collections
+import os
+import sys
+import threading
+import concurrent.futures
+import multiprocessing
+
+PYTHON_ENVIRONMENT_VARIABLE = "OSE_PIPING_PYTHON"
+PYTHON_NAMES = ["python", "python3", "python.exe"]
+
+# Kinds of results sent from the workers.
+RESULT_BREP = "brep"
+RESULT_VALUE = "value"
+
+
+def getPythonExecutable():
+    """Return path of a Python interpreter, which can import FreeCAD, or None."""
+    path = os.environ.get(PYTHON_ENVIRONMENT_VARIABLE)
+    if path:
+        return path
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    import FreeCAD
+    for name in PYTHON_NAMES:
+        path = os.path.join(FreeCAD.getHomePath(), "bin", name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _initWorker(libraryPath):
+    """Make FreeCAD importable in a worker process and start it once per worker."""
+    if libraryPath not in sys.path:
+        sys.path.append(libraryPath)
+    import FreeCAD  # noqa: F401
+    import Part  # noqa: F401
+
+
+def _runInWorker(function, args):
+    """Run a job function in a worker process. Return pair (kind, value), shapes are BREP strings."""
+    import Part
+    result = function(*args)
+    if isinstance(result, Part.Shape):
+        return (RESULT_BREP, result.exportBrepToString())
+    return (RESULT_VALUE, result)
+
+
+def _decode(result):
+    kind, value = result
+    if kind == RESULT_BREP:
+        import Part
+        shape = Part.Shape()
+        shape.importBrepFromString(value)
+        return shape
+    return value
+
+
+class ShapeJob:
+    """A function which returns a shape, and its arguments."""
+
+    def __init__(self, key, function, *args):
+        self.key = key
+        self.function = function
+        self.args = args
+
+    def run(self, cancelled):
+        if cancelled.is_set():
+            return None
+        return self.function(*self.args)
+
+
+class JobResult:
+    def __init__(self, key, shape=None, error=None):
+        self.key = key
+        self.shape = shape
+        self.error = error
+
+
+class JobRunner:
+    """Run shape jobs on a pool of worker processes.
+
+    The caller polls takeFinished() from the GUI thread, for example from a QTimer
+    or between QApplication.processEvents() calls, and inserts the shapes into the document.
+    """
+
+    def __init__(self, maxWorkers=None, useProcesses=True):
+        python = getPythonExecutable() if useProcesses else None
+        if python is not None:
+            import FreeCAD
+            context = multiprocessing.get_context("spawn")
+            context.set_executable(python)
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=maxWorkers, mp_context=context, initializer=_initWorker,
+                initargs=(os.path.join(FreeCAD.getHomePath(), "lib"),))
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers)
+        self.usesProcesses = python is not None
+        self._cancelled = threading.Event()
+        # Pairs (key, future) of the jobs, whose results were not taken yet.
+        self._futures = collections.deque()
+        # Number of jobs, whose results were taken or skipped.
+        self._taken = 0
+
+    def submit(self, jobs):
+        for job in jobs:
+            if self.usesProcesses:
+                future = self._executor.submit(_runInWorker, job.function, job.args)
+            else:
+                future = self._executor.submit(job.run, self._cancelled)
+            self._futures.append((job.key, future))
+
+    def cancel(self):
+        """Cancel all jobs, which are not running yet. Running jobs finish, but their results are ignored."""
+        self._cancelled.set()
+        for _, future in self._futures:
+            future.cancel()
+
+    def cancelWaiting(self):
+        """Cancel jobs, which are not running yet, for example requests which are not needed any more.
+
+        Unlike cancel() the runner accepts and runs new jobs.
+        """
+        for _, future in self._futures:
+            future.cancel()
+
+    def isCancelled(self):
+        return self._cancelled.is_set()
+
+    def jobCount(self):
+        return self._taken + len(self._futures)
+
+    def finishedCount(self):
+        return self._taken + sum(1 for _, future in self._futures if future.done())
+
+    def isDone(self):
+        return all(future.done() for _, future in self._futures)
+
+    def hasPendingResults(self):
+        """Return True while takeFinished() can return more results. A cancelled runner has no pending results."""
+        return len(self._futures) > 0 and not self.isCancelled()
+
+    def takeFinished(self):
+        """Return results of finished jobs in the order of submission.
+
+        Each result is returned only once and the runner forgets the job. The results of a job
+        are returned only when all the jobs submitted before it have finished too. Results of
+        cancelled jobs are skipped.
+        """
+        res = []
+        while len(self._futures) > 0:
+            key, future = self._futures[0]
+            if not future.done():
+                break
+            self._futures.popleft()
+            self._taken += 1
+            if future.cancelled() or self.isCancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                res.append(JobResult(key, error=error))
+            else:
+                shape = _decode(future.result()) if self.usesProcesses else future.result()
+                res.append(JobResult(key, shape=shape))
+        return res
+
+    def shutdown(self):
+        """Cancel jobs, which are not running yet, and stop the workers, when they have finished."""
+        for _, future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
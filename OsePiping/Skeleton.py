@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Skeleton of a piping network: parts are stored only as part numbers, placements and
+# port frames, connected at their ports. The port frames come from PortCatalog, thus
+# layout edits, routing and bill of materials do not need any shape. Solids are
+# created only on request, for display or export, with the Part API.
+#
+#   skeleton = Skeleton.Skeleton()
+#   tee = skeleton.addPart("tee", "T-1")
+#   pipe = skeleton.addConnected("pipe", "P-1", 0, tee.name, 1, length=500)
+#   skeleton.getBillOfMaterials()
+#   skeleton.realize(FreeCAD.ActiveDocument)
+
+import json
+import FreeCAD
+import OsePiping.Catalog as Catalog
+import OsePiping.LevelOfDetail as LevelOfDetail
+import OsePiping.Piping as Piping
+import OsePiping.Port as Port
+import OsePiping.PortCatalog as PortCatalog
+
+PIPE = "pipe"
+
+
+class SkeletonError(Piping.Error):
+    """Exception raised when the skeleton is changed in an invalid way."""
+
+    def __init__(self, message):
+        super(SkeletonError, self).__init__(message)
+
+
+def getPipePorts(length):
+    """Return local ports of a straight pipe along the z axis."""
+    return [Port.AdvancedPort(FreeCAD.Vector(0, 0, 0), FreeCAD.Rotation(0, 90, 0)),
+            Port.AdvancedPort(FreeCAD.Vector(0, 0, length), FreeCAD.Rotation(0, -90, 0))]
+
+
+class Node:
+    """A part of the network."""
+
+    __slots__ = ["name", "fittingName", "partNumber", "length", "placement", "ports", "connections"]
+
+    def __init__(self, name, fittingName, partNumber, ports, placement=None, length=None):
+        self.name = name
+        self.fittingName = fittingName
+        self.partNumber = partNumber
+        # Length of pipes in mm. None for fittings.
+        self.length = length
+        self.placement = placement if placement is not None else FreeCAD.Placement()
+        # AdvancedPort in the local coordinates of the part.
+        self.ports = ports
+        # Map port index to pair (name of the other node, port index of the other node).
+        self.connections = {}
+
+    def getGlobalPort(self, portIndex):
+        port = self.ports[portIndex]
+        return Port.AdvancedPort(self.placement.multVec(port.placement.Base),
+                                 self.placement.Rotation.multiply(port.placement.Rotation))
+
+    def getGlobalPorts(self):
+        return [self.getGlobalPort(i) for i in range(0, len(self.ports))]
+
+    def getCenter(self):
+        """Return the center of the part in global coordinates."""
+        return self.placement.multVec(LevelOfDetail.getCenter(self.ports))
+
+    def getSegments(self):
+        """Return centerline segments as pairs of global points.
+
+        A pipe is one segment between its ports. A fitting has a segment from its center
+        to every port.
+        """
+        ports = [p.placement.Base for p in self.getGlobalPorts()]
+        if self.fittingName == PIPE:
+            return [(ports[0], ports[1])]
+        center = self.getCenter()
+        return [(center, p) for p in ports]
+
+    def getOpenPorts(self):
+        return [i for i in range(0, len(self.ports)) if i not in self.connections]
+
+
+class Skeleton:
+    def __init__(self):
+        self.nodes = {}
+        self._counter = 0
+        self._tables = {}
+        # Shapes created by realize(), by (fitting name, part number, length).
+        self._shapes = {}
+
+    def _getName(self, fittingName):
+        name = None
+        while name is None or name in self.nodes:
+            self._counter += 1
+            name = "{}{:06d}".format(fittingName, self._counter)
+        return name
+
+    def _getTable(self, fittingName):
+        if fittingName not in self._tables:
+            self._tables[fittingName] = Catalog.getFittingType(fittingName).loadTable()
+        return self._tables[fittingName]
+
+    def _getPorts(self, fittingName, partNumber, length):
+        if fittingName == PIPE:
+            if length is None:
+                raise SkeletonError("Pipe {} needs a length.".format(partNumber))
+            if self._getTable(PIPE).findPart(partNumber) is None:
+                raise SkeletonError("Pipe {} not found.".format(partNumber))
+            return getPipePorts(length)
+        try:
+            return PortCatalog.getPortCatalog(fittingName).getAdvancedPorts(partNumber)
+        except KeyError as e:
+            raise SkeletonError(str(e))
+
+    def getNode(self, name):
+        node = self.nodes.get(name)
+        if node is None:
+            raise SkeletonError("Part {} is not in the skeleton.".format(name))
+        return node
+
+    def _createNode(self, fittingName, partNumber, placement, length, name):
+        try:
+            Catalog.getFittingType(fittingName)
+        except KeyError as e:
+            raise SkeletonError(e.args[0])
+        if name is None:
+            name = self._getName(fittingName)
+        if name in self.nodes:
+            raise SkeletonError("Part {} is already in the skeleton.".format(name))
+        if length is not None:
+            length = Piping.floatValue(length)
+        return Node(name, fittingName, partNumber, self._getPorts(fittingName, partNumber, length),
+                    placement, length)
+
+    @staticmethod
+    def _checkFreePort(node, portIndex):
+        if not isinstance(portIndex, int) or not 0 <= portIndex < len(node.ports):
+            raise SkeletonError("Part {} has no port {}.".format(node.name, portIndex))
+        if portIndex in node.connections:
+            raise SkeletonError("Port {} of {} is already connected.".format(portIndex, node.name))
+
+    def addPart(self, fittingName, partNumber, placement=None, length=None, name=None):
+        """Add a part. Return its node.
+
+        :param length: length of a pipe in mm. Fittings have no length.
+        """
+        node = self._createNode(fittingName, partNumber, placement, length, name)
+        self.nodes[node.name] = node
+        return node
+
+    def connect(self, name, portIndex, otherName, otherPortIndex):
+        node = self.getNode(name)
+        other = self.getNode(otherName)
+        if name == otherName:
+            raise SkeletonError("Part {} can not be connected to itself.".format(name))
+        self._checkFreePort(node, portIndex)
+        self._checkFreePort(other, otherPortIndex)
+        node.connections[portIndex] = (otherName, otherPortIndex)
+        other.connections[otherPortIndex] = (name, portIndex)
+
+    def disconnect(self, name, portIndex):
+        node = self.getNode(name)
+        if portIndex not in node.connections:
+            raise SkeletonError("Port {} of {} is not connected.".format(portIndex, name))
+        other_name, other_port_index = node.connections.pop(portIndex)
+        self.nodes[other_name].connections.pop(other_port_index, None)
+
+    def addConnected(self, fittingName, partNumber, portIndex, otherName, otherPortIndex, length=None, name=None):
+        """Add a part and connect its port portIndex to a port of an existing part. Return the new node.
+
+        The skeleton is not changed, if the part or one of the ports is invalid.
+        """
+        other = self.getNode(otherName)
+        self._checkFreePort(other, otherPortIndex)
+        node = self._createNode(fittingName, partNumber, None, length, name)
+        self._checkFreePort(node, portIndex)
+        node.placement = node.ports[portIndex].getPartPlacement(other.placement, other.ports[otherPortIndex])
+        self.nodes[node.name] = node
+        self.connect(node.name, portIndex, otherName, otherPortIndex)
+        return node
+
+    def remove(self, name):
+        node = self.getNode(name)
+        for port_index in list(node.connections.keys()):
+            self.disconnect(name, port_index)
+        del self.nodes[name]
+
+    def move(self, name, placement, fixed=None):
+        """Move the part to the placement. Return names of the moved parts.
+
+        Parts connected to it, directly or indirectly, move with it. The walk stops at the
+        parts in fixed. They keep their placement and are disconnected from the moved parts.
+        """
+        node = self.getNode(name)
+        fixed = set(fixed) if fixed is not None else set()
+        if name in fixed:
+            raise SkeletonError("Part {} can not be moved and fixed.".format(name))
+        transformation = placement.multiply(node.placement.inverse())
+        moved = self.walkRun(name, fixed)
+        for moved_name in moved:
+            moved_node = self.nodes[moved_name]
+            moved_node.placement = transformation.multiply(moved_node.placement)
+            for port_index, (other_name, _) in list(moved_node.connections.items()):
+                if other_name in fixed:
+                    self.disconnect(moved_name, port_index)
+        return moved
+
+    def walkRun(self, startName, stopNames=()):
+        """Return names of the parts connected to the start part (including it).
+
+        The walk does not enter the parts in stopNames.
+        """
+        visited = set([startName]) | set(stopNames)
+        order = [startName]
+        i = 0
+        while i < len(order):
+            for other_name, _ in self.nodes[order[i]].connections.values():
+                if other_name not in visited:
+                    visited.add(other_name)
+                    order.append(other_name)
+            i += 1
+        return order
+
+    def openEnds(self):
+        """Return a list of pairs (part name, port index) of ports without connections."""
+        return [(name, i) for name in sorted(self.nodes.keys()) for i in self.nodes[name].getOpenPorts()]
+
+    def getSegments(self):
+        res = []
+        for name in sorted(self.nodes.keys()):
+            res += self.nodes[name].getSegments()
+        return res
+
+    def getBillOfMaterials(self):
+        """Return list of dictionaries with fitting type, part number, count and total length of pipes."""
+        items = {}
+        for node in self.nodes.values():
+            key = (node.fittingName, node.partNumber)
+            item = items.setdefault(key, {"fitting": node.fittingName, "partNumber": node.partNumber,
+                                          "count": 0, "length": None})
+            item["count"] += 1
+            if node.length is not None:
+                item["length"] = (item["length"] or 0.0) + node.length
+        return [items[key] for key in sorted(items.keys())]
+
+    def createShape(self, name):
+        """Return the shape of the part in its local coordinates. Shapes are created once per part number."""
+        node = self.getNode(name)
+        key = (node.fittingName, node.partNumber, node.length)
+        shape = self._shapes.get(key)
+        if shape is None:
+            fitting_type = Catalog.getFittingType(node.fittingName)
+            row = self._getTable(node.fittingName).findPart(node.partNumber)
+            shape = Piping.makeSolid(fitting_type.createShapeFromRow(row, node.length))
+            self._shapes[key] = shape
+        return shape
+
+    def realize(self, document, names=None):
+        """Add solids of the parts to the document. Return the list of created objects.
+
+        :param names: names of the parts to realize. Realize all parts, if it is None.
+        """
+        if names is None:
+            names = sorted(self.nodes.keys())
+        res = []
+        for name in names:
+            node = self.getNode(name)
+            obj = document.addObject("Part::Feature", name)
+            obj.Shape = self.createShape(name)
+            obj.Placement = node.placement
+            obj.Label = "{} {}".format(node.fittingName, node.partNumber)
+            res.append(obj)
+        return res
+
+    def clearShapes(self):
+        self._shapes = {}
+
+    def toDict(self):
+        parts = []
+        for name in sorted(self.nodes.keys()):
+            node = self.nodes[name]
+            base = node.placement.Base
+            parts.append({"name": name, "fitting": node.fittingName, "partNumber": node.partNumber,
+                          "length": node.length, "base": [base.x, base.y, base.z],
+                          "rotation": list(node.placement.Rotation.Q),
+                          "connections": [[i, c[0], c[1]] for i, c in sorted(node.connections.items())]})
+        return {"parts": parts}
+
+    @classmethod
+    def fromDict(cls, data):
+        skeleton = cls()
+        for part in data["parts"]:
+            placement = FreeCAD.Placement(FreeCAD.Vector(*part["base"]), FreeCAD.Rotation(*part["rotation"]))
+            skeleton.addPart(part["fitting"], part["partNumber"], placement, part["length"], part["name"])
+        for part in data["parts"]:
+            for port_index, other_name, other_port_index in part["connections"]:
+                if port_index not in skeleton.nodes[part["name"]].connections:
+                    skeleton.connect(part["name"], port_index, other_name, other_port_index)
+        return skeleton
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.toDict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.fromDict(json.load(f))
@@ -3,11 +3,13 @@
 # Date: 30. March 2018
 # Create a sweep-elbow-fitting.
 
-import math
 import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -25,15 +27,16 @@ DIMENSIONS_USED = ["BendAngle", "H", "J", "M", "POD", "PThk"]
 RELATIVE_EPSILON = 0.000001
 
 
-class Dimensions:
-    def __init__(self):
-        # Init class with test values
-        self.BendAngle = parseQuantity("90 deg")
-        self.H = parseQuantity("6 cm")
-        self.J = parseQuantity("5 cm")
-        self.M = parseQuantity("3 cm")
-        self.POD = parseQuantity("2 cm")
-        self.PThk = parseQuantity("0.5 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("BendAngle", "H", "J", "M", "POD", "PThk")
+    DEFAULTS = {
+        "BendAngle": "90 deg",
+        "H": "6 cm",
+        "J": "5 cm",
+        "M": "3 cm",
+        "POD": "2 cm",
+        "PThk": "0.5 cm",
+    }
 
     def isValid(self):
         fitThk = (self.M - self.POD) / 2.0
@@ -63,29 +66,8 @@ class Dimensions:
         See documentation picture sweep-elbow-cacluations.png. The code is similar to
         Elbow.Dimensions.calculateAuxiliararyPoints.
         """
-        beta = 180 - float(self.BendAngle.getValueAs("deg"))
-        beta_rad = math.pi - float(self.BendAngle.getValueAs("rad"))
-
-        # Start with a normalized vector along th bisectrix of the x and y-axis.
-        # Then stretch and rotate this vector by -beta/2 and +beta/2 along the z axis.
-        bs = FreeCAD.Vector(1, 1, 0).normalize()
-        neg_rot = FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), -beta / 2)
-
-        p1 = neg_rot.multVec(bs * float(self.H))
-        p5 = neg_rot.multVec(bs * float(self.J))
-
-        pos_rot = FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), +beta / 2)
-        p6 = pos_rot.multVec(bs * float(self.J))
-
-        # p3 lies on the bissectrix.
-        p3 = bs * float(self.J / math.cos(beta_rad / 2.0))
-        # Calculate coordinates of the base cirle at the end of sweep.
-        a = self.calculateAuxiliararyLengths()
-        l = float(self.H) - float(a["a2"])
-        p2 = neg_rot.multVec(bs * l)
-        p4 = pos_rot.multVec(bs * l)
-
-        return {"p1": p1, "p2": p2, "p3": p3, "p4": p4, "p5": p5, "p6": p6}
+        return Piping.toVectors(DimensionKernel.sweepElbowAuxiliaryPoints(
+            self.BendAngle, self.H, self.J, self.M, self.POD))
 
     def PID(self):
         """Return the inner diamter of the pipe."""
@@ -96,11 +78,7 @@ class Dimensions:
         return (self.M - self.POD) / 2.0
 
     def calculateAuxiliararyLengths(self):
-
-        a1 = self.H - self.J
-        # Calculate socket Height.
-        a2 = self.H - self.J + self.fitThk()
-        return {"a1": a1, "a2": a2}
+        return DimensionKernel.sweepElbowAuxiliaryLengths(self.H, self.J, self.M, self.POD)
 
 
 class SweepElbow:
@@ -128,7 +106,7 @@ class SweepElbow:
         # Convert alpha to degree value
         aux = self.dims.calculateAuxiliararyPoints()
 
-        alpha = float(self.dims.BendAngle.getValueAs("deg"))
+        alpha = self.dims.BendAngle
         rBend = (aux["p3"] - aux["p5"]).Length
 
         # Calculate coordinates of the base circle.
@@ -154,6 +132,7 @@ class SweepElbow:
         group.addObjects([trajectory, base, sweep])
         return sweep
 
+    @Trace.traced("outer part")
     def createOuterPart(self, group):
         aux = self.dims.calculateAuxiliararyPoints()
         # Make the outer part slightly larger. Otherwise it can be shown incorrectly after
@@ -181,6 +160,7 @@ class SweepElbow:
         group.addObject(outer)
         return outer
 
+    @Trace.traced("inner part")
     def createInnerPart(self, group):
         aux = self.dims.calculateAuxiliararyPoints()
         pid = self.dims.POD - self.dims.PThk * 2
@@ -255,12 +235,14 @@ class SweepElbow:
         elbow.Base = outer
         elbow.Tool = inner
         group.addObject(elbow)
+        Metrics.countDocumentObjects(Piping.nestedObjects(group))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, elbow, "sweep elbow (solid)")
             # Remove previous (intermediate parts).
@@ -291,17 +273,26 @@ class SweepElbowFromTable:
         else:
             return ""
 
-    def create(self, partNumber, outputType):
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found")
-            return
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.H = parseQuantity(row["H"])
         dims.J = parseQuantity(row["J"])
         dims.M = parseQuantity(row["M"])
         dims.POD = parseQuantity(row["POD"])
-        dims.Thk = SweepElbowFromTable.getPThk(row)
+        dims.PThk = cls.getPThk(row)
+        return dims
+
+    @Trace.traced("SweepElbowFromTable.create")
+    def create(self, partNumber, outputType):
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found")
+            return
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             elbow = SweepElbow(self.document)
@@ -320,7 +311,8 @@ class SweepElbowFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = self.getPSize(row)
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             feature.PartNumber = partNumber
             return part
 
@@ -23,6 +23,7 @@ All other dimensions are used for inromation.
 </p></body></html>"""
         params.settingsName = "sweep elbow user input"
         params.keyColumnName = "PartNumber"
+        params.catalogName = "sweep-elbow"
         super(MainDialog, self).__init__(params)
 
     def createNewPart(self, document, table, partName, outputType):
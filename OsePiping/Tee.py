@@ -3,11 +3,13 @@
 # Date: 06 February 2018
 # Create a tee-fitting.
 
-import math
 import os.path
 import FreeCAD
 import OsePipingBase
 import OsePiping.Piping as Piping
+import OsePiping.DimensionKernel as DimensionKernel
+import OsePiping.Trace as Trace
+import OsePiping.Metrics as Metrics
 
 
 parseQuantity = FreeCAD.Units.parseQuantity
@@ -18,23 +20,25 @@ CSV_TABLE_PATH = os.path.join(OsePipingBase.TABLE_PATH, "tee.csv")
 DIMENSIONS_USED = ["G", "G1", "G2", "H", "H1", "H2", "M", "M1", "M2", "POD", "POD1", "POD2", "PThk", "PThk1", "PThk2"]
 
 
-class Dimensions:
-    def __init__(self):
-        self.G = parseQuantity("3 cm")
-        self.G1 = parseQuantity("2 cm")
-        self.G2 = parseQuantity("3 cm")
-        self.H = parseQuantity("4 cm")  # It is L/2 for symmetrical Tee. Why extra dimension?
-        self.H1 = parseQuantity("3 cm")
-        self.H2 = parseQuantity("5 cm")
-        self.PThk = parseQuantity("0.5 cm")
-        self.PThk1 = parseQuantity("0.5 cm")
-        self.PThk2 = parseQuantity("0.5 cm")
-        self.POD = parseQuantity("4 cm")
-        self.POD1 = parseQuantity("3 cm")
-        self.POD2 = parseQuantity("2 cm")
-        self.M = parseQuantity("5 cm")
-        self.M1 = parseQuantity("4 cm")
-        self.M2 = parseQuantity("3 cm")
+class Dimensions(Piping.DimensionRecord):
+    __slots__ = ("G", "G1", "G2", "H", "H1", "H2", "PThk", "PThk1", "PThk2", "POD", "POD1", "POD2", "M", "M1", "M2")
+    DEFAULTS = {
+        "G": "3 cm",
+        "G1": "2 cm",
+        "G2": "3 cm",
+        "H": "4 cm",  # It is L/2 for symmetrical Tee. Why extra dimension?
+        "H1": "3 cm",
+        "H2": "5 cm",
+        "PThk": "0.5 cm",
+        "PThk1": "0.5 cm",
+        "PThk2": "0.5 cm",
+        "POD": "4 cm",
+        "POD1": "3 cm",
+        "POD2": "2 cm",
+        "M": "5 cm",
+        "M1": "4 cm",
+        "M2": "3 cm",
+    }
 
     def isValid(self):
         errorMsg = ""
@@ -83,14 +87,7 @@ class Dimensions:
 
         See Dimensions.shiftA1 in coupling module, for explanation how calclulate a1.
         """
-        a2 = max(self.M - self.POD, self.M1 - self.POD1) / 2
-        x = (self.POD - self.POD1)
-        N = (self.G + self.G1)
-        # The math.sqrt will return Float. That is why
-        # we need to convert x in float too.
-        factor = x.Value / math.sqrt(4 * N**2 + x**2)
-        a1 = factor * a2
-        return a1
+        return DimensionKernel.shiftA1(self.M, self.M1, self.POD, self.POD1, self.G + self.G1)
 
     def leftSocketOuterLength(self):
         """Return outer length of the socket on the bottom in FreeCAD.
@@ -111,14 +108,8 @@ class Dimensions:
 
         See documentation picture coupling-cacluations.png.
         """
-        result = {}
-        result["p1"] = FreeCAD.Vector(-self.H, 0, 0)
-        result["p2"] = FreeCAD.Vector(-self.G, 0, 0)
-        result["p3"] = FreeCAD.Vector(self.G1, 0, 0)
-        result["p4"] = FreeCAD.Vector(0, 0, self.G2)
-        result["p5"] = FreeCAD.Vector(-self.G + self.shiftA1(), 0, 0)
-        result["p6"] = FreeCAD.Vector(self.G1 + self.shiftA1(), 0, 0)
-        return result
+        return Piping.toVectors(DimensionKernel.teeAuxiliaryPoints(
+            self.G, self.G1, self.G2, self.H, self.M, self.M1, self.POD, self.POD1))
 
     def PID(self):
         return self.POD - 2 * self.PThk
@@ -140,6 +131,7 @@ class Tee:
         if not valid:
             raise Piping.UnplausibleDimensions(msg)
 
+    @Trace.traced("outer part")
     def createOuterPart(self):
         if self.dims.M == self.dims.M1:
             return self.createOuterPartEqualHorizontal()
@@ -234,6 +226,7 @@ class Tee:
 
         return outer
 
+    @Trace.traced("inner part")
     def createInnerPart(self):
         if self.dims.PID() == self.dims.PID1():
             return self.createInnerPartEqualHorizontal()
@@ -316,12 +309,14 @@ class Tee:
         tee = self.document.addObject("Part::Cut", "tee")
         tee.Base = outer
         tee.Tool = inner
+        Metrics.countDocumentObjects(Piping.nestedObjects(tee))
         if convertToSolid:
             # Before making a solid, recompute documents. Otherwise there will be
             #    s = Part.Solid(Part.Shell(s))
             #    <class 'Part.OCCError'>: Shape is null
             # exception.
-            self.document.recompute()
+            with Trace.span("recompute"):
+                self.document.recompute()
             # Now convert all parts to solid, and remove intermediate data.
             solid = Piping.toSolid(self.document, tee, "tee (solid)")
             # Remove previous (intermediate parts).
@@ -361,13 +356,10 @@ class TeeFromTable:
     def getPThk2(cls, row):
         return cls.getPThkX(row, "2")
 
-    def create(self, partNumber, outputType):
-        tee = Tee(self.document)
-        row = self.table.findPart(partNumber)
-        if row is None:
-            print("Part not found {}".format(partNumber))
-            return
-
+    @classmethod
+    @Trace.traced("dimensions")
+    def getDimensions(cls, row):
+        """Return dimensions of the part in the table row."""
         dims = Dimensions()
         dims.G = parseQuantity(row["G"])
         dims.G1 = parseQuantity(row["G1"])
@@ -381,9 +373,21 @@ class TeeFromTable:
         dims.POD = parseQuantity(row["POD"])
         dims.POD1 = parseQuantity(row["POD1"])
         dims.POD2 = parseQuantity(row["POD2"])
-        dims.PThk = self.getPThk(row)
-        dims.PThk1 = self.getPThk1(row)
-        dims.PThk2 = self.getPThk2(row)
+        dims.PThk = cls.getPThk(row)
+        dims.PThk1 = cls.getPThk1(row)
+        dims.PThk2 = cls.getPThk2(row)
+        return dims
+
+    @Trace.traced("TeeFromTable.create")
+    def create(self, partNumber, outputType):
+        tee = Tee(self.document)
+        with Trace.span("table lookup"):
+            row = self.table.findPart(partNumber)
+        if row is None:
+            print("Part not found {}".format(partNumber))
+            return
+
+        dims = self.getDimensions(row)
 
         if outputType == Piping.OUTPUT_TYPE_PARTS or outputType == Piping.OUTPUT_TYPE_SOLID:
             tee = Tee(self.document)
@@ -400,7 +404,8 @@ class TeeFromTable:
             part = builder.create(feature)
             feature.PRating = Piping.GetPressureRatingString(row)
             feature.PSize = row["PSize"]  # What to do for multiple sizes?
-            feature.ViewObject.Proxy = 0
+            if FreeCAD.GuiUp:
+                feature.ViewObject.Proxy = 0
             feature.PartNumber = partNumber
             return part
 
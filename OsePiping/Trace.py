@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Tracing of build phases: table lookup, dimension parsing, creation of primitives,
+# booleans, recompute, conversion to solid and removal of temporary objects.
+#
+# Tracing is off by default. Switch it on in the Python console
+#
+#   import OsePiping.Trace as Trace
+#   Trace.enable()
+#   ... insert parts ...
+#   Trace.exportChromeTrace("/tmp/ose-piping-trace.json")
+#
+# or set the environment variable OSE_PIPING_TRACE=1 before starting FreeCAD.
+# Open the file in chrome://tracing or in https://ui.perfetto.dev.
+
+import functools
+import json
+import os
+import threading
+import time
+
+_enabled = os.environ.get("OSE_PIPING_TRACE", "") not in ["", "0"]
+_events = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+class _NullSpan:
+    """Span, which does nothing. It is returned when tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Measure the time of a with-block and record it as a trace event."""
+
+    __slots__ = ["name", "category", "args", "start"]
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        end = time.perf_counter()
+        event = {"name": self.name, "cat": self.category, "ph": "X",
+                 "ts": (self.start - _origin) * 1e6, "dur": (end - self.start) * 1e6,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if self.args:
+            event["args"] = self.args
+        if excType is not None:
+            event.setdefault("args", {})["error"] = str(excValue)
+        with _lock:
+            _events.append(event)
+        return False
+
+
+def span(name, category="build", **args):
+    """Return a context manager, which records the time of its block as the phase name."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def traced(name, category="build"):
+    """Decorator, which records every call of the function as the phase name."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with Span(name, category, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def isEnabled():
+    return _enabled
+
+
+def clear():
+    with _lock:
+        del _events[:]
+
+
+def getEvents():
+    """Return copy of the recorded events."""
+    with _lock:
+        return list(_events)
+
+
+def summarize():
+    """Return dictionary from phase name to pair (number of calls, total time in seconds)."""
+    res = {}
+    for event in getEvents():
+        count, total = res.get(event["name"], (0, 0.0))
+        res[event["name"]] = (count + 1, total + event["dur"] / 1e6)
+    return res
+
+
+def exportChromeTrace(path):
+    """Write the recorded events to a file in the Chrome trace event format."""
+    with open(path, "w") as f:
+        json.dump({"traceEvents": getEvents(), "displayTimeUnit": "ms"}, f)
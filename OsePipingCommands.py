@@ -23,38 +23,43 @@
 # *                                                                         *
 # ***************************************************************************
 
+import importlib
 import FreeCAD
 import OsePipingBase
-import OsePiping.CouplingGui as CouplingGui
-import OsePiping.PipeGui as PipeGui
-import OsePiping.BushingGui as BushingGui
-import OsePiping.TeeGui as TeeGui
-import OsePiping.CornerGui as CornerGui
-import OsePiping.ElbowGui as ElbowGui
-import OsePiping.CrossGui as CrossGui
-import OsePiping.SweepElbowGui as SweepElbowGui
+import OsePiping.CommandProfiler as CommandProfiler
 
 from FreeCAD import Gui
 
 
-class OsePiping_PipeClass():
+class OsePiping_PartCommand():
+    """Base class of the commands which create a part with a dialog.
+
+    The GUI module of the part is imported in Activated() only. Thus activating
+    the workbench does not load the dialogs, PySide and the fitting modules.
+    """
+    GUI_MODULE = None  # Name of the module with MainDialog and GuiCheckTable, e.g. "OsePiping.TeeGui".
+    PIXMAP = None  # Name of a svg file in OsePipingBase.ICON_PATH.
+    MENU_TEXT = None
+    TOOL_TIP = None
 
     def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreatePipe.svg',  # the name of a svg file available in the resources
+        return {'Pixmap': OsePipingBase.ICON_PATH + '/' + self.PIXMAP,  # the name of a svg file available in the resources
                 #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a pipe",
-                'ToolTip': "Adds a pipe into the center of the document."}
+                'MenuText': self.MENU_TEXT,
+                'ToolTip': self.TOOL_TIP}
 
+    @CommandProfiler.profiledMethod
     def Activated(self):
         "Do something here when button is clicked"
-        if Gui.ActiveDocument == None:
+        if Gui.ActiveDocument is None:
             FreeCAD.newDocument()
         doc = FreeCAD.activeDocument()
+        gui = importlib.import_module(self.GUI_MODULE)
         # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = PipeGui.GuiCheckTable()
- #       FreeCAD.Console.PrintMessage("Showing pipe UI.")
-        form = PipeGui.MainDialog(doc, table)
-        form.exec_()
+        table = gui.GuiCheckTable()
+        # Reuse the dialog of the previous call. It is rebuilt only if the table has changed.
+        form = gui.MainDialog.getInstance(doc, table)
+        form.showForCreation()
 
     def IsActive(self):
         """Here you can define if the command must be active or not (greyed) if certain conditions
@@ -62,176 +67,212 @@ class OsePiping_PipeClass():
         return True
 
 
-class OsePiping_CouplingClass():
+class OsePiping_PipeClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.PipeGui"
+    PIXMAP = "CreatePipe.svg"
+    MENU_TEXT = "Add a pipe"
+    TOOL_TIP = "Adds a pipe into the center of the document."
 
-    def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateCoupling.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a coupling",
-                'ToolTip': "Adds a coupling."}
 
-    def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
-        doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = CouplingGui.GuiCheckTable()
-        #       FreeCAD.Console.PrintMessage("Showing outer coupling UI.")
-        form = CouplingGui.MainDialog(doc, table)
-        form.exec_()
+class OsePiping_CouplingClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.CouplingGui"
+    PIXMAP = "CreateCoupling.svg"
+    MENU_TEXT = "Add a coupling"
+    TOOL_TIP = "Adds a coupling."
 
-    def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
 
+class OsePiping_BushingClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.BushingGui"
+    PIXMAP = "CreateBushing.svg"
+    MENU_TEXT = "Add a bushing"
+    TOOL_TIP = "Adds a bushing."
 
-class OsePiping_BushingClass():
 
-    def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateBushing.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a bushing",
-                'ToolTip': "Adds a bushing."}
+class OsePiping_ElbowClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.ElbowGui"
+    PIXMAP = "CreateElbow.svg"
+    MENU_TEXT = "Add an elbow"
+    TOOL_TIP = "Adds an elbow."
 
-    def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
-        doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = BushingGui.GuiCheckTable()
-        #        FreeCAD.Console.PrintMessage("Showing outer bushing UI.")
-        form = BushingGui.MainDialog(doc, table)
-        form.exec_()
 
-    def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
+class OsePiping_SweepElbowClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.SweepElbowGui"
+    PIXMAP = "CreateSweepElbow.svg"
+    MENU_TEXT = "Add a sweep elbow"
+    TOOL_TIP = "Adds a sweep elbow."
+
+
+class OsePiping_TeeClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.TeeGui"
+    PIXMAP = "CreateTee.svg"
+    MENU_TEXT = "Add a tee"
+    TOOL_TIP = "Adds a tee."
 
 
-class OsePiping_ElbowClass():
+class OsePiping_CornerClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.CornerGui"
+    PIXMAP = "CreateCorner.svg"
+    MENU_TEXT = "Add a outer corner"
+    TOOL_TIP = "Adds a outer corner."
+
+
+class OsePiping_CrossClass(OsePiping_PartCommand):
+    GUI_MODULE = "OsePiping.CrossGui"
+    PIXMAP = "CreateCross.svg"
+    MENU_TEXT = "Add a cross"
+    TOOL_TIP = "Adds a cross."
+
+
+class OsePiping_RecomputeProfilerClass():
+    """Recompute the active document and show the slowest OSE features."""
 
     def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateElbow.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add an elbow",
-                'ToolTip': "Adds an elbow."}
+        return {'MenuText': "Profile recompute",
+                'ToolTip': "Recomputes all OSE features of the document and shows which of them are slowest."}
 
+    @CommandProfiler.profiledMethod
     def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
-        doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = ElbowGui.GuiCheckTable()
-#        FreeCAD.Console.PrintMessage("Showing outer elbow UI.")
-        form = ElbowGui.MainDialog(doc, table)
-        form.exec_()
+        import OsePiping.RecomputeProfilerGui as RecomputeProfilerGui
+        RecomputeProfilerGui.showReport(FreeCAD.activeDocument())
 
     def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
+        return FreeCAD.activeDocument() is not None
 
 
-class OsePiping_SweepElbowClass():
+class OsePiping_ExportGltfClass():
+    """Export the active document as binary glTF with shared meshes."""
 
     def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateSweepElbow.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a sweep elbow",
-                'ToolTip': "Adds a sweep elbow."}
+        return {'MenuText': "Export glTF",
+                'ToolTip': "Exports the document as glTF. Parts with the same part number share one mesh."}
 
+    @CommandProfiler.profiledMethod
     def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
-        doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = SweepElbowGui.GuiCheckTable()
-        form = SweepElbowGui.MainDialog(doc, table)
-        form.exec_()
+        from PySide import QtGui
+        import OsePiping.GltfExport as GltfExport
+        filename, _ = QtGui.QFileDialog.getSaveFileName(None, "Export glTF", "", "glTF binary (*.glb)")
+        if not filename:
+            return
+        instances, meshes = GltfExport.exportDocument(FreeCAD.activeDocument(), filename)
+        FreeCAD.Console.PrintMessage("Exported {} parts with {} unique meshes to {}.\n".format(
+            instances, meshes, filename))
 
     def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
+        return FreeCAD.activeDocument() is not None
 
 
-class OsePiping_TeeClass():
+class OsePiping_DetailLevelCommand():
+    """Base class of the commands which set the detail level of the selected OSE features.
+
+    If nothing is selected, the level of all OSE features in the document is set.
+    """
+    MENU_TEXT = None
+    TOOL_TIP = None
 
     def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateTee.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a tee",
-                'ToolTip': "Adds a tee."}
+        return {'MenuText': self.MENU_TEXT,
+                'ToolTip': self.TOOL_TIP}
+
+    def getLevel(self, LevelOfDetail):
+        """Return one of LevelOfDetail.LEVELS."""
+        raise NotImplementedError()
 
+    @CommandProfiler.profiledMethod
     def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
+        import OsePiping.LevelOfDetail as LevelOfDetail
         doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = TeeGui.GuiCheckTable()
-#        FreeCAD.Console.PrintMessage("Showing outer tee UI.")
-        form = TeeGui.MainDialog(doc, table)
-        form.exec_()
+        objects = Gui.Selection.getSelection()
+        if len(objects) == 0:
+            objects = doc.Objects
+        level = self.getLevel(LevelOfDetail)
+        doc.openTransaction("Set detail level {}".format(level))
+        try:
+            LevelOfDetail.setLevel(objects, level)
+            doc.recompute()
+        except Exception:
+            doc.abortTransaction()
+            raise
+        else:
+            doc.commitTransaction()
 
     def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
+        return FreeCAD.activeDocument() is not None
+
+
+class OsePiping_DetailFullClass(OsePiping_DetailLevelCommand):
+    MENU_TEXT = "Full detail"
+    TOOL_TIP = "Shows the selected fittings, or all fittings, with sockets and inner cuts."
+
+    def getLevel(self, LevelOfDetail):
+        return LevelOfDetail.FULL
+
+
+class OsePiping_DetailEnvelopeClass(OsePiping_DetailLevelCommand):
+    MENU_TEXT = "Envelope only"
+    TOOL_TIP = "Shows only the outer envelope of the selected fittings, or of all fittings."
+
+    def getLevel(self, LevelOfDetail):
+        return LevelOfDetail.ENVELOPE
+
 
+class OsePiping_DetailCenterlineClass(OsePiping_DetailLevelCommand):
+    MENU_TEXT = "Centerline only"
+    TOOL_TIP = "Shows the selected fittings, or all fittings, as thin cylinders to their ports."
 
-class OsePiping_CornerClass():
+    def getLevel(self, LevelOfDetail):
+        return LevelOfDetail.CENTERLINE
+
+
+class OsePiping_FullDetailNearClass():
+    """Show fittings near the selected object in full detail and all other fittings as envelopes."""
 
     def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateCorner.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a outer corner",
-                'ToolTip': "Adds a outer corner."}
+        return {'MenuText': "Full detail near selection",
+                'ToolTip': "Shows fittings within a radius of the selected object in full detail "
+                           "and all other fittings as envelopes."}
 
+    @CommandProfiler.profiledMethod
     def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
+        from PySide import QtGui
+        import OsePiping.LevelOfDetail as LevelOfDetail
         doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = CornerGui.GuiCheckTable()
-#        FreeCAD.Console.PrintMessage("Showing outer corner UI.")
-        form = CornerGui.MainDialog(doc, table)
-        form.showForCreation()
+        point = Gui.Selection.getSelection()[0].getGlobalPlacement().Base
+        radius, ok = QtGui.QInputDialog.getDouble(None, "Full detail near selection", "Radius in mm:",
+                                                  LevelOfDetail.NEAR_RADIUS, 0, 1e9, 1)
+        if not ok:
+            return
+        doc.openTransaction("Full detail near selection")
+        try:
+            LevelOfDetail.showFullDetailNear(doc, point, radius)
+        except Exception:
+            doc.abortTransaction()
+            raise
+        else:
+            doc.commitTransaction()
 
     def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
-        return True
+        return FreeCAD.activeDocument() is not None and len(Gui.Selection.getSelection()) > 0
 
 
-class OsePiping_CrossClass():
-    def GetResources(self):
-        return {'Pixmap': OsePipingBase.ICON_PATH + '/CreateCross.svg',  # the name of a svg file available in the resources
-                #                'Accel' : "Shift+S", # a default shortcut (optional)
-                'MenuText': "Add a cross",
-                'ToolTip': "Adds a cross."}
+class OsePiping_FullDetailOnSelectionClass():
+    """Show selected fittings in full detail, while other fittings keep their detail level."""
 
-    def Activated(self):
-        "Do something here when button is clicked"
-        if Gui.ActiveDocument is None:
-            FreeCAD.newDocument()
-        doc = FreeCAD.activeDocument()
-        # Open a CSV file, check its content, and return it as a CsvTable object.
-        table = CrossGui.GuiCheckTable()
-#        FreeCAD.Console.PrintMessage("Showing outer corner UI.")
-        form = CrossGui.MainDialog(doc, table)
-        form.exec_()
+    def GetResources(self):
+        import OsePiping.LevelOfDetail as LevelOfDetail
+        # The value of 'Checkable' makes the command checkable and is its initial state.
+        return {'MenuText': "Full detail on selection",
+                'ToolTip': "Shows selected fittings in full detail.",
+                'Checkable': LevelOfDetail.isFullDetailOnSelection()}
+
+    @CommandProfiler.profiledMethod
+    def Activated(self, checked=None):
+        import OsePiping.LevelOfDetail as LevelOfDetail
+        # Toggle, if the command is run without the check state, for example from the console.
+        if checked is None:
+            checked = not LevelOfDetail.isFullDetailOnSelection()
+        LevelOfDetail.setFullDetailOnSelection(bool(checked))
 
     def IsActive(self):
-        """Here you can define if the command must be active or not (greyed) if certain conditions
-        are met or not. This function is optional."""
         return True
 
 
@@ -243,3 +284,10 @@ Gui.addCommand('OsePiping_SweepElbow', OsePiping_SweepElbowClass())
 Gui.addCommand('OsePiping_Tee', OsePiping_TeeClass())
 Gui.addCommand('OsePiping_Corner', OsePiping_CornerClass())
 Gui.addCommand('OsePiping_Cross', OsePiping_CrossClass())
+Gui.addCommand('OsePiping_RecomputeProfiler', OsePiping_RecomputeProfilerClass())
+Gui.addCommand('OsePiping_ExportGltf', OsePiping_ExportGltfClass())
+Gui.addCommand('OsePiping_DetailFull', OsePiping_DetailFullClass())
+Gui.addCommand('OsePiping_DetailEnvelope', OsePiping_DetailEnvelopeClass())
+Gui.addCommand('OsePiping_DetailCenterline', OsePiping_DetailCenterlineClass())
+Gui.addCommand('OsePiping_FullDetailNear', OsePiping_FullDetailNearClass())
+Gui.addCommand('OsePiping_FullDetailOnSelection', OsePiping_FullDetailOnSelectionClass())
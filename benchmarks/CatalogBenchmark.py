@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Benchmark of *FromTable.create for every row of every table and for all three
+# output types. Run it headless with FreeCADCmd from the workbench directory:
+#
+#   FreeCADCmd -c "import sys; sys.path.append('benchmarks'); import CatalogBenchmark as B; \
+#       sys.exit(B.main(['run', 'bench.json']))"
+#
+# or as a script with the Python interpreter of the FreeCAD installation:
+#
+#   python benchmarks/CatalogBenchmark.py run bench.json
+#
+# Keep the result of a run of the reference version, for example master, as the
+# baseline and compare a later run with it. Exit code is 1 if there are regressions:
+#
+#   FreeCADCmd -c "import sys; sys.path.append('benchmarks'); import CatalogBenchmark as B; \
+#       sys.exit(B.main(['compare', 'bench.json', 'master.json']))"
+#
+# Features of the output type DODO_OR_FLAMINGO use the local stub of pypeType, such
+# that the results do not depend on the installed workbenches. Pipes need the pipe
+# class of Dodo/Flamingo and are reported as failed in this output type.
+#
+# Every pair of fitting type and output type runs in a fresh worker process, such that
+# the peak RSS belongs to this pair only. The worker uses the Python interpreter found
+# by ShapeJobs.getPythonExecutable(). Without such interpreter, or with --in-process,
+# all pairs run in one process and the peak RSS of a pair includes all earlier pairs.
+# Such peaks are not compared.
+
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import OsePiping.Backend as Backend  # noqa: E402
+
+# Create DODO_OR_FLAMINGO features with the stub, also in the worker processes.
+Backend.useStub()
+
+import FreeCAD  # noqa: E402
+import OsePiping.Piping as Piping  # noqa: E402
+import OsePiping.Catalog as Catalog  # noqa: E402
+import OsePiping.ShapeJobs as ShapeJobs  # noqa: E402
+import OsePiping.BatchGenerate as BatchGenerate  # noqa: E402
+
+OUTPUT_TYPES = {
+    "parts": Piping.OUTPUT_TYPE_PARTS,
+    "solid": Piping.OUTPUT_TYPE_SOLID,
+    "dodo": Piping.OUTPUT_TYPE_DODO_OR_FLAMINGO,
+}
+
+PIPE_LENGTH = "1 m"
+
+# Relative increase of time and peak RSS, which is reported as a regression.
+TIME_TOLERANCE = 0.10
+MEMORY_TOLERANCE = 0.10
+
+
+def getPeakRssKb():
+    """Return peak resident memory of the process in kB or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak = peak // 1024  # macOS reports bytes.
+    return peak
+
+
+def getEnvironment():
+    return {"freecad": ".".join(FreeCAD.Version()[0:3]),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": "stub",
+            "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def benchmarkFitting(fittingType, outputTypeName):
+    """Create all rows of the fitting type in a new document. Return (summary, records)."""
+    output_type = OUTPUT_TYPES[outputTypeName]
+    length = FreeCAD.Units.parseQuantity(PIPE_LENGTH)
+    start = time.perf_counter()
+    table = fittingType.loadTable()
+    load_seconds = time.perf_counter() - start
+    document = FreeCAD.newDocument("OsePipingBenchmark")
+    document.UndoMode = 0
+    records = []
+    try:
+        for i in range(0, len(table.data)):
+            part_number = table.getPartKey(i)
+            record = {"partNumber": part_number}
+            object_count = len(document.Objects)
+            start = time.perf_counter()
+            try:
+                part = fittingType.createPart(document, table, part_number, output_type, length)
+                document.recompute()
+                record["seconds"] = time.perf_counter() - start
+                obj = document.getObject(part.Name)
+                record["faces"] = len(Piping.getResultShape(obj).Faces)
+                record["objects"] = len(document.Objects) - object_count
+                record["status"] = "ok"
+            except Exception as e:
+                record["seconds"] = time.perf_counter() - start
+                record["status"] = "failed"
+                record["error"] = str(e)
+            records.append(record)
+    finally:
+        FreeCAD.closeDocument(document.Name)
+
+    ok = [r for r in records if r["status"] == "ok"]
+    summary = {"fitting": fittingType.name,
+               "outputType": outputTypeName,
+               "parts": len(records),
+               "failed": len(records) - len(ok),
+               "tableLoadSeconds": load_seconds,
+               "seconds": sum(r["seconds"] for r in records),
+               "meanSeconds": sum(r["seconds"] for r in ok) / len(ok) if len(ok) > 0 else None,
+               "faces": sum(r["faces"] for r in ok),
+               "objects": sum(r["objects"] for r in ok),
+               "peakRssKb": getPeakRssKb()}
+    return (summary, records)
+
+
+def _benchmarkInWorker(fittingName, outputTypeName):
+    return benchmarkFitting(Catalog.getFittingType(fittingName), outputTypeName)
+
+
+def benchmarkInProcess(fittingName, outputTypeName, python):
+    """Run benchmarkFitting in a fresh process of the interpreter python. Return (summary, records)."""
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(python)
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=context, initializer=ShapeJobs._initWorker,
+                                                initargs=(os.path.join(FreeCAD.getHomePath(), "lib"),)) as executor:
+        return executor.submit(_benchmarkInWorker, fittingName, outputTypeName).result()
+
+
+def run(fittingNames=None, outputTypeNames=None, inProcess=False, log=print):
+    """Run the benchmark. Return dictionary with environment, summaries and per-part records."""
+    if fittingNames is None:
+        fittingNames = Catalog.getFittingTypeNames()
+    if outputTypeNames is None:
+        outputTypeNames = list(OUTPUT_TYPES.keys())
+    python = None if inProcess else ShapeJobs.getPythonExecutable()
+    if python is None and not inProcess:
+        log("No Python interpreter for worker processes found. Running in this process.")
+    res = {"environment": getEnvironment(), "summary": [], "records": {}}
+    res["environment"]["isolated"] = python is not None
+    for name in fittingNames:
+        for output_type_name in outputTypeNames:
+            if python is None:
+                summary, records = benchmarkFitting(Catalog.getFittingType(name), output_type_name)
+            else:
+                summary, records = benchmarkInProcess(name, output_type_name, python)
+            res["summary"].append(summary)
+            res["records"]["{}/{}".format(name, output_type_name)] = records
+            log("{:12} {:6} {:4} parts {:3} failed {:8.2f} s".format(
+                name, output_type_name, summary["parts"], summary["failed"], summary["seconds"]))
+    return res
+
+
+def _increased(value, baseline, tolerance):
+    if value is None or baseline is None or baseline == 0:
+        return False
+    return value > baseline * (1 + tolerance)
+
+
+def compare(current, baseline, timeTolerance=TIME_TOLERANCE, memoryTolerance=MEMORY_TOLERANCE):
+    """Compare two benchmark results. Return list of messages about regressions."""
+    baseline_summaries = {(s["fitting"], s["outputType"]): s for s in baseline["summary"]}
+    # Peaks of runs in one process are cumulative and can not be compared.
+    compare_memory = current["environment"].get("isolated", False) and baseline["environment"].get("isolated", False)
+    res = []
+    for summary in current["summary"]:
+        key = (summary["fitting"], summary["outputType"])
+        base = baseline_summaries.get(key)
+        if base is None:
+            continue
+        name = "{}/{}".format(*key)
+        if _increased(summary["seconds"], base["seconds"], timeTolerance):
+            res.append("{}: time {:.2f} s, baseline {:.2f} s.".format(name, summary["seconds"], base["seconds"]))
+        if compare_memory and _increased(summary["peakRssKb"], base["peakRssKb"], memoryTolerance):
+            res.append("{}: peak RSS {} kB, baseline {} kB.".format(name, summary["peakRssKb"], base["peakRssKb"]))
+        if summary["failed"] > base["failed"]:
+            res.append("{}: {} failed parts, baseline {}.".format(name, summary["failed"], base["failed"]))
+        # A different number of faces or objects means that the result itself has changed.
+        for field in ["faces", "objects"]:
+            if summary[field] != base[field]:
+                res.append("{}: {} {}, baseline {}.".format(name, field, summary[field], base[field]))
+    return res
+
+
+def main(argv):
+    usage = ("Usage: main(['run', output.json, [--fitting name]... [--output-type name]... [--in-process]])\n"
+             "       main(['compare', current.json, baseline.json])")
+    if len(argv) < 2:
+        print(usage)
+        return 2
+    if argv[0] == "run":
+        fittings = [argv[i + 1] for i in range(2, len(argv) - 1) if argv[i] == "--fitting"]
+        output_types = [argv[i + 1] for i in range(2, len(argv) - 1) if argv[i] == "--output-type"]
+        result = run(fittings if fittings else None, output_types if output_types else None,
+                     "--in-process" in argv[2:])
+        with open(argv[1], "w") as f:
+            json.dump(result, f, indent=1)
+        return 0
+    elif argv[0] == "compare" and len(argv) == 3:
+        with open(argv[1], "r") as f:
+            current = json.load(f)
+        with open(argv[2], "r") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline)
+        for message in regressions:
+            print(message)
+        if len(regressions) == 0:
+            print("No regressions.")
+            return 0
+        return 1
+    print(usage)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(BatchGenerate.getScriptArguments(sys.argv, __file__)))
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Micro-benchmarks of table, parsing and port functions on synthetic inputs of
+# growing size. For every function the script prints the time per size and the
+# scaling exponent between neighbouring sizes: about 1 for linear functions, about
+# 2 for quadratic ones. Run it with FreeCADCmd from the workbench directory:
+#
+#   FreeCADCmd -c "import sys; sys.path.append('benchmarks'); import MicroBenchmark as B; \
+#       sys.exit(B.main(['micro.json', '10000', '100000', '1000000']))"
+#
+# or as a script with the Python interpreter of the FreeCAD installation:
+#
+#   python benchmarks/MicroBenchmark.py micro.json 10000 100000 1000000
+#
+# Exit code is 1 if a function scales worse than expected.
+#
+# PartTableModel.getPartRowIndex needs PySide. It is skipped if PySide is missing.
+
+import csv
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FreeCAD  # noqa: E402
+import OsePiping.Piping as Piping  # noqa: E402
+import OsePiping.Port as Port  # noqa: E402
+import OsePiping.BatchGenerate as BatchGenerate  # noqa: E402
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+REPEAT = 3
+HEADERS = ["PartNumber", "PSize", "Schedule", "G", "H", "M", "POD", "PThk"]
+# Exponents above the expected exponent plus this tolerance are reported.
+EXPONENT_TOLERANCE = 0.3
+
+
+def makeRows(n):
+    return [["P{:07d}".format(i), "DN{}".format(10 + i % 90), str(40 + 40 * (i % 2)),
+             "1/2 in", "1+1/4 in", "1+3/32 in", "0.840 in", "0.109 in"] for i in range(0, n)]
+
+
+def writeTable(n):
+    """Write a synthetic table with n rows to a temporary file. Return its path."""
+    fd, path = tempfile.mkstemp(prefix="ose-piping-micro-", suffix=".csv")
+    with os.fdopen(fd, "w") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(HEADERS)
+        writer.writerows(makeRows(n))
+    return path
+
+
+def loadTable(path):
+    table = Piping.CsvTable(HEADERS[1:])
+    table.load(path)
+    return table
+
+
+def makePorts(n):
+    return [Port.AdvancedPort(FreeCAD.Vector(i, i % 7, i % 13), FreeCAD.Rotation(i % 360, 0, 0))
+            for i in range(0, n)]
+
+
+class Case:
+    """A function to measure.
+
+    setup(n) prepares the input of size n and returns a function without arguments,
+    whose time is measured. teardown(n) removes temporary data.
+    """
+
+    def __init__(self, name, setup, expectedExponent, teardown=None):
+        self.name = name
+        self.setup = setup
+        self.expectedExponent = expectedExponent
+        self.teardown = teardown
+
+
+def csvLoadCase():
+    paths = {}
+
+    def setup(n):
+        paths[n] = writeTable(n)
+        return lambda: loadTable(paths[n])
+
+    def teardown(n):
+        os.remove(paths.pop(n))
+    return Case("CsvTable.load", setup, 1.0, teardown)
+
+
+def findPartCase():
+    def setup(n):
+        path = writeTable(n)
+        table = loadTable(path)
+        os.remove(path)
+        # The last key is the worst case of the linear search.
+        key = table.getPartKey(n - 1)
+        return lambda: table.findPart(key)
+    return Case("CsvTable.findPart", setup, 1.0)
+
+
+def partRowIndexCase():
+    try:
+        import OsePiping.PipingGui as PipingGui
+    except ImportError:
+        return None
+
+    def setup(n):
+        model = PipingGui.PartTableModel(HEADERS, makeRows(n))
+        model.keyColumnName = "PartNumber"
+        key = model.getPartKey(n - 1)
+        return lambda: model.getPartRowIndex(key)
+    return Case("PartTableModel.getPartRowIndex", setup, 1.0)
+
+
+def pressureRatingCase():
+    def setup(n):
+        rows = [dict(zip(HEADERS, row)) for row in makeRows(n)]
+        return lambda: [Piping.GetPressureRatingString(row) for row in rows]
+    return Case("Piping.GetPressureRatingString", setup, 1.0)
+
+
+def partPlacementCase():
+    def setup(n):
+        ports = makePorts(n)
+        other_port = Port.AdvancedPort(FreeCAD.Vector(1, 2, 3), FreeCAD.Rotation(0, -90, 0))
+        placement = FreeCAD.Placement(FreeCAD.Vector(10, 0, 0), FreeCAD.Rotation(30, 0, 0))
+        return lambda: [port.getPartPlacement(placement, other_port) for port in ports]
+    return Case("AdvancedPort.getPartPlacement", setup, 1.0)
+
+
+def nearestPortCase():
+    def setup(n):
+        ports = makePorts(n)
+        placement = FreeCAD.Placement(FreeCAD.Vector(10, 0, 0), FreeCAD.Rotation(30, 0, 0))
+        point = FreeCAD.Vector(n / 2.0, 3, 5)
+        return lambda: Port.getNearestPort(placement, ports, point)
+    return Case("Port.getNearestPort", setup, 1.0)
+
+
+def getCases():
+    cases = [csvLoadCase(), findPartCase(), partRowIndexCase(), pressureRatingCase(),
+             partPlacementCase(), nearestPortCase()]
+    return [case for case in cases if case is not None]
+
+
+def measure(function, repeat=REPEAT):
+    """Return the smallest time of repeat calls in seconds."""
+    best = float("inf")
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def getExponents(sizes, seconds):
+    """Return exponents k of t ~ n^k between neighbouring sizes."""
+    res = []
+    for i in range(1, len(sizes)):
+        if seconds[i - 1] <= 0 or seconds[i] <= 0:
+            res.append(None)
+        else:
+            res.append(math.log(seconds[i] / seconds[i - 1]) / math.log(float(sizes[i]) / sizes[i - 1]))
+    return res
+
+
+def run(sizes=None, log=print):
+    """Measure all cases for all sizes. Return list of dictionaries with the scaling curves."""
+    if sizes is None:
+        sizes = DEFAULT_SIZES
+    res = []
+    for case in getCases():
+        seconds = []
+        for n in sizes:
+            function = case.setup(n)
+            try:
+                seconds.append(measure(function))
+            finally:
+                if case.teardown is not None:
+                    case.teardown(n)
+        exponents = getExponents(sizes, seconds)
+        worst = max([e for e in exponents if e is not None] or [0.0])
+        result = {"name": case.name, "sizes": sizes, "seconds": seconds, "exponents": exponents,
+                  "expectedExponent": case.expectedExponent,
+                  "superlinear": worst > case.expectedExponent + EXPONENT_TOLERANCE}
+        res.append(result)
+        log("{:32} {}  exponents {}{}".format(
+            case.name, " ".join("{:9.4f} s".format(s) for s in seconds),
+            " ".join("{:5.2f}".format(e) if e is not None else "  -  " for e in exponents),
+            "  SLOWER THAN EXPECTED" if result["superlinear"] else ""))
+    return res
+
+
+def main(argv):
+    if len(argv) < 1:
+        print("Usage: main([output.json, size1, size2, ...])")
+        return 2
+    sizes = [int(s) for s in argv[1:]] if len(argv) > 1 else None
+    result = run(sizes)
+    with open(argv[0], "w") as f:
+        json.dump(result, f, indent=1)
+    return 1 if any(r["superlinear"] for r in result) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(BatchGenerate.getScriptArguments(sys.argv, __file__)))
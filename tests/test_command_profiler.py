@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Every command of the workbench can be profiled. Activated() of every command class
+# must be decorated with CommandProfiler.profiledMethod.
+
+import ast
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def isProfiled(function):
+    for decorator in function.decorator_list:
+        if isinstance(decorator, ast.Attribute) and decorator.attr == "profiledMethod":
+            return True
+    return False
+
+
+def getUnprofiledCommands(path):
+    """Return names of the classes, whose method Activated is not profiled."""
+    with open(path, "r") as f:
+        tree = ast.parse(f.read())
+    res = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "Activated" and not isProfiled(item):
+                res.append(node.name)
+    return res
+
+
+def test_all_commands_are_profiled():
+    assert getUnprofiledCommands(os.path.join(ROOT, "OsePipingCommands.py")) == []
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Tests of the float kernel of the dimension calculations. They do not need FreeCAD.
+
+import csv
+import glob
+import math
+import os
+import pytest
+import OsePiping.DimensionKernel as DimensionKernel
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tables")
+# Columns, which are not dimensions in mm or degrees.
+NON_DIMENSION_COLUMNS = ["PartNumber", "PipeSize", "PipeSize1", "PipeSize2", "PSize", "PSize1", "PSize2",
+                         "Schedule", "Approx. Wt."]
+
+
+def assertPoint(actual, expected):
+    assert actual == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1+1/8 in", 28.575),
+    ("31/32 in", 24.60625),
+    ("0.840 in", 21.336),
+    ("90 deg", 90.0),
+    ("11+1/4 deg", 11.25),
+    ("12 mm", 12.0),
+    ("2 cm", 20.0),
+    ("40", 40.0),
+])
+def test_parse_value(text, expected):
+    assert DimensionKernel.parseValue(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["", "abc", "1/8 lb", "DN15"])
+def test_parse_value_rejects_invalid_text(text):
+    with pytest.raises(ValueError):
+        DimensionKernel.parseValue(text)
+
+
+def getDimensionCells():
+    for path in sorted(glob.glob(os.path.join(TABLES_PATH, "*.csv"))):
+        with open(path, "r") as f:
+            reader = csv.reader(f, delimiter=',', quotechar='"')
+            headers = next(reader)
+            for row in reader:
+                for name, value in zip(headers, row):
+                    if name not in NON_DIMENSION_COLUMNS:
+                        yield (os.path.basename(path), row[0], name, value)
+
+
+def test_parse_value_of_all_table_dimensions():
+    cells = list(getDimensionCells())
+    assert len(cells) > 0
+    for table, part_number, name, value in cells:
+        number = DimensionKernel.parseValue(value)
+        assert number >= 0, (table, part_number, name, value)
+
+
+def test_shift_a1_is_zero_for_equal_sockets():
+    assert DimensionKernel.shiftA1(M=30.0, M1=30.0, POD=20.0, POD1=20.0, N=5.0) == 0.0
+
+
+def test_shift_a1_of_reduced_coupling():
+    # a2 = max(2 - 1.5, 1 - 0.5) / 2 = 0.25, x = 1, factor = 1 / sqrt(4 + 1).
+    a1 = DimensionKernel.shiftA1(M=2.0, M1=1.0, POD=1.5, POD1=0.5, N=1.0)
+    assert a1 == pytest.approx(0.25 / math.sqrt(5))
+
+
+def test_coupling_auxiliary_points():
+    points = DimensionKernel.couplingAuxiliaryPoints(L=50.0, N=10.0, M=30.0, M1=30.0, POD=20.0, POD1=20.0)
+    assertPoint(points["p1"], (0, 0, 0))
+    assertPoint(points["p2"], (0, 0, 20))
+    assertPoint(points["p3"], (0, 0, 30))
+    assertPoint(points["p4"], (0, 0, 20))
+    assertPoint(points["p5"], (0, 0, 30))
+
+
+def test_tee_auxiliary_points():
+    points = DimensionKernel.teeAuxiliaryPoints(G=10.0, G1=12.0, G2=14.0, H=25.0, M=30.0, M1=30.0,
+                                                POD=20.0, POD1=20.0)
+    assertPoint(points["p1"], (-25, 0, 0))
+    assertPoint(points["p2"], (-10, 0, 0))
+    assertPoint(points["p3"], (12, 0, 0))
+    assertPoint(points["p4"], (0, 0, 14))
+    assertPoint(points["p5"], (-10, 0, 0))
+    assertPoint(points["p6"], (12, 0, 0))
+
+
+def test_bushing_auxiliary_points():
+    points = DimensionKernel.bushingAuxiliaryPoints(L=30.0, N=10.0)
+    assertPoint(points["p2"], (0, 0, 5))
+    assertPoint(points["p3"], (0, 0, 10))
+    assertPoint(points["p4"], (0, 0, 20))
+
+
+def test_elbow_auxiliary_points_of_90_degree_elbow():
+    # The ports of a 90° elbow lie on the x and y axes.
+    points = DimensionKernel.elbowAuxiliaryPoints(BendAngle=90.0, H=40.0, J=15.0, M=30.0)
+    assertPoint(points["p1"], (40, 0, 0))
+    assertPoint(points["p2"], (15, 0, 0))
+    assertPoint(points["p3"], (15, 15, 0))
+    assertPoint(points["p4"], (0, 15, 0))
+    assertPoint(points["p5"], (15, 0, 0))
+    assertPoint(points["p6"], (0, 15, 0))
+
+
+@pytest.mark.parametrize("bendAngle", [11.25, 22.5, 45.0, 60.0, 90.0])
+def test_elbow_auxiliary_points_are_symmetric(bendAngle):
+    points = DimensionKernel.elbowAuxiliaryPoints(BendAngle=bendAngle, H=40.0, J=15.0, M=30.0)
+    # The bisectrix of the x and y axes is the mirror axis.
+    for first, second in [("p2", "p4"), ("p5", "p6")]:
+        assertPoint(points[first], (points[second][1], points[second][0], 0))
+    assert math.hypot(*points["p5"][0:2]) == pytest.approx(15.0)
+
+
+def test_sweep_elbow_auxiliary_points_of_90_degree_elbow():
+    points = DimensionKernel.sweepElbowAuxiliaryPoints(BendAngle=90.0, H=43.0, J=21.0, M=30.0, POD=21.0)
+    # a2 = H - J + (M - POD) / 2 = 26.5, the length of p2 is H - a2.
+    assertPoint(points["p2"], (16.5, 0, 0))
+    assertPoint(points["p3"], (21, 21, 0))
+    assertPoint(points["p4"], (0, 16.5, 0))
+    assertPoint(points["p5"], (21, 0, 0))
+    assertPoint(points["p6"], (0, 21, 0))
+
+
+def test_cross_socket_depths():
+    depths = DimensionKernel.crossSocketDepths(G=10.0, G1=8.0, H=25.0, H1=20.0, L=50.0, L1=40.0)
+    assert depths == {"right": 15.0, "left": 15.0, "bottom": 12.0, "top": 12.0}
+
+
+def test_columns_match_scalar_computation():
+    pytest.importorskip("numpy")
+    path = os.path.join(TABLES_PATH, "coupling.csv")
+    cols = DimensionKernel.loadColumns(path, ["L", "N", "M", "M1", "POD", "POD1"])
+    points = DimensionKernel.couplingAuxiliaryPoints(**{k: v for k, v in cols.items() if k != "PartNumber"})
+    for i in range(0, len(cols["PartNumber"])):
+        scalar = DimensionKernel.couplingAuxiliaryPoints(*[float(cols[k][i]) for k in ["L", "N", "M", "M1",
+                                                                                       "POD", "POD1"]])
+        assert points["p5"][2][i] == pytest.approx(scalar["p5"][2])
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Startup budget of the workbench. Activating the workbench imports OsePipingCommands,
+# which must not load the part dialogs, PySide or the fitting modules.
+
+import ast
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Maximal sum of the self import times of the workbench modules in microseconds.
+IMPORT_BUDGET_US = 100000
+
+
+def isForbidden(name):
+    """Check if the module must be imported only when a command is activated."""
+    if name.startswith("PySide"):
+        return True
+    if not name.startswith("OsePiping."):
+        return False
+    module = name.split(".")[-1]
+    return module.endswith("Gui") or module.startswith("Fl") or module in [
+        "Piping", "Pipe", "Coupling", "Bushing", "Elbow", "SweepElbow", "Tee", "Corner", "Cross"]
+
+
+def getTopLevelImports(path):
+    with open(path, "r") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module is not None:
+            names += [node.module + "." + alias.name for alias in node.names] + [node.module]
+    return names
+
+
+def test_commands_import_no_gui_modules_at_top_level():
+    imports = getTopLevelImports(os.path.join(ROOT, "OsePipingCommands.py"))
+    assert [name for name in imports if isForbidden(name)] == []
+
+
+def test_import_time_budget():
+    pytest.importorskip("FreeCAD")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import OsePipingCommands"],
+                            cwd=ROOT, env=env, stderr=subprocess.PIPE, universal_newlines=True)
+    assert result.returncode == 0, result.stderr
+    # Lines look like "import time:       123 |        456 |   OsePiping.Port".
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        self_times[fields[2].strip()] = int(fields[0])
+    assert "OsePipingCommands" in self_times
+    assert [name for name in self_times if isForbidden(name)] == []
+    own = sum(t for name, t in self_times.items() if name.startswith("OsePiping"))
+    assert own < IMPORT_BUDGET_US
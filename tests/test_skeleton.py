@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Date: 19 October 2026
+# Tests of the skeleton of piping networks. They need the FreeCAD module for vectors and
+# placements, but neither the GUI nor any shape.
+
+import pytest
+
+FreeCAD = pytest.importorskip("FreeCAD")
+
+import OsePiping.Skeleton as Skeleton  # noqa: E402
+
+TEE = "401-005"
+PIPE = "NPS 1/2\" PVC SCH 40"
+
+
+def assertVector(actual, expected):
+    assert (actual - expected).Length == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.fixture
+def skeleton():
+    """Return a skeleton with a tee and a pipe connected to its port 1."""
+    res = Skeleton.Skeleton()
+    tee = res.addPart("tee", TEE, name="tee")
+    res.addConnected("pipe", PIPE, 0, tee.name, 1, length=500, name="pipe")
+    return res
+
+
+def test_connected_ports_coincide(skeleton):
+    tee_port = skeleton.getNode("tee").getGlobalPort(1)
+    pipe_port = skeleton.getNode("pipe").getGlobalPort(0)
+    assertVector(pipe_port.placement.Base, tee_port.placement.Base)
+    assertVector(pipe_port.getNormal(), tee_port.getNormal() * -1)
+    assert skeleton.getNode("tee").connections[1] == ("pipe", 0)
+    assert skeleton.getNode("pipe").connections[0] == ("tee", 1)
+
+
+def test_open_ends(skeleton):
+    assert skeleton.openEnds() == [("pipe", 1), ("tee", 0), ("tee", 2)]
+
+
+def test_unknown_fitting():
+    with pytest.raises(Skeleton.SkeletonError):
+        Skeleton.Skeleton().addPart("valve", "V-1")
+
+
+def test_pipe_needs_length():
+    with pytest.raises(Skeleton.SkeletonError):
+        Skeleton.Skeleton().addPart("pipe", PIPE)
+
+
+@pytest.mark.parametrize("portIndex, otherPortIndex", [(2, 0), (-1, 0), (0, 3), (0, 1)])
+def test_add_connected_with_invalid_port_leaves_no_part(skeleton, portIndex, otherPortIndex):
+    names = sorted(skeleton.nodes.keys())
+    with pytest.raises(Skeleton.SkeletonError):
+        skeleton.addConnected("pipe", PIPE, portIndex, "tee", otherPortIndex, length=100)
+    assert sorted(skeleton.nodes.keys()) == names
+    assert skeleton.getNode("tee").connections == {1: ("pipe", 0)}
+
+
+@pytest.mark.parametrize("portIndex, otherPortIndex", [(5, 0), (0, 1), (0, 2)])
+def test_connect_checks_ports(skeleton, portIndex, otherPortIndex):
+    # Port 1 of the tee is connected to the pipe, the pipe has ports 0 and 1 only.
+    with pytest.raises(Skeleton.SkeletonError):
+        skeleton.connect("tee", portIndex, "pipe", otherPortIndex)
+
+
+def test_connect_to_itself(skeleton):
+    with pytest.raises(Skeleton.SkeletonError):
+        skeleton.connect("tee", 0, "tee", 2)
+
+
+def test_disconnect(skeleton):
+    skeleton.disconnect("pipe", 0)
+    assert skeleton.getNode("tee").connections == {}
+    assert skeleton.getNode("pipe").connections == {}
+    with pytest.raises(Skeleton.SkeletonError):
+        skeleton.disconnect("pipe", 0)
+
+
+def test_remove(skeleton):
+    skeleton.remove("pipe")
+    assert list(skeleton.nodes.keys()) == ["tee"]
+    assert skeleton.getNode("tee").connections == {}
+    with pytest.raises(Skeleton.SkeletonError):
+        skeleton.getNode("pipe")
+
+
+def test_move_moves_connected_parts(skeleton):
+    pipe_base = skeleton.getNode("pipe").placement.Base
+    offset = FreeCAD.Vector(10, 20, 30)
+    moved = skeleton.move("tee", FreeCAD.Placement(offset, FreeCAD.Rotation()))
+    assert sorted(moved) == ["pipe", "tee"]
+    assertVector(skeleton.getNode("tee").placement.Base, offset)
+    assertVector(skeleton.getNode("pipe").placement.Base, pipe_base + offset)
+    assert skeleton.getNode("tee").connections == {1: ("pipe", 0)}
+
+
+def test_move_stops_at_fixed_parts(skeleton):
+    pipe_placement = skeleton.getNode("pipe").placement
+    offset = FreeCAD.Vector(10, 0, 0)
+    moved = skeleton.move("tee", FreeCAD.Placement(offset, FreeCAD.Rotation()), fixed=["pipe"])
+    assert moved == ["tee"]
+    assertVector(skeleton.getNode("tee").placement.Base, offset)
+    assertVector(skeleton.getNode("pipe").placement.Base, pipe_placement.Base)
+    assert skeleton.getNode("tee").connections == {}
+    assert skeleton.getNode("pipe").connections == {}
+
+
+def test_bill_of_materials(skeleton):
+    skeleton.addConnected("pipe", PIPE, 0, "tee", 0, length=250)
+    assert skeleton.getBillOfMaterials() == [
+        {"fitting": "pipe", "partNumber": PIPE, "count": 2, "length": pytest.approx(750.0)},
+        {"fitting": "tee", "partNumber": TEE, "count": 1, "length": None}]
+
+
+def test_dict_round_trip(skeleton):
+    data = skeleton.toDict()
+    copy = Skeleton.Skeleton.fromDict(data)
+    assert copy.toDict() == data
+    assert copy.getNode("tee").connections == {1: ("pipe", 0)}